@@ -10,6 +10,7 @@ for _parent in Path(__file__).resolve().parents:
         break
 import importlib.util
 import os
+import sys
 import random
 import json
 
@@ -232,7 +233,7 @@ def create_corner():
     return corner
 
 # Function to dynamically load and place the top-level component from cell.py
-def place_cell_component(letter, number, x, y):
+def place_cell_component(top_layer, letter, number, x, y):
     # Load cell.py dynamically
     cell_path = os.path.join(os.path.dirname(__file__), "cell.py")
     spec = importlib.util.spec_from_file_location("cell", cell_path)
@@ -256,7 +257,15 @@ def place_cell_component(letter, number, x, y):
     top_level_component_ref = top_layer.add_ref(top_level_component)
     top_level_component_ref.move((x, y))
 
-if __name__ == "__main__":
+def load_die_data():
+    """Load placement data from Die.json."""
+    json_path = os.path.join(os.path.dirname(__file__), "..", "Json", "Die.json")
+    with open(json_path, "r") as json_file:
+        return json.load(json_file)
+
+
+def build_die(die_data):
+    """Assemble the die (grid, coordinates, boundary, corners and cells) and return the top component."""
     # Create the top-level component with the name as the Die_number variable
     top_layer = gf.Component("Top_Layer")
 
@@ -270,16 +279,16 @@ if __name__ == "__main__":
     grid = add_filled_boxes_to_edges(grid, coordinates_cell)
 
     # Add the coordinates cell to the top layer
-    coordinates_ref = top_layer.add_ref(coordinates_cell)
+    top_layer.add_ref(coordinates_cell)
 
     # Add the grid to the top layer
-    grid_ref = top_layer.add_ref(grid)
+    top_layer.add_ref(grid)
 
     # Create the boundary
     boundary = create_6mm_box("boundary_box")
 
     # Add the boundary to the top layer
-    boundary_ref = top_layer.add_ref(boundary)
+    top_layer.add_ref(boundary)
 
     # Create the corner
     corner = create_corner()
@@ -298,14 +307,31 @@ if __name__ == "__main__":
     corner_ref3.rotate(90)
     corner_ref3.move((2450, -2450))
 
-    # Load placement data from Die.json
-    json_path = os.path.join(os.path.dirname(__file__), "..", "Json", "Die.json")
-    with open(json_path, "r") as json_file:
-        die_data = json.load(json_file)
-
     # Place the top-level components using data from Die.json
     for component in die_data["coordinates"]:
-        place_cell_component(component["identifier"], component["number"], component["x"], component["y"])
+        place_cell_component(top_layer, component["identifier"], component["number"], component["x"], component["y"])
+
+    return top_layer
+
 
-    # Display the top layer with grid, boundary, corners, filled boxes, and text
-    top_layer.show()
+def _build_dir():
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "Setup").exists():
+            return parent / "Setup" / "build" / "gds"
+    return Path(__file__).resolve().parents[2] / "build" / "gds"
+
+
+if __name__ == "__main__":
+    top_layer = build_die(load_die_data())
+
+    # Write the top layer with grid, boundary, corners, filled boxes, and text to
+    # build/gds and display it, both in the project output format (Python codes/output_format.py)
+    output_format_path = os.path.join(os.path.dirname(__file__), "..", "..", "Python codes", "output_format.py")
+    # output_format imports its sibling modules (region_ops) by name
+    sys.path.insert(0, os.path.dirname(os.path.abspath(output_format_path)))
+    spec = importlib.util.spec_from_file_location("output_format", output_format_path)
+    output_format = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(output_format)
+    gds_path = output_format.write_component(top_layer, _build_dir() / f"{top_layer.name}.gds")
+    print(f"Wrote: {gds_path}")
+    output_format.show_component(top_layer)
@@ -187,7 +187,12 @@ if __name__ == "__main__":
     num_cols = int(config["num_cols"])
 
     component = create_outline()
-    component.show()
+
+    # Stream to the viewer in the project output format (Python codes/output_format.py)
+    import sys
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "Python codes"))
+    from output_format import show_component
+    show_component(component)
 
 
 
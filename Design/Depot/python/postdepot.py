@@ -681,8 +681,19 @@ if waveguide_geometry:
     gc_ref = component.add_ref_off_grid(gc_component)
     gc_ref.connect("o1", chain_ref.ports["o2"])
 
-component.write_gds(gds_path)
-component.show()
+# Write and show in the project output format (GDSII or compressed OASIS)
+fmt_py_path = cell_py_path.parents[2] / "Python codes" / "output_format.py"
+# output_format imports its sibling modules (region_ops) by name
+if str(fmt_py_path.parent) not in sys.path:
+    sys.path.insert(0, str(fmt_py_path.parent))
+fmt_spec = importlib.util.spec_from_file_location("postdepot_output_format", fmt_py_path)
+if fmt_spec is None or fmt_spec.loader is None:
+    raise RuntimeError(f"Unable to import output format module from {fmt_py_path}")
+output_format = importlib.util.module_from_spec(fmt_spec)
+fmt_spec.loader.exec_module(output_format)
+
+gds_path = output_format.write_component(component, gds_path)
+output_format.show_component(component)
 print(f"Generated: {gds_path}")
 
 angle_deg = _calculate_vector_angle_0_360(nw_coordinates)
@@ -719,6 +730,35 @@ if waveguide_geometry:
         print(result.stdout.strip())
 
 
+def build_cell(cell: dict, cell_py_path: Path, gds_path: Path) -> float:
+    """Build one postdepot.json cell entry into ``gds_path`` and return its NW angle in degrees.
+
+    The suffix of ``gds_path`` follows PIC_OUTPUT_FORMAT (see Python codes/output_format.py).
+    """
+    letter = str(cell["letter"])
+    number = int(cell["number"])
+    nw_coordinates = _extract_nw_coordinates(cell)
+    slope = _calculate_slope(nw_coordinates)
+
+    # Extract waveguide configuration if present
+    waveguide_config = cell.get("waveguide", {})
+    if waveguide_config:
+        waveguide_geometry = _calculate_waveguide_geometry(nw_coordinates, waveguide_config)
+    else:
+        waveguide_geometry = None
+
+    _build_one_cell_in_subprocess(
+        cell_py_path=cell_py_path,
+        gds_path=gds_path,
+        letter=letter,
+        number=number,
+        nw_coordinates=nw_coordinates,
+        slope=slope,
+        waveguide_geometry=waveguide_geometry,
+    )
+    return _calculate_vector_angle_0_360(nw_coordinates)
+
+
 def main() -> None:
     project_dir = _configure_project_dir()
 
@@ -744,26 +784,7 @@ def main() -> None:
     for cell in cells:
         letter = str(cell["letter"])
         number = int(cell["number"])
-        nw_coordinates = _extract_nw_coordinates(cell)
-        slope = _calculate_slope(nw_coordinates)
-        
-        # Extract waveguide configuration if present
-        waveguide_config = cell.get("waveguide", {})
-        if waveguide_config:
-            waveguide_geometry = _calculate_waveguide_geometry(nw_coordinates, waveguide_config)
-        else:
-            waveguide_geometry = None
-
-        _build_one_cell_in_subprocess(
-            cell_py_path=existing_cell_py,
-            gds_path=gds_out_dir / f"postdepot_{letter}{number}.gds",
-            letter=letter,
-            number=number,
-            nw_coordinates=nw_coordinates,
-            slope=slope,
-            waveguide_geometry=waveguide_geometry,
-        )
-        angle_deg = _calculate_vector_angle_0_360(nw_coordinates)
+        angle_deg = build_cell(cell, existing_cell_py, gds_out_dir / f"postdepot_{letter}{number}.gds")
         print(f"Cell {letter}{number}: angle = {angle_deg:.2f}")
 
 
@@ -13,6 +13,10 @@ for _parent in Path(__file__).resolve().parents:
         break
 import numpy as np
 import json
+import hashlib
+import klayout.db as kdb
+from deplof_font import GLYPHS, INDENTS, WIDTHS
+from output_format import output_path, show_component, write_component
 
 # gdsfactory 9.x requires an active PDK before geometry/layer creation.
 try:
@@ -40,6 +44,64 @@ def load_config_from_json(config_path: str) -> dict:
         print(f"Error loading grid configuration: {e}")
         return None
 
+def _insert_boxes(c, centers, size, layer):
+    """Bulk-insert square boxes of side ``size`` centered on an (N, 2) coordinate table."""
+    centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+    if len(centers) == 0:
+        return
+    dbu = c.kcl.dbu
+    half = size / 2
+    corners = np.rint(np.hstack([centers - half, centers + half]) / dbu).astype(np.int64)
+    region = kdb.Region()
+    for x0, y0, x1, y1 in corners.tolist():
+        region.insert(kdb.Box(x0, y0, x1, y1))
+    c.add_polygon(region, layer=layer)
+
+
+def _text_outline_dbu(text, size, dbu):
+    """Glyph polygons (integer dbu) of a one-line string, drawn with the gf.components.text font.
+
+    The DEPLOF tables are vendored in deplof_font.py, so the outlines do not
+    depend on the installed gdsfactory version.
+    """
+    scaling = size / 1000
+    xoffset = 0.0
+    polygons = []
+    for ch in text:
+        ascii_val = ord(ch)
+        if ch == " ":
+            xoffset += 500 * scaling
+            continue
+        for poly in GLYPHS[ascii_val]:
+            pts = np.asarray(poly, dtype=float) * scaling
+            pts[:, 0] += xoffset
+            polygons.append(np.rint(pts / dbu).astype(np.int64))
+        xoffset += (WIDTHS[ascii_val] + INDENTS[ascii_val]) * scaling
+    return polygons
+
+
+def _add_coordinate_texts(c, centers, text_size, layer_marker_text, text_y_offset):
+    """Add one centered "(x,y)" label below each marker center.
+
+    Glyphs are written straight into a single region instead of creating one
+    text cell per label, which is what dominated grid build time.
+    """
+    dbu = c.kcl.dbu
+    region = kdb.Region()
+    for x_m, y_m in centers.tolist():
+        polygons = _text_outline_dbu(f"({int(x_m)},{int(y_m)})", text_size, dbu)
+        if not polygons:
+            continue
+        xmin = min(int(p[:, 0].min()) for p in polygons)
+        xmax = max(int(p[:, 0].max()) for p in polygons)
+        # Center horizontally on the marker, matching justify='center'
+        dx = int(round(x_m / dbu)) - (xmin + xmax) // 2
+        dy = int(round((y_m + text_y_offset) / dbu))
+        for p in polygons:
+            region.insert(kdb.Polygon([kdb.Point(x + dx, y + dy) for x, y in p.tolist()]))
+    c.add_polygon(region, layer=layer_marker_text)
+
+
 def create_chip_boundary_component(chip_size, boundary_line_width, layer_chip_boundary) -> gf.Component:
     """Creates the chip boundary component."""
     c = gf.Component("chip_boundary")
@@ -90,16 +152,11 @@ def create_grid_lines_component(chip_size, boundary_line_width, grid_box_size, g
     num_x_lines = int(chip_size[0] // grid_box_size)
     num_y_lines = int(chip_size[1] // grid_box_size)
 
-    # Vertical lines
-    for i in range(num_x_lines + 1):
-        x_coord_val = -chip_size[0]/2 + i * grid_box_size
-        line = c << gf.components.rectangle(size=(grid_line_width, chip_size[1]), layer=layer_grid, centered=True)
-        line.movex(x_coord_val)
-    # Horizontal lines
-    for i in range(num_y_lines + 1):
-        y_coord_val = -chip_size[1]/2 + i * grid_box_size
-        line = c << gf.components.rectangle(size=(chip_size[0], grid_line_width), layer=layer_grid, centered=True)
-        line.movey(y_coord_val)
+    # Vertical and horizontal lines as one arrayed reference each
+    vertical = gf.components.rectangle(size=(grid_line_width, chip_size[1]), layer=layer_grid, centered=True)
+    c.add_ref(vertical, columns=num_x_lines + 1, column_pitch=grid_box_size).movex(-chip_size[0]/2)
+    horizontal = gf.components.rectangle(size=(chip_size[0], grid_line_width), layer=layer_grid, centered=True)
+    c.add_ref(horizontal, rows=num_y_lines + 1, row_pitch=grid_box_size).movey(-chip_size[1]/2)
     return c
 
 def create_coordinate_markers_component(chip_size, marker_config, grid_box_size, layer_marker_boxes, layer_marker_text) -> gf.Component:
@@ -116,57 +173,17 @@ def create_coordinate_markers_component(chip_size, marker_config, grid_box_size,
     
     edge_spacing = grid_box_size # Align markers with grid boxes
 
-    # Top markers
-    num_markers_top = int(chip_size[0] // edge_spacing)
-    for i in range(num_markers_top):
-        x_b = -chip_size[0]/2 + i*edge_spacing + edge_spacing/2
-        y_b = chip_size[1]/2
-        x_m = x_b
-        y_m = y_b - horizontal_offset # Marker center y
-        marker = c << gf.components.rectangle(size=(marker_size, marker_size), layer=layer_marker_boxes, centered=True)
-        marker.move((x_m, y_m))
-        ct = f"({int(x_m)},{int(y_m)})"
-        txt = c << gf.components.text(text=ct, size=text_size, layer=layer_marker_text, justify='center')
-        txt.move((x_m, y_m + text_y_offset))
-
-    # Left markers
-    num_markers_left = int(chip_size[1] // edge_spacing)
-    for i in range(num_markers_left):
-        x_b = -chip_size[0]/2
-        y_b = -chip_size[1]/2 + i*edge_spacing + edge_spacing/2
-        x_m = x_b + vertical_offset # Marker center x
-        y_m = y_b
-        marker = c << gf.components.rectangle(size=(marker_size, marker_size), layer=layer_marker_boxes, centered=True)
-        marker.move((x_m, y_m))
-        ct = f"({int(x_m)},{int(y_m)})"
-        txt = c << gf.components.text(text=ct, size=text_size, layer=layer_marker_text, justify='center')
-        txt.move((x_m, y_m + text_y_offset))
-
-    # Bottom markers
-    num_markers_bottom = int(chip_size[0] // edge_spacing)
-    for i in range(num_markers_bottom):
-        x_b = -chip_size[0]/2 + i*edge_spacing + edge_spacing/2
-        y_b = -chip_size[1]/2
-        x_m = x_b
-        y_m = y_b + horizontal_offset # Marker center y
-        marker = c << gf.components.rectangle(size=(marker_size, marker_size), layer=layer_marker_boxes, centered=True)
-        marker.move((x_m, y_m))
-        ct = f"({int(x_m)},{int(y_m)})"
-        txt = c << gf.components.text(text=ct, size=text_size, layer=layer_marker_text, justify='center')
-        txt.move((x_m, y_m + text_y_offset))
-
-    # Right markers
-    num_markers_right = int(chip_size[1] // edge_spacing)
-    for i in range(num_markers_right):
-        x_b = chip_size[0]/2
-        y_b = -chip_size[1]/2 + i*edge_spacing + edge_spacing/2
-        x_m = x_b - vertical_offset # Marker center x
-        y_m = y_b
-        marker = c << gf.components.rectangle(size=(marker_size, marker_size), layer=layer_marker_boxes, centered=True)
-        marker.move((x_m, y_m))
-        ct = f"({int(x_m)},{int(y_m)})"
-        txt = c << gf.components.text(text=ct, size=text_size, layer=layer_marker_text, justify='center')
-        txt.move((x_m, y_m + text_y_offset))
+    # Marker centers along each chip edge: top, left, bottom, right
+    x_centers = -chip_size[0]/2 + np.arange(int(chip_size[0] // edge_spacing)) * edge_spacing + edge_spacing/2
+    y_centers = -chip_size[1]/2 + np.arange(int(chip_size[1] // edge_spacing)) * edge_spacing + edge_spacing/2
+    centers = np.vstack([
+        np.column_stack([x_centers, np.full_like(x_centers, chip_size[1]/2 - horizontal_offset)]),
+        np.column_stack([np.full_like(y_centers, -chip_size[0]/2 + vertical_offset), y_centers]),
+        np.column_stack([x_centers, np.full_like(x_centers, -chip_size[1]/2 + horizontal_offset)]),
+        np.column_stack([np.full_like(y_centers, chip_size[0]/2 - vertical_offset), y_centers]),
+    ])
+    _insert_boxes(c, centers, marker_size, layer_marker_boxes)
+    _add_coordinate_texts(c, centers, text_size, layer_marker_text, text_y_offset)
         
     return c
 
@@ -181,31 +198,19 @@ def create_axis_coordinate_markers_component(chip_size, marker_config, grid_box_
     text_y_offset = marker_config.get("text_y_offset", -15)
     spacing = 500  # 500 micron spacing
 
-    # Calculate max number of steps needed
+    # Horizontal lines: y = 250 and y = -250; vertical lines: x = -250 and x = 250
     max_steps = int(chip_size[0] / spacing) + 1
-
-    # Horizontal lines: y = 250 and y = -250
-    for y_m in [250, -250]:
-        for i in range(-max_steps, max_steps + 1):
-            x_m = 250 + i * spacing
-            if abs(x_m) < chip_size[0]/2:
-                marker = c << gf.components.rectangle(size=(marker_size, marker_size), layer=layer_marker_boxes, centered=True)
-                marker.move((x_m, y_m))
-                ct = f"({int(x_m)},{int(y_m)})"
-                txt = c << gf.components.text(text=ct, size=text_size, layer=layer_marker_text, justify='center')
-                txt.move((x_m, y_m + text_y_offset))
-
-    # Vertical lines: x = -250 and x = 250
+    xs = 250 + np.arange(-max_steps, max_steps + 1) * spacing
+    xs = xs[np.abs(xs) < chip_size[0]/2]
     max_steps_y = int(chip_size[1] / spacing) + 1
-    for x_m in [-250, 250]:
-        for i in range(-max_steps_y, max_steps_y + 1):
-            y_m = 250 + i * spacing
-            if abs(y_m) < chip_size[1]/2:
-                marker = c << gf.components.rectangle(size=(marker_size, marker_size), layer=layer_marker_boxes, centered=True)
-                marker.move((x_m, y_m))
-                ct = f"({int(x_m)},{int(y_m)})"
-                txt = c << gf.components.text(text=ct, size=text_size, layer=layer_marker_text, justify='center')
-                txt.move((x_m, y_m + text_y_offset))
+    ys = 250 + np.arange(-max_steps_y, max_steps_y + 1) * spacing
+    ys = ys[np.abs(ys) < chip_size[1]/2]
+    centers = np.vstack(
+        [np.column_stack([xs, np.full_like(xs, y_m)]) for y_m in (250, -250)]
+        + [np.column_stack([np.full_like(ys, x_m), ys]) for x_m in (-250, 250)]
+    )
+    _insert_boxes(c, centers, marker_size, layer_marker_boxes)
+    _add_coordinate_texts(c, centers, text_size, layer_marker_text, text_y_offset)
 
     return c
 
@@ -234,31 +239,20 @@ def create_ebeam_field_markers_component(chip_size, ebeam_config, layer_ebeam_fi
         start_x_ebeam_array = -total_ebeam_width / 2
         start_y_ebeam_array = -total_ebeam_height / 2
         
-        for ix in range(fields_x):
-            for iy in range(fields_y):
-                # Calculate corners of the current field relative to the array's bottom-left
-                field_left_rel = ix * field_size
-                field_bottom_rel = iy * field_size
-                
-                # Absolute coordinates of the field corners
-                field_left_abs = start_x_ebeam_array + field_left_rel
-                field_right_abs = field_left_abs + field_size
-                field_bottom_abs = start_y_ebeam_array + field_bottom_rel
-                field_top_abs = field_bottom_abs + field_size
-
-                corners_coords = [
-                    (field_left_abs + ebeam_marker_offset, field_top_abs - ebeam_marker_offset),    # Top-left of field
-                    (field_right_abs - ebeam_marker_offset, field_top_abs - ebeam_marker_offset),   # Top-right of field
-                    (field_left_abs + ebeam_marker_offset, field_bottom_abs + ebeam_marker_offset), # Bottom-left of field
-                    (field_right_abs - ebeam_marker_offset, field_bottom_abs + ebeam_marker_offset) # Bottom-right of field
-                ]
-
-                for cx, cy in corners_coords:
-                    # Check if marker is within chip boundaries before adding
-                    if -chip_size[0]/2 < cx < chip_size[0]/2 and \
-                       -chip_size[1]/2 < cy < chip_size[1]/2:
-                        box = c << gf.components.rectangle(size=(ebeam_marker_size, ebeam_marker_size), layer=layer_ebeam_field_markers, centered=True)
-                        box.move((cx, cy))
+        # Field corners as a coordinate table, one row per (field, corner)
+        field_left = start_x_ebeam_array + np.arange(fields_x) * field_size
+        field_bottom = start_y_ebeam_array + np.arange(fields_y) * field_size
+        left, bottom = (a.ravel() for a in np.meshgrid(field_left, field_bottom, indexing="ij"))
+        right, top = left + field_size, bottom + field_size
+        centers = np.column_stack([
+            np.stack([left + ebeam_marker_offset, right - ebeam_marker_offset,
+                      left + ebeam_marker_offset, right - ebeam_marker_offset], axis=1).ravel(),
+            np.stack([top - ebeam_marker_offset, top - ebeam_marker_offset,
+                      bottom + ebeam_marker_offset, bottom + ebeam_marker_offset], axis=1).ravel(),
+        ])
+        # Keep only markers inside the chip boundary
+        inside = (np.abs(centers[:, 0]) < chip_size[0]/2) & (np.abs(centers[:, 1]) < chip_size[1]/2)
+        _insert_boxes(c, centers[inside], ebeam_marker_size, layer_ebeam_field_markers)
     return c
 
 def create_origin_marker_component(origin_marker_config, layer_origin_marker) -> gf.Component:
@@ -334,6 +328,46 @@ def create_grid_component(config: dict) -> gf.Component:
     # top_level_cell << corner_labels_comp
     return top_level_cell
 
+# Grid config hash -> grid component, so repeated builds in one session are free.
+_grid_cache = {}
+
+
+def grid_config_hash(config: dict) -> str:
+    """Hash of the grid config, this file and the font tables, so cached grids follow edits to any of them."""
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode("utf-8"))
+    digest.update(Path(__file__).read_bytes())
+    digest.update(Path(__file__).with_name("deplof_font.py").read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _grid_cache_dir() -> Path:
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "Setup").exists():
+            return parent / "Setup" / "build" / "cache"
+    return Path(__file__).resolve().parents[1] / "build" / "cache"
+
+
+def create_grid_component_cached(config: dict, use_disk_cache: bool = True) -> gf.Component:
+    """Return the grid for ``config``, reusing an in-memory or on-disk (build/cache) copy when the hash matches."""
+    key = grid_config_hash(config)
+    if key in _grid_cache:
+        print(f"Using cached grid {key}")
+        return _grid_cache[key]
+
+    gds_path = output_path(_grid_cache_dir() / f"grid_{key}.gds")
+    if use_disk_cache and gds_path.exists():
+        print(f"Loading cached grid from {gds_path}")
+        grid = gf.import_gds(gds_path)
+    else:
+        grid = create_grid_component(config)
+        if use_disk_cache:
+            gds_path.parent.mkdir(parents=True, exist_ok=True)
+            # Cache the raw geometry; any PIC_MERGE_POLYGONS merge applies at final export
+            write_component(grid, gds_path, merge=False)
+            print(f"Cached grid to {gds_path}")
+    _grid_cache[key] = grid
+    return grid
+
 if __name__ == "__main__":
     # Test the grid generation directly
     config_path = "Json/Grid.json"
@@ -341,7 +375,7 @@ if __name__ == "__main__":
     
     if config:
         grid = create_grid_component(config)
-        grid.show()
+        show_component(grid)
     else:
         print("Failed to load grid configuration")
 
@@ -16,6 +16,9 @@ import numpy as np
 import json
 from typing import Tuple
 from grating_couplers import create_grating_coupler, get_gc_params, get_gc_width
+from euler_table import euler_bend_metrics, s_bend_train_metrics
+from path_sampling import euler_npoints
+from path_fracture import extrude_fractured
 
 # gdsfactory 9.x requires an active PDK before geometry/layer creation.
 try:
@@ -58,21 +61,16 @@ grating_coupler_config = get_gc_params(grating_coupler_model)
 cross_section = gf.cross_section.strip(width=width, layer=layer)
 
 #param
-bend_180 = gf.path.euler(radius=s, angle=180)
-H = bend_180.length()
+# Optional max chord error (nm) for the Euler bends; None keeps gdsfactory's default sampling
+point_tolerance_nm = params.get("point_tolerance_nm")
+s_npoints = euler_npoints(s, 180, tolerance_nm=point_tolerance_nm) if point_tolerance_nm else None
+r_npoints = euler_npoints(r, 90, tolerance_nm=point_tolerance_nm) if point_tolerance_nm and r > 0 else None
+H = euler_bend_metrics(s, 180, npoints=s_npoints)[0]
 
 if r > 0:
-    # Create Q path with 10 S-bend units (40 total bends)
-    # Each S-bend unit: -90, +90, +90, -90 (returns to same y, advances in x)
-    Q = gf.Path()
-    for i in range(12):
-        Q += gf.path.euler(radius=r, angle=-90)
-        Q += gf.path.euler(radius=r, angle=90)
-        Q += gf.path.euler(radius=r, angle=90)
-        Q += gf.path.euler(radius=r, angle=-90)
-    
-    J = Q.length()
-    K = Q.points[-1][0] - Q.points[0][0]
+    # Length and x advance of 12 S-bend units (48 bends), each -90, +90, +90, -90
+    # (returns to same y, advances in x), from the cached Euler-bend table
+    J, K = s_bend_train_metrics(r, n_units=12, npoints=r_npoints)
 else:
     J = 0
     K = 0
@@ -92,9 +90,9 @@ start_point = (0, 0)
 P = gf.Path()
 P += gf.path.straight(length=x)
 P += gf.path.straight(length=a)
-P += gf.path.euler(radius=s, angle=-180)
+P += gf.path.euler(radius=s, angle=-180, npoints=s_npoints)
 P += gf.path.straight(length=a)
-P += gf.path.euler(radius=s, angle=180)
+P += gf.path.euler(radius=s, angle=180, npoints=s_npoints)
 P += gf.path.straight(length=u)
 
 # Add bends or straight depending on r
@@ -105,81 +103,89 @@ if r == 0:
     P += gf.path.straight(length=bends_x)
 else:
     for i in range(12):
-        P += gf.path.euler(radius=r, angle=-90)
-        P += gf.path.euler(radius=r, angle=90)
-        P += gf.path.euler(radius=r, angle=90)
-        P += gf.path.euler(radius=r, angle=-90)
+        P += gf.path.euler(radius=r, angle=-90, npoints=r_npoints)
+        P += gf.path.euler(radius=r, angle=90, npoints=r_npoints)
+        P += gf.path.euler(radius=r, angle=90, npoints=r_npoints)
+        P += gf.path.euler(radius=r, angle=-90, npoints=r_npoints)
     
 P += gf.path.straight(length=u)
-P += gf.path.euler(radius=s, angle=180)
+P += gf.path.euler(radius=s, angle=180, npoints=s_npoints)
 P += gf.path.straight(length=a)
-P += gf.path.euler(radius=s, angle=-180)
+P += gf.path.euler(radius=s, angle=-180, npoints=s_npoints)
 P += gf.path.straight(length=a)
 P += gf.path.straight(length=x) 
 
 
-if __name__ == "__main__":
-    # Create the array of ROC devices
-    n_values = [round(0.7 + i * 0.1, 1) for i in range(27)]  # Generate n values from 0.7 to 3.2 in steps of 0.1
-    array_comp = gf.Component("roc_array")
+def _assemble_roc_body(name, path, width, layer, taper_length, grating_coupler_model):
+    """Extrude the ROC path and attach tapers and grating couplers to both ends.
 
-    # Initialize taper and grating coupler for array creation
+    Ports "gc_left"/"gc_right" mark the coupler inputs the n labels are placed against.
+    """
+    body = gf.Component(name)
+    cross_section = gf.cross_section.strip(width=width, layer=layer)
+    wg = extrude_fractured(path, cross_section)
+    wg_ref = body << wg
     gc = create_grating_coupler(grating_coupler_model, layer=layer)
     gc_width = get_gc_width(grating_coupler_model)
-
     taper = gf.components.taper(
         length=taper_length,
         width1=gc_width,
         width2=width,
         layer=layer,
     )
+    # Left side
+    taper_left = body << taper
+    gc_left = body << gc
+    taper_left.connect("o2", wg_ref.ports["o1"])
+    gc_left.connect("o1", taper_left.ports["o1"])
+    # Right side
+    taper_right = body << taper
+    gc_right = body << gc
+    taper_right.connect("o2", wg_ref.ports["o2"])
+    gc_right.connect("o1", taper_right.ports["o1"])
+    body.add_port("gc_left", port=gc_left.ports["o1"])
+    body.add_port("gc_right", port=gc_right.ports["o1"])
+    return body
 
-    # Load array spacing parameters
-    array_spacing = params.get("array_spacing", {"x_diff": 50, "y_diff": 100})
-    x_diff = array_spacing["x_diff"]
-    y_diff = array_spacing["y_diff"]
 
-    for index, n in enumerate(n_values):
-        cell_name = f"{n}"
-        cross_section = gf.cross_section.strip(width=width, layer=layer)
-        final_comp = gf.Component(cell_name)
-        wg = gf.path.extrude(P, cross_section=cross_section)
-        wg_ref = final_comp << wg
-
-        # Add grating couplers and tapers to both ends
-        taper_left = final_comp << taper
-        gc_left = final_comp << gc
-        taper_left.connect("o2", wg_ref.ports["o1"])
-        gc_left.connect("o1", taper_left.ports["o1"])
-
-        taper_right = final_comp << taper
-        gc_right = final_comp << gc
-        taper_right.connect("o2", wg_ref.ports["o2"])
-        gc_right.connect("o1", taper_right.ports["o1"])
-
-        # Add text labels if enabled
-        if enable_text:
-            # Reverting back to using the number n instead of rectangles
-            text_left = final_comp << gf.components.text(
-                text=f"n{n}",
-                size=text_size,
-                layer=text_layer
-            )
-            text_left.move(origin=text_left.center, destination=(gc_left.ports["o1"].center[0] + text_offset_left / 2, gc_left.ports["o1"].center[1]))
-
-            text_right = final_comp << gf.components.text(
-                text=f"{n}",
-                size=text_size,
-                layer=text_layer
-            )
-            text_right.move(origin=text_right.center, destination=(gc_right.ports["o1"].center[0] + text_offset_right / 2, gc_right.ports["o1"].center[1]))
+def _add_n_labels(comp, n, body_ref, text_size, text_layer, text_offset_left, text_offset_right):
+    """Add the "n{n}" / "{n}" labels next to the left and right grating couplers."""
+    text_left = comp << gf.components.text(
+        text=f"n{n}",
+        size=text_size,
+        layer=text_layer
+    )
+    text_left.move(origin=text_left.center, destination=(body_ref.ports["gc_left"].center[0] + text_offset_left / 2, body_ref.ports["gc_left"].center[1]))
 
-        # Place the device in the array column by column
-        column_index = index % 3  # Determine the column index
-        row_index = index // 3  # Determine the row based on index
-        array_comp.add_ref(final_comp).move((column_index * x_diff, -row_index * y_diff))  # Use x_diff and y_diff for spacing
+    text_right = comp << gf.components.text(
+        text=f"{n}",
+        size=text_size,
+        layer=text_layer
+    )
+    text_right.move(origin=text_right.center, destination=(body_ref.ports["gc_right"].center[0] + text_offset_right / 2, body_ref.ports["gc_right"].center[1]))
+
+
+# The module-level path P only depends on ROC.json, so its waveguide, tapers and
+# couplers are built once and every n{n} device references the same body.
+_roc_body = None
+
+
+def roc_body():
+    """Return the shared ROC body cell for the module-level path P."""
+    global _roc_body
+    if _roc_body is None:
+        _roc_body = _assemble_roc_body("ROC_body", P, width, layer, taper_length, grating_coupler_model)
+    return _roc_body
+
+
+def roc_device(n, name=None):
+    """One ROC device, cell ``name`` (default "n{n}"): a reference to the shared body plus its n labels."""
+    final_comp = gf.Component(name or f"n{n}")
+    body_ref = final_comp << roc_body()
+    if enable_text:
+        _add_n_labels(final_comp, n, body_ref, text_size, text_layer, text_offset_left, text_offset_right)
+    return final_comp
 
-    array_comp.show()
 
 def build_component_from_params(params):
     r = params["geometry"]["r"]
@@ -198,23 +204,15 @@ def build_component_from_params(params):
     grating_coupler_model = params.get("grating_coupler_model", "GC_1550_TE")
     grating_coupler_config = get_gc_params(grating_coupler_model)
 
-    cross_section = gf.cross_section.strip(width=width, layer=layer)
-    bend_180 = gf.path.euler(radius=s, angle=180)
-    H = bend_180.length()
-    I = bend_180.points[-1][1] - bend_180.points[0][1]
+    point_tolerance_nm = params.get("point_tolerance_nm")
+    s_npoints = euler_npoints(s, 180, tolerance_nm=point_tolerance_nm) if point_tolerance_nm else None
+    r_npoints = euler_npoints(r, 90, tolerance_nm=point_tolerance_nm) if point_tolerance_nm and r > 0 else None
+    H, _, I = euler_bend_metrics(s, 180, npoints=s_npoints)
     
     if r > 0:
-        # Create Q path with 10 S-bend units (40 total bends)
-        # Each S-bend unit: -90, +90, +90, -90 (returns to same y, advances in x)
-        Q = gf.Path()
-        for i in range(12):
-            Q += gf.path.euler(radius=r, angle=-90)
-            Q += gf.path.euler(radius=r, angle=90)
-            Q += gf.path.euler(radius=r, angle=90)
-            Q += gf.path.euler(radius=r, angle=-90)
-        
-        J = Q.length()
-        K = Q.points[-1][0] - Q.points[0][0]
+        # Length and x advance of 12 S-bend units (48 bends), each -90, +90, +90, -90
+        # (returns to same y, advances in x), from the cached Euler-bend table
+        J, K = s_bend_train_metrics(r, n_units=12, npoints=r_npoints)
     else:
         J = 0
         K = 0
@@ -227,62 +225,32 @@ def build_component_from_params(params):
     P = gf.Path()
     P += gf.path.straight(length=x)
     P += gf.path.straight(length=a)
-    P += gf.path.euler(radius=s, angle=-180)
+    P += gf.path.euler(radius=s, angle=-180, npoints=s_npoints)
     P += gf.path.straight(length=a)
-    P += gf.path.euler(radius=s, angle=180)
+    P += gf.path.euler(radius=s, angle=180, npoints=s_npoints)
     P += gf.path.straight(length=u)
     if r == 0:
         bends_x = K
         P += gf.path.straight(length=bends_x)
     else:
         for i in range(12):
-            P += gf.path.euler(radius=r, angle=-90)
-            P += gf.path.euler(radius=r, angle=90)
-            P += gf.path.euler(radius=r, angle=90)
-            P += gf.path.euler(radius=r, angle=-90)
+            P += gf.path.euler(radius=r, angle=-90, npoints=r_npoints)
+            P += gf.path.euler(radius=r, angle=90, npoints=r_npoints)
+            P += gf.path.euler(radius=r, angle=90, npoints=r_npoints)
+            P += gf.path.euler(radius=r, angle=-90, npoints=r_npoints)
     
     P += gf.path.straight(length=u)
-    P += gf.path.euler(radius=s, angle=180)
+    P += gf.path.euler(radius=s, angle=180, npoints=s_npoints)
     P += gf.path.straight(length=a)
-    P += gf.path.euler(radius=s, angle=-180)
+    P += gf.path.euler(radius=s, angle=-180, npoints=s_npoints)
     P += gf.path.straight(length=a)
     P += gf.path.straight(length=x)
     cell_name = f"{n}"
     final_comp = gf.Component(cell_name)
-    wg = gf.path.extrude(P, cross_section=cross_section)
-    wg_ref = final_comp << wg
-    gc = create_grating_coupler(grating_coupler_model, layer=layer)
-    gc_width = get_gc_width(grating_coupler_model)
-    taper = gf.components.taper(
-        length=taper_length,
-        width1=gc_width,
-        width2=width,
-        layer=layer,
-    )
-    # Left side
-    taper_left = final_comp << taper
-    gc_left = final_comp << gc
-    taper_left.connect("o2", wg_ref.ports["o1"])
-    gc_left.connect("o1", taper_left.ports["o1"])
-    if enable_text:
-        text_left = final_comp << gf.components.text(
-            text=f"n{n}",
-            size=text_size,
-            layer=text_layer
-        )
-        text_left.move(origin=text_left.center, destination=(gc_left.ports["o1"].center[0] + text_offset_left / 2, gc_left.ports["o1"].center[1]))
-    # Right side
-    taper_right = final_comp << taper
-    gc_right = final_comp << gc
-    taper_right.connect("o2", wg_ref.ports["o2"])
-    gc_right.connect("o1", taper_right.ports["o1"])
+    body = _assemble_roc_body(f"{cell_name}_body", P, width, layer, taper_length, grating_coupler_model)
+    body_ref = final_comp << body
     if enable_text:
-        text_right = final_comp << gf.components.text(
-            text=f"{n}",
-            size=text_size,
-            layer=text_layer
-        )
-        text_right.move(origin=text_right.center, destination=(gc_right.ports["o1"].center[0] + text_offset_right / 2, gc_right.ports["o1"].center[1]))
+        _add_n_labels(final_comp, n, body_ref, text_size, text_layer, text_offset_left, text_offset_right)
     return final_comp
 
 def get_component():
@@ -296,56 +264,13 @@ def get_component():
     n_values = [round(0.7 + i * 0.1, 1) for i in range(27)]  # Generate n values from 0.7 to 3.2 in steps of 0.1
     array_comp = gf.Component("roc_array")
 
-    # Initialize taper and grating coupler for array creation
-    gc = create_grating_coupler(grating_coupler_model, layer=layer)
-    gc_width = get_gc_width(grating_coupler_model)
-
-    taper = gf.components.taper(
-        length=taper_length,
-        width1=gc_width,
-        width2=width,
-        layer=layer,
-    )
-
     # Load array spacing parameters
     array_spacing = params.get("array_spacing", {"x_diff": 50, "y_diff": 100})
     x_diff = array_spacing["x_diff"]
     y_diff = array_spacing["y_diff"]
 
     for index, n in enumerate(n_values):
-        cell_name = f"n{n}"
-        cross_section = gf.cross_section.strip(width=width, layer=layer)
-        final_comp = gf.Component(cell_name)
-        wg = gf.path.extrude(P, cross_section=cross_section)
-        wg_ref = final_comp << wg
-
-        # Add grating couplers and tapers to both ends
-        taper_left = final_comp << taper
-        gc_left = final_comp << gc
-        taper_left.connect("o2", wg_ref.ports["o1"])
-        gc_left.connect("o1", taper_left.ports["o1"])
-
-        taper_right = final_comp << taper
-        gc_right = final_comp << gc
-        taper_right.connect("o2", wg_ref.ports["o2"])
-        gc_right.connect("o1", taper_right.ports["o1"])
-
-        # Add text labels if enabled
-        if enable_text:
-            # Reverting back to using the number n instead of rectangles
-            text_left = final_comp << gf.components.text(
-                text=f"n{n}",
-                size=text_size,
-                layer=text_layer
-            )
-            text_left.move(origin=text_left.center, destination=(gc_left.ports["o1"].center[0] + text_offset_left / 2, gc_left.ports["o1"].center[1]))
-
-            text_right = final_comp << gf.components.text(
-                text=f"{n}",
-                size=text_size,
-                layer=text_layer
-            )
-            text_right.move(origin=text_right.center, destination=(gc_right.ports["o1"].center[0] + text_offset_right / 2, gc_right.ports["o1"].center[1]))
+        final_comp = roc_device(n)
 
         # Place the device in the array column by column
         column_index = index % 3  # Determine the column index
@@ -358,3 +283,23 @@ def get_component():
     # Return the die component and its name
     return main_component, "ROC_Die"
 
+
+if __name__ == "__main__":
+    # Create the array of ROC devices
+    n_values = [round(0.7 + i * 0.1, 1) for i in range(27)]  # Generate n values from 0.7 to 3.2 in steps of 0.1
+    array_comp = gf.Component("roc_array")
+
+    # Load array spacing parameters
+    array_spacing = params.get("array_spacing", {"x_diff": 50, "y_diff": 100})
+    x_diff = array_spacing["x_diff"]
+    y_diff = array_spacing["y_diff"]
+
+    for index, n in enumerate(n_values):
+        final_comp = roc_device(n, name=f"{n}")
+
+        # Place the device in the array column by column
+        column_index = index % 3  # Determine the column index
+        row_index = index // 3  # Determine the row based on index
+        array_comp.add_ref(final_comp).move((column_index * x_diff, -row_index * y_diff))  # Use x_diff and y_diff for spacing
+
+    array_comp.show()
@@ -13,7 +13,13 @@ for _parent in Path(__file__).resolve().parents:
         break
 import json
 import copy
+import sys
+import numpy as np
 from grating_couplers import create_grating_coupler, get_gc_params, get_gc_width
+from die_frame import die_frame, die_size_for
+from euler_table import euler_bend_metrics, s_bend_train_metrics
+from path_fracture import extrude_fractured
+from output_format import show_component
 
 # gdsfactory 9.x requires an active PDK before geometry/layer creation.
 try:
@@ -58,17 +64,14 @@ def add_die_box_with_grid(component, die_name=None, params=None):
     else:
         # Same name - use it
         final_die_name = die_name
-        marker_size = e_beam_marker_params.get("size", 8.0)
-        marker_offset = e_beam_marker_params.get("offset", 45.0)
+    marker_size = e_beam_marker_params.get("size", 8.0)
+    marker_offset = e_beam_marker_params.get("offset", 45.0)
     
     bbox = component.bbox()
     xmin, ymin, xmax, ymax = bbox.left, bbox.bottom, bbox.right, bbox.top
     width = xmax - xmin
     height = ymax - ymin
-    die_width = ((int((width // grid_size) + 1) if width % grid_size != 0 else int(width // grid_size)) + 1) * grid_size
-    die_height = ((int((height // grid_size) + 1) if height % grid_size != 0 else int(height // grid_size)) + 1) * grid_size
-    n_x = int(die_width // grid_size)
-    n_y = int(die_height // grid_size)
+    die_width, die_height = die_size_for(width, height, grid_size)
     grid_line_width = die_box_params.get("grid_line_width", 0.002)    # Get displacement values to position array within the grid
     displacement = params.get("array", {}).get("displacement", {"x": 0, "y": 0})
     displacement_x = displacement.get("x", 0)
@@ -90,43 +93,10 @@ def add_die_box_with_grid(component, die_name=None, params=None):
     die_xmin = -round(die_width / 2 / grid_size) * grid_size
     die_ymin = -round(die_height / 2 / grid_size) * grid_size
     
-    die_grid = gf.Component("Die_Grid")
-    for i in range(n_x + 1):
-        x = i * grid_size
-        die_grid.add_ref(
-            gf.components.rectangle(
-                size=(grid_line_width, die_height), layer=grid_layer
-            )
-        ).move((x - grid_line_width / 2, 0))
-    for j in range(n_y + 1):
-        y = j * grid_size
-        die_grid.add_ref(
-            gf.components.rectangle(
-                size=(die_width, grid_line_width), layer=grid_layer
-            )
-        ).move((0, y - grid_line_width / 2))
-    die_grid_ref = component.add_ref(die_grid)
-    die_grid_ref.move((die_xmin, die_ymin))
-    
-    e_beam_markers = gf.Component("E_beam_markers")
-    for i in range(n_x + 1):
-        for j in range(n_y + 1):
-            x = i * grid_size
-            y = j * grid_size
-            marker1 = gf.components.rectangle(size=(marker_size, marker_size), layer=marker_layer)
-            marker1_ref = e_beam_markers.add_ref(marker1)
-            marker1_ref.move((x - marker_offset - marker_size, y + marker_offset))
-            marker2 = gf.components.rectangle(size=(marker_size, marker_size), layer=marker_layer)
-            marker2_ref = e_beam_markers.add_ref(marker2)
-            marker2_ref.move((x + marker_offset, y + marker_offset))
-            marker3 = gf.components.rectangle(size=(marker_size, marker_size), layer=marker_layer)
-            marker3_ref = e_beam_markers.add_ref(marker3)
-            marker3_ref.move((x - marker_offset - marker_size, y - marker_offset - marker_size))
-            marker4 = gf.components.rectangle(size=(marker_size, marker_size), layer=marker_layer)
-            marker4_ref = e_beam_markers.add_ref(marker4)
-            marker4_ref.move((x + marker_offset, y - marker_offset - marker_size))
-    e_beam_markers_ref = component.add_ref(e_beam_markers)
-    e_beam_markers_ref.move((die_xmin, die_ymin))
+    # Grid lines and markers come from a shared frame cell, reused by every die of this size.
+    frame = die_frame(die_width, die_height, grid_size, grid_line_width, grid_layer, marker_layer, marker_size, marker_offset)
+    frame_ref = component.add_ref(frame)
+    frame_ref.move((die_xmin, die_ymin))
     
     tag = gf.Component("Tag")
     text = gf.components.text(text=final_die_name, size=die_text_params.get("text_size", 50), layer=tag_layer)
@@ -137,6 +107,53 @@ def add_die_box_with_grid(component, die_name=None, params=None):
     
     return component
 
+def solve_roc_constraints(r_values, L, D, x, s, n_units=12):
+    """Evaluate the ROC constraint equations for whole sweeps at once.
+
+    r_values, L, D and s may be scalars or arrays and are broadcast together.
+    Returns a dict of arrays (r, L, D, s, H, J, K, u, a) plus a boolean
+    "feasible" mask; a row is infeasible when a straight segment (u or a)
+    would come out negative, which gdsfactory cannot extrude.
+    """
+    r, L, D, s = np.broadcast_arrays(
+        np.asarray(r_values, dtype=float), np.asarray(L, dtype=float),
+        np.asarray(D, dtype=float), np.asarray(s, dtype=float),
+    )
+    H = np.array([euler_bend_metrics(float(si), 180)[0] for si in s.ravel()]).reshape(s.shape)
+    JK = np.array([s_bend_train_metrics(float(ri), n_units) if ri > 0 else (0.0, 0.0) for ri in r.ravel()])
+    J = JK[:, 0].reshape(r.shape)
+    K = JK[:, 1].reshape(r.shape)
+
+    # Constraint Equations
+    u = (D - K - 2*x) / 2
+    a = (L - 2*x - 4*H - J - 2*u) / 4
+    return {
+        "r": r, "L": L, "D": D, "s": s,
+        "H": H, "J": J, "K": K, "u": u, "a": a,
+        "feasible": (u >= 0) & (a >= 0),
+    }
+
+
+def print_roc_solution(solution):
+    """Print one line per swept device, flagging infeasible rows."""
+    print(f"{'r':>8} {'L':>8} {'D':>8} {'s':>6} {'J':>10} {'K':>10} {'u':>10} {'a':>10}")
+    for i in np.ndindex(solution["r"].shape):
+        row = {key: solution[key][i] for key in ("r", "L", "D", "s", "J", "K", "u", "a")}
+        flag = "" if solution["feasible"][i] else "  <- negative segment"
+        print(f"{row['r']:8.2f} {row['L']:8.1f} {row['D']:8.1f} {row['s']:6.1f} {row['J']:10.3f} "
+              f"{row['K']:10.3f} {row['u']:10.3f} {row['a']:10.3f}{flag}")
+
+
+def check_roc_sweep(local_params):
+    """Solve the configured r sweep and raise ValueError before any geometry is built if it is infeasible."""
+    geometry = local_params["geometry"]
+    solution = solve_roc_constraints(geometry["r_values"], geometry["L"], geometry["D"], geometry["x"], geometry["s"])
+    if not solution["feasible"].all():
+        bad = [float(r) for r in solution["r"][~solution["feasible"]]]
+        raise ValueError(f"ROC constraints infeasible (negative u or a) for r = {bad}")
+    return solution
+
+
 def build_component_from_params(params):
     r = params["geometry"]["r"]
     L = params["geometry"]["L"]
@@ -157,22 +174,12 @@ def build_component_from_params(params):
     grating_coupler_config = get_gc_params(grating_coupler_model)
     
     cross_section = gf.cross_section.strip(width=width, layer=layer)
-    bend_180 = gf.path.euler(radius=s, angle=180)
-    H = bend_180.length()
-    I = bend_180.points[-1][1] - bend_180.points[0][1]
+    H, _, I = euler_bend_metrics(s, 180)
     
     if r > 0:
-        # Create Q path with 10 S-bend units (40 total bends)
-        # Each S-bend unit: -90, +90, +90, -90 (returns to same y, advances in x)
-        Q = gf.Path()
-        for i in range(12):
-            Q += gf.path.euler(radius=r, angle=-90)
-            Q += gf.path.euler(radius=r, angle=90)
-            Q += gf.path.euler(radius=r, angle=90)
-            Q += gf.path.euler(radius=r, angle=-90)
-        
-        J = Q.length()
-        K = Q.points[-1][0] - Q.points[0][0]
+        # Length and x advance of 12 S-bend units (48 bends), each -90, +90, +90, -90
+        # (returns to same y, advances in x), from the cached Euler-bend table
+        J, K = s_bend_train_metrics(r, n_units=12)
     else:
         J = 0
         K = 0
@@ -208,7 +215,7 @@ def build_component_from_params(params):
 
     cell_name = f"w{int(width*1000)}r{r}"
     final_comp = gf.Component(cell_name)
-    wg = gf.path.extrude(P, cross_section=cross_section)
+    wg = extrude_fractured(P, cross_section)
     wg_ref = final_comp << wg
     
     # Store path metrics for uniformity checking
@@ -272,8 +279,9 @@ def create_array_components_with_params(local_params):
     width = local_params["geometry"]["width"]
     width_nm = int(width * 1000)
 
-    # Range of r values from JSON
+    # Range of r values from JSON, solved up front so bad sweeps fail before extrusion
     r_values = local_params["geometry"]["r_values"]
+    check_roc_sweep(local_params)
 
     # Create the array component
     array_comp = gf.Component(f"w{width_nm}")
@@ -338,6 +346,13 @@ def p_cascades(width=None):
 
 # Show or export the array
 if __name__ == "__main__":
+    if "--solve" in sys.argv[1:]:
+        # Print the constraint table for the configured sweep without building geometry
+        geometry = params["geometry"]
+        solution = solve_roc_constraints(geometry["r_values"], geometry["L"], geometry["D"], geometry["x"], geometry["s"])
+        print_roc_solution(solution)
+        sys.exit(0 if solution["feasible"].all() else 1)
+
     # Create the array components
     array_comp, components_with_metrics = create_array_components()
     
@@ -370,6 +385,6 @@ if __name__ == "__main__":
     die_name = f"w{width_nm}"
     array_with_grid = add_die_box_with_grid(array_comp, die_name=die_name, params=params)
     
-    array_with_grid.show()
+    show_component(array_with_grid)
 
 
@@ -0,0 +1,327 @@
+"""Benchmark every layout generator entry point against a stored baseline.
+
+Each case builds one generator from a fixture in Json/benchmark/<case>.json,
+in its own Python process so import cost, peak RSS and cell names are not
+shared between cases. The written GDS is read back with KLayout to count
+cells, references, shapes and vertices; those counts must match the baseline
+exactly. Wall time and peak RSS are recorded too, but they belong to the
+machine the baseline was stored on, so they are only checked (within a
+tolerance) with --timing, against a baseline updated on the same machine.
+
+    python benchmark.py                    run all cases, compare counts to baseline
+    python benchmark.py grid snail         run selected cases
+    python benchmark.py --timing           also flag time/RSS regressions
+    python benchmark.py --update-baseline  run and store the results as baseline
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import klayout.db as kdb
+
+from output_format import MERGE_ENV, OUTPUT_FORMAT_ENV
+
+CODE_DIR = Path(__file__).resolve().parent
+DESIGN_DIR = CODE_DIR.parent
+FIXTURE_DIR = DESIGN_DIR / "Json" / "benchmark"
+BASELINE_PATH = FIXTURE_DIR / "baseline.json"
+DEPOT_DIR = DESIGN_DIR / "Depot" / "python"
+
+# Relative slack on time/RSS before a case counts as a regression, plus
+# absolute floors so sub-100 ms and small-RSS jitter are not reported.
+DEFAULT_TOLERANCE = 0.25
+TIME_FLOOR_S = 0.1
+RSS_FLOOR_MB = 20.0
+
+COUNT_KEYS = ("cells", "references", "shapes", "vertices")
+
+
+def _apply_overrides(module, overrides):
+    """Update module-level config dicts in place, e.g. {"params": {"grating_coupler_model": ...}}."""
+    for attribute, values in (overrides or {}).items():
+        getattr(module, attribute).update(values)
+
+
+# Each case takes its fixture and the GDS path to write. It returns the
+# component for the harness to write, or None when the generator wrote it.
+def _case_grid(fixture, gds_path):
+    import Grid
+    return Grid.create_grid_component(fixture["config"])
+
+
+def _case_width_pitch(fixture, gds_path):
+    import width_pitch
+    _apply_overrides(width_pitch, fixture.get("module_overrides"))
+    c, _ = width_pitch.p_cascades()
+    return c
+
+
+def _case_roc_array(fixture, gds_path):
+    import ROC_array
+    _apply_overrides(ROC_array, fixture.get("module_overrides"))
+    c, _ = ROC_array.get_component()
+    return c
+
+
+def _case_snail(fixture, gds_path):
+    import snail
+    return snail.create_spiral_with_couplers(**fixture["kwargs"])
+
+
+def _case_length_array(fixture, gds_path):
+    import length_array
+    return length_array.create_length_array(fixture["array_params"])
+
+
+def _case_bend_array(fixture, gds_path):
+    import bend_array
+    return bend_array.create_bend_array(fixture["bend_params"], fixture["array_params"])
+
+
+def _case_dosetest(fixture, gds_path):
+    import dosetest
+    dosetest.make_array(
+        fixture["values"],
+        gds_path,
+        y_spacing=fixture.get("y_spacing", 35.0),
+        start_layer=fixture.get("start_layer", 50),
+        gc_model=fixture.get("gc_model"),
+        show=False,
+    )
+    return None
+
+
+def _case_die(fixture, gds_path):
+    sys.path.insert(0, str(DEPOT_DIR))
+    import Die
+    return Die.build_die(fixture["die_data"])
+
+
+def _case_postdepot(fixture, gds_path):
+    sys.path.insert(0, str(DEPOT_DIR))
+    import postdepot
+    postdepot.build_cell(fixture["cell"], DEPOT_DIR / "cell.py", gds_path)
+    return None
+
+
+def _case_temporary_placement(fixture, gds_path):
+    import temporary_placement
+    return temporary_placement.create_temporary_placement()
+
+
+CASES = {
+    "grid": _case_grid,
+    "width_pitch": _case_width_pitch,
+    "roc_array": _case_roc_array,
+    "snail": _case_snail,
+    "length_array": _case_length_array,
+    "bend_array": _case_bend_array,
+    "dosetest": _case_dosetest,
+    "die": _case_die,
+    "postdepot": _case_postdepot,
+    "temporary_placement": _case_temporary_placement,
+}
+
+
+def layout_counts(gds_path):
+    """Cell, reference, shape and vertex counts of a GDS file, plus its size in bytes."""
+    layout = kdb.Layout()
+    layout.read(str(gds_path))
+    references = shapes = vertices = 0
+    for cell in layout.each_cell():
+        references += cell.child_instances()
+        for layer_index in layout.layer_indexes():
+            for shape in cell.shapes(layer_index).each():
+                shapes += 1
+                if shape.is_polygon() or shape.is_box() or shape.is_path():
+                    vertices += shape.polygon.num_points()
+    return {
+        "cells": layout.cells(),
+        "references": references,
+        "shapes": shapes,
+        "vertices": vertices,
+        "gds_bytes": Path(gds_path).stat().st_size,
+    }
+
+
+def _peak_rss_mb():
+    """Peak RSS in MB, or None where the platform offers no way to read it."""
+    try:
+        import resource
+    except ImportError:
+        # Windows: no getrusage; psutil exposes the peak working set when installed
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return round(psutil.Process().memory_info().peak_wset / 2**20, 1)
+    # ru_maxrss is in KiB on Linux and bytes on macOS; children covers generators that build in a subprocess
+    unit = 2**20 if sys.platform == "darwin" else 2**10
+    self_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    child_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(max(self_rss, child_rss) / unit, 1)
+
+
+def run_case_inline(name, gds_path):
+    """Build one case in this process and return its metrics."""
+    with open(FIXTURE_DIR / f"{name}.json", "r") as f:
+        fixture = json.load(f)
+    gds_path = Path(gds_path)
+
+    os.chdir(DESIGN_DIR)
+    sys.path.insert(0, str(CODE_DIR))
+    # Sizes and counts are compared against an unmerged GDSII baseline
+    os.environ[OUTPUT_FORMAT_ENV] = "gds"
+    os.environ[MERGE_ENV] = "0"
+    # gdsfactory is shared by every generator; its import is timed separately from the build
+    start = time.perf_counter()
+    importlib.import_module("gdsfactory")
+    import_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    component = CASES[name](fixture, gds_path)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if component is not None:
+        component.write_gds(gds_path)
+    write_s = time.perf_counter() - start
+
+    metrics = {
+        "import_s": round(import_s, 3),
+        "build_s": round(build_s, 3),
+        "write_s": round(write_s, 3),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    metrics.update(layout_counts(gds_path))
+    return metrics
+
+
+def build_case(name, gds_path, verbose=False):
+    """Build one case into ``gds_path`` in a fresh interpreter and return its metrics."""
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics_path = Path(tmp) / "metrics.json"
+        result = subprocess.run(
+            [sys.executable, __file__, "--case", name, "--gds", str(gds_path), "--metrics", str(metrics_path)],
+            stdout=None if verbose else subprocess.DEVNULL,
+            stderr=None if verbose else subprocess.PIPE,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Benchmark case '{name}' failed:\n{result.stderr or ''}")
+        with open(metrics_path, "r") as f:
+            return json.load(f)
+
+
+def run_case(name, verbose=False):
+    """Run one case in a fresh interpreter and return its metrics."""
+    with tempfile.TemporaryDirectory() as tmp:
+        return build_case(name, Path(tmp) / f"{name}.gds", verbose)
+
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE, timing=False):
+    """Return a list of regression messages; empty when every case is within limits.
+
+    Counts must match exactly. Time and RSS depend on the machine, so they
+    are only compared with timing=True.
+    """
+    problems = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"  {name}: no baseline entry")
+            continue
+        for key in COUNT_KEYS:
+            if metrics[key] != base[key]:
+                problems.append(f"{name}: {key} changed {base[key]} -> {metrics[key]}")
+        if not timing:
+            continue
+        for key, floor in (("build_s", TIME_FLOOR_S), ("write_s", TIME_FLOOR_S), ("peak_rss_mb", RSS_FLOOR_MB)):
+            if metrics[key] is None or base.get(key) is None:
+                continue
+            if metrics[key] > base[key] * (1 + tolerance) and metrics[key] - base[key] > floor:
+                problems.append(f"{name}: {key} regressed {base[key]} -> {metrics[key]}")
+    return problems
+
+
+def print_results(results, baseline):
+    print(f"{'case':<20} {'build s':>8} {'write s':>8} {'RSS MB':>8} {'cells':>6} {'refs':>6} {'shapes':>8} {'vertices':>10} {'GDS kB':>8}")
+    for name, m in results.items():
+        base = baseline.get(name, {})
+        delta = f"  ({m['build_s'] - base['build_s']:+.3f} s)" if "build_s" in base else ""
+        print(
+            f"{name:<20} {m['build_s']:8.3f} {m['write_s']:8.3f} {m['peak_rss_mb'] or float('nan'):8.1f} {m['cells']:6d} "
+            f"{m['references']:6d} {m['shapes']:8d} {m['vertices']:10d} {m['gds_bytes'] / 1024:8.1f}{delta}"
+        )
+
+
+def _results_path():
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "Setup").exists():
+            return parent / "Setup" / "build" / "benchmark" / "latest.json"
+    return DESIGN_DIR / "build" / "benchmark" / "latest.json"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--timing", action="store_true", help="also compare time/RSS (baseline must come from this machine)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed relative time/RSS increase with --timing")
+    parser.add_argument("--verbose", action="store_true", help="show generator output")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    parser.add_argument("--gds", help=argparse.SUPPRESS)
+    parser.add_argument("--metrics", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        # Child process: build one case and hand the metrics back through a file
+        metrics = run_case_inline(args.case, args.gds)
+        with open(args.metrics, "w") as f:
+            json.dump(metrics, f)
+        return 0
+
+    names = args.cases or list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark case(s): {', '.join(unknown)}")
+
+    baseline = {}
+    if BASELINE_PATH.exists():
+        with open(BASELINE_PATH, "r") as f:
+            baseline = json.load(f)
+
+    results = {}
+    for name in names:
+        print(f"Running {name}...")
+        results[name] = run_case(name, verbose=args.verbose)
+    print_results(results, baseline)
+
+    results_path = _results_path()
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(results_path, "w") as f:
+        json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Baseline updated: {BASELINE_PATH}")
+        return 0
+
+    problems = compare_to_baseline(results, baseline, args.tolerance, args.timing)
+    for problem in problems:
+        print(f"  REGRESSION {problem}")
+    print("Benchmark OK" if not problems else f"{len(problems)} regression(s)")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,6 +5,8 @@ import hashlib
 import json
 
 import gdsfactory as gf
+import klayout.db as kdb
+import numpy as np
 from pathlib import Path
 import kfactory.conf as kf_conf
 
@@ -15,6 +17,7 @@ for _parent in Path(__file__).resolve().parents:
         kf_conf.config.__dict__["project_dir"] = _setup_dir
         break
 from grating_couplers import create_grating_coupler
+from euler_table import euler_bend_metrics
 
 # gdsfactory 9.x requires an active PDK before geometry/layer creation.
 try:
@@ -26,6 +29,32 @@ except Exception:
         from gdsfactory.generic_tech import get_generic_pdk
         get_generic_pdk().activate()
 
+# (radius, width, layer) -> ring marker component, shared by every U-turn element.
+_ring_cache = {}
+
+
+def ring_marker(radius: float, width: float, layer: tuple[int, int], angle_resolution: float = 2.5) -> gf.Component:
+    """Return a cached annulus centred on (0, 0), built as one polygon with a hole.
+
+    The vertices match gf.components.circle at the same angle_resolution, so the
+    result is identical to subtracting the inner circle from the outer one.
+    """
+    key = (round(radius, 6), round(width, 6), tuple(layer), angle_resolution)
+    if key in _ring_cache:
+        return _ring_cache[key]
+
+    num_points = int(np.round(360.0 / angle_resolution)) + 1
+    theta = np.deg2rad(np.linspace(0, 360, num_points, endpoint=True))[:-1]
+    unit = np.stack((np.cos(theta), np.sin(theta)), axis=-1)
+    annulus = kdb.DPolygon([kdb.DPoint(x, y) for x, y in (radius * unit).tolist()])
+    annulus.insert_hole([kdb.DPoint(x, y) for x, y in ((radius - width) * unit).tolist()])
+
+    # Auto-generated name, like the other helper cells, to avoid collisions across mixed scripts.
+    ring = gf.Component()
+    ring.add_polygon(annulus, layer=tuple(layer))
+    _ring_cache[key] = ring
+    return ring
+
 
 def create_gc_u_turn_element(
     wg_width: float = 0.5,
@@ -56,13 +85,13 @@ def create_gc_u_turn_element(
     bend_cell = gf.Component()
 
     # Derive straight length from the target total length.
-    bend_path = gf.path.euler(radius=bend_radius, angle=180)
-    bend_length = bend_path.length()
+    bend_length = euler_bend_metrics(bend_radius, 180)[0]
     if approximate_length < bend_length:
         raise ValueError(
             f"approximate_length must be >= bend_length ({bend_length:.2f} um)."
         )
     straight_length = 0.5 * (approximate_length - bend_length)
+    bend_path = gf.path.euler(radius=bend_radius, angle=180)
 
     wg_xs = gf.cross_section.strip(width=wg_width, layer=waveguide_layer)
     gc = create_grating_coupler(
@@ -95,14 +124,9 @@ def create_gc_u_turn_element(
     top.add_port("opt_in", port=bend_ref.ports["opt_in"])
     top.add_port("opt_out", port=bend_ref.ports["opt_out"])
 
-    # Build ring in a unique helper cell.
-    ring_cell = gf.Component()
+    # Ring marker, shared between elements with the same radius/width/layer.
     ring_width = max(wg_width, 0.2)
-    outer_circle = gf.components.circle(radius=ring_radius, layer=ring_layer)
-    inner_circle = gf.components.circle(radius=ring_radius - ring_width, layer=ring_layer)
-    ring = gf.boolean(A=outer_circle, B=inner_circle, operation="A-B", layer=ring_layer)
-    _ = ring_cell << ring
-    ring_ref = top << ring_cell
+    ring_ref = top << ring_marker(ring_radius, ring_width, ring_layer)
     ring_ref.move(origin=(0, 0), destination=(0, 8.5))
 
     # Build text in a unique helper cell and place at (-25, 8.5).
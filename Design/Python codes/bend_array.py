@@ -15,6 +15,7 @@ for _parent in Path(__file__).resolve().parents:
         kf_conf.config.__dict__["project_dir"] = _setup_dir
         break
 from bend import create_gc_u_turn_element, load_bend_params
+from output_format import show_component
 
 
 # gdsfactory 9.x requires an active PDK before geometry/layer creation.
@@ -237,5 +238,5 @@ if __name__ == "__main__":
 
     bend_array = create_bend_array(bend_params, bend_array_params)
 
-    bend_array.show()
+    show_component(bend_array)
 
@@ -0,0 +1,343 @@
+"""DEPLOF font tables for the grid coordinate labels.
+
+Copied from gdsfactory.constants (gdsfactory 9.x), where they are private, so
+that Grid.py's label geometry and grid cache keys do not change with a
+gdsfactory upgrade. Coordinates are in units of 1/1000 of the text size.
+
+The DEPLOF font is made by David Elata, MEMS Lab, Technion, Haifa, Israel and
+is used with permission. The raw polygon entries are sourced from Ulf
+Griesmann's modified DEPLOF implementation used in the MATLAB gdsii toolbox
+https://github.com/ulfgri/gdsii-toolbox/ and are used with permission.
+"""
+
+# ASCII code -> list of closed polygons [[x, y], ...]
+GLYPHS = {
+    33: [  # !
+        [[100, -100], [100, 100], [300, 100], [300, -100], [100, -100]],
+        [[100, 250], [100, 1100], [300, 1100], [300, 250], [100, 250]],
+    ],
+    34: [  # "
+        [[300, 800], [300, 1200], [500, 1200], [500, 1000], [300, 800]],
+        [[600, 800], [600, 1200], [800, 1200], [800, 1000], [600, 800]],
+    ],
+    35: [  # #
+        [[150, 0], [170, 200], [50, 200], [50, 400], [190, 400], [210, 600], [100, 600], [100, 800], [230, 800], [250, 1000], [450, 1000], [390, 400], [530, 400], [510, 200], [370, 200], [350, 0], [150, 0]],
+        [[550, 0], [610, 600], [470, 600], [490, 800], [630, 800], [650, 1000], [850, 1000], [830, 800], [950, 800], [950, 600], [810, 600], [790, 400], [900, 400], [900, 200], [770, 200], [750, 0], [550, 0]],
+    ],
+    36: [  # $
+        [[400, 1000], [400, 1200], [600, 1200], [600, 1000], [800, 1000], [900, 900], [900, 800], [300, 800], [300, 600], [400, 600], [400, 700], [600, 700], [600, 600], [800, 600], [900, 500], [900, 100], [800, 0], [600, 0], [600, -200], [400, -200], [400, 0], [200, 0], [100, 100], [100, 200], [700, 200], [700, 400], [600, 400], [600, 300], [400, 300], [400, 400], [200, 400], [100, 500], [100, 900], [200, 1000], [400, 1000]],
+    ],
+    37: [  # %
+        [[100, 100], [800, 1000], [900, 900], [200, 0], [100, 100]],
+        [[100, 900], [400, 900], [400, 650], [350, 600], [200, 600], [300, 700], [300, 800], [200, 800], [200, 700], [100, 600], [100, 900]],
+        [[650, 400], [800, 400], [700, 300], [700, 200], [800, 200], [800, 300], [900, 400], [900, 100], [600, 100], [600, 350], [650, 400]],
+    ],
+    38: [  # &
+        [[700, 0], [100, 600], [100, 800], [200, 900], [400, 900], [500, 800], [500, 800], [500, 600], [450, 550], [350, 650], [400, 700], [300, 800], [200, 700], [600, 300], [700, 400], [800, 300], [700, 200], [900, 0], [700, 0]],
+        [[550, 50], [500, 0], [100, 0], [0, 100], [0, 300], [100, 400], [150, 450], [250, 350], [100, 200], [100, 150], [150, 100], [400, 100], [450, 150], [550, 50]],
+    ],
+    39: [  # '
+        [[300, 800], [300, 1200], [500, 1200], [500, 1000], [300, 800]],
+    ],
+    40: [  # (
+        [[100, 500], [125, 700], [175, 900], [250, 1100], [450, 1100], [375, 900], [325, 700], [300, 500], [325, 300], [375, 100], [450, -100], [250, -100], [175, 100], [125, 300], [100, 500]],
+    ],
+    41: [  # )
+        [[100, 1100], [300, 1100], [375, 900], [425, 700], [450, 500], [425, 300], [375, 100], [300, -100], [100, -100], [175, 100], [225, 300], [250, 500], [225, 700], [175, 900], [100, 1100]],
+    ],
+    42: [  # *
+        [[450, 750], [450, 1000], [550, 1000], [550, 750], [800, 750], [800, 650], [550, 650], [550, 400], [450, 400], [450, 650], [200, 650], [200, 750], [450, 750]],
+        [[350, 850], [250, 850], [200, 900], [200, 1000], [300, 1000], [350, 950], [350, 850]],
+        [[650, 850], [650, 950], [700, 1000], [800, 1000], [800, 900], [750, 850], [650, 850]],
+        [[650, 550], [750, 550], [800, 500], [800, 400], [700, 400], [650, 450], [650, 550]],
+        [[350, 550], [350, 450], [300, 400], [200, 400], [200, 500], [250, 550], [350, 550]],
+    ],
+    43: [  # +
+        [[400, 600], [400, 900], [600, 900], [600, 600], [900, 600], [900, 400], [600, 400], [600, 100], [400, 100], [400, 400], [100, 400], [100, 600], [400, 600]],
+    ],
+    44: [  # ,
+        [[300, 200], [300, 0], [100, -200], [100, 200], [300, 200]],
+    ],
+    45: [  # -
+        [[900, 550], [900, 350], [100, 350], [100, 550], [900, 550]],
+    ],
+    46: [  # .
+        [[300, 200], [300, 0], [100, 0], [100, 200], [300, 200]],
+    ],
+    47: [  # /
+        [[500, 1200], [300, -200], [100, -200], [300, 1200], [500, 1200]],
+    ],
+    48: [  # 0
+        [[400, 800], [300, 700], [300, 300], [400, 200], [350, 0], [300, 0], [100, 200], [100, 800], [300, 1000], [530, 1000], [480, 800], [400, 800]],
+        [[600, 200], [700, 300], [700, 700], [600, 800], [650, 1000], [700, 1000], [900, 800], [900, 200], [700, 0], [470, 0], [520, 200], [600, 200]],
+    ],
+    49: [  # 1
+        [[200, 600], [100, 600], [100, 800], [300, 1000], [400, 1000], [400, 200], [500, 200], [500, 0], [100, 0], [100, 200], [200, 200], [200, 600], [200, 600]],
+    ],
+    50: [  # 2
+        [[100, 900], [200, 1000], [700, 1000], [800, 900], [800, 600], [400, 200], [800, 200], [800, 0], [100, 0], [100, 200], [600, 700], [600, 800], [300, 800], [300, 700], [100, 700], [100, 900]],
+    ],
+    51: [  # 3
+        [[600, 1000], [800, 800], [800, 600], [700, 500], [800, 400], [800, 200], [600, 0], [300, 0], [100, 200], [100, 300], [300, 300], [400, 200], [500, 200], [600, 300], [500, 400], [500, 600], [600, 700], [500, 800], [400, 800], [300, 700], [100, 700], [100, 800], [300, 1000], [600, 1000]],
+    ],
+    52: [  # 4
+        [[800, 500], [800, 300], [700, 300], [700, 0], [500, 0], [500, 300], [100, 300], [100, 1000], [300, 1000], [300, 500], [500, 500], [500, 1000], [700, 1000], [700, 500], [800, 500]],
+    ],
+    53: [  # 5
+        [[800, 800], [300, 800], [300, 600], [700, 600], [800, 500], [800, 100], [700, 0], [200, 0], [100, 100], [100, 300], [300, 300], [300, 200], [600, 200], [600, 400], [200, 400], [100, 500], [100, 1000], [800, 1000], [800, 800]],
+    ],
+    54: [  # 6
+        [[800, 700], [600, 700], [600, 800], [300, 800], [300, 600], [700, 600], [800, 500], [800, 100], [700, 0], [500, 0], [500, 200], [600, 200], [600, 400], [300, 400], [300, 200], [400, 200], [400, 0], [200, 0], [100, 100], [100, 900], [200, 1000], [700, 1000], [800, 900], [800, 700]],
+    ],
+    55: [  # 7
+        [[560, 800], [100, 800], [100, 1000], [800, 1000], [600, 0], [400, 0], [480, 400], [520, 600], [560, 800]],
+    ],
+    56: [  # 8
+        [[400, 800], [300, 800], [300, 600], [600, 600], [600, 800], [500, 800], [500, 1000], [700, 1000], [800, 900], [800, 600], [700, 500], [800, 400], [800, 100], [700, 0], [500, 0], [500, 200], [600, 200], [600, 400], [300, 400], [300, 200], [400, 200], [400, 0], [200, 0], [100, 100], [100, 400], [200, 500], [100, 600], [100, 900], [200, 1000], [400, 1000], [400, 800]],
+    ],
+    57: [  # 9
+        [[100, 300], [300, 300], [300, 200], [600, 200], [600, 400], [200, 400], [100, 500], [100, 900], [200, 1000], [400, 1000], [400, 800], [300, 800], [300, 600], [600, 600], [600, 800], [500, 800], [500, 1000], [700, 1000], [800, 900], [800, 100], [700, 0], [200, 0], [100, 100], [100, 300]],
+    ],
+    58: [  # :
+        [[300, 200], [300, 0], [100, 0], [100, 200], [300, 200]],
+        [[300, 600], [300, 400], [100, 400], [100, 600], [300, 600]],
+    ],
+    59: [  # ;
+        [[300, 200], [300, 0], [100, -200], [100, 200], [300, 200]],
+        [[300, 600], [300, 400], [100, 400], [100, 600], [300, 600]],
+    ],
+    60: [  # <
+        [[700, 900], [700, 700], [400, 500], [700, 300], [700, 100], [100, 500], [700, 900]],
+    ],
+    61: [  # =
+        [[100, 400], [900, 400], [900, 200], [100, 200], [100, 400]],
+        [[100, 800], [900, 800], [900, 600], [100, 600], [100, 800]],
+    ],
+    62: [  # >
+        [[700, 500], [100, 100], [100, 300], [400, 500], [100, 700], [100, 900], [700, 500]],
+    ],
+    63: [  # ?
+        [[100, 1000], [200, 1100], [800, 1100], [900, 1000], [900, 500], [800, 400], [600, 400], [600, 200], [400, 200], [400, 500], [500, 600], [700, 600], [700, 900], [300, 900], [300, 800], [100, 800], [100, 1000]],
+        [[600, 50], [600, -150], [400, -150], [400, 50], [600, 50]],
+    ],
+    64: [  # @
+        [[900, 200], [900, 100], [800, 0], [300, 0], [100, 200], [100, 800], [300, 1000], [700, 1000], [900, 800], [900, 500], [800, 400], [450, 400], [400, 450], [400, 600], [450, 700], [600, 700], [550, 600], [550, 500], [700, 500], [700, 700], [600, 800], [400, 800], [300, 700], [300, 300], [400, 200], [900, 200]],
+    ],
+    65: [  # A
+        [[100, 800], [300, 1000], [601, 1000], [800, 800], [800, 0], [601, 0], [601, 200], [500, 200], [500, 400], [601, 400], [601, 700], [500, 800], [400, 800], [300, 700], [300, 400], [400, 400], [400, 200], [300, 200], [300, 0], [99, 0], [100, 800]],
+    ],
+    66: [  # B
+        [[600, 1000], [800, 800], [800, 600], [700, 500], [800, 400], [800, 200], [600, 0], [100, 0], [100, 400], [300, 400], [300, 200], [500, 200], [600, 300], [500, 400], [420, 400], [420, 600], [500, 600], [600, 700], [500, 800], [300, 800], [300, 600], [100, 600], [100, 1000], [600, 1000]],
+    ],
+    67: [  # C
+        [[300, 0], [100, 200], [100, 800], [300, 1000], [600, 1000], [800, 800], [800, 600], [600, 600], [600, 700], [500, 800], [400, 800], [300, 700], [300, 300], [400, 200], [500, 200], [600, 300], [600, 400], [800, 400], [800, 200], [600, 0], [300, 0]],
+    ],
+    68: [  # D
+        [[100, 0], [100, 400], [300, 400], [300, 200], [500, 200], [600, 300], [600, 700], [500, 800], [300, 800], [300, 600], [100, 600], [100, 1000], [600, 1000], [800, 800], [800, 200], [600, 0], [100, 0]],
+    ],
+    69: [  # E
+        [[700, 1000], [700, 800], [300, 800], [300, 600], [500, 600], [500, 400], [300, 400], [300, 200], [700, 200], [700, 0], [100, 0], [100, 1000], [700, 1000]],
+    ],
+    70: [  # F
+        [[100, 0], [100, 1000], [700, 1000], [700, 800], [300, 800], [300, 600], [500, 600], [500, 400], [300, 400], [300, 0], [100, 0]],
+    ],
+    71: [  # G
+        [[300, 0], [100, 200], [100, 800], [300, 1000], [600, 1000], [800, 800], [800, 700], [600, 700], [500, 800], [400, 800], [300, 700], [300, 300], [400, 200], [600, 200], [600, 300], [500, 300], [500, 500], [800, 500], [800, 100], [700, 0], [300, 0]],
+    ],
+    72: [  # H
+        [[100, 1000], [300, 1000], [300, 600], [600, 600], [600, 1000], [800, 1000], [800, 0], [600, 0], [600, 400], [300, 400], [300, 0], [100, 0], [100, 1000]],
+    ],
+    73: [  # I
+        [[100, 0], [100, 200], [300, 200], [300, 800], [100, 800], [100, 1000], [700, 1000], [700, 800], [500, 800], [500, 200], [700, 200], [700, 0], [100, 0]],
+    ],
+    74: [  # J
+        [[300, 200], [500, 200], [500, 1000], [700, 1000], [700, 100], [600, 0], [200, 0], [100, 100], [100, 300], [300, 300], [300, 200]],
+    ],
+    75: [  # K
+        [[100, 1000], [300, 1000], [300, 600], [600, 1000], [800, 1000], [800, 900], [500, 500], [800, 100], [800, 0], [600, 0], [300, 400], [300, 0], [100, 0], [100, 1000]],
+    ],
+    76: [  # L
+        [[100, 1000], [300, 1000], [300, 200], [800, 200], [800, 0], [100, 0], [100, 1000]],
+    ],
+    77: [  # M
+        [[100, 1000], [300, 1000], [500, 700], [700, 1000], [900, 1000], [900, 0], [700, 0], [700, 600], [500, 300], [300, 600], [300, 0], [100, 0], [100, 1000]],
+    ],
+    78: [  # N
+        [[100, 1000], [300, 1000], [700, 400], [700, 1000], [900, 1000], [900, 0], [700, 0], [300, 600], [300, 0], [100, 0], [100, 1000]],
+    ],
+    79: [  # O
+        [[100, 800], [300, 1000], [430, 1000], [430, 800], [400, 800], [300, 700], [300, 300], [400, 200], [600, 200], [700, 300], [700, 700], [600, 800], [570, 800], [570, 1000], [700, 1000], [900, 800], [900, 200], [700, 0], [300, 0], [100, 200], [100, 800]],
+    ],
+    80: [  # P
+        [[100, 1000], [700, 1000], [900, 800], [900, 600], [700, 400], [500, 400], [500, 600], [600, 600], [700, 700], [600, 800], [300, 800], [300, 0], [100, 0], [100, 1000]],
+    ],
+    81: [  # Q
+        [[100, 800], [300, 1000], [700, 1000], [900, 800], [900, 200], [800, 100], [900, 0], [600, 0], [600, 400], [700, 400], [700, 700], [600, 800], [400, 800], [300, 700], [300, 300], [400, 200], [400, 0], [300, 0], [100, 200], [100, 800]],
+    ],
+    82: [  # R
+        [[100, 1000], [700, 1000], [900, 800], [900, 600], [700, 400], [900, 200], [900, 0], [700, 0], [700, 100], [500, 300], [500, 600], [600, 600], [700, 700], [600, 800], [300, 800], [300, 0], [100, 0], [100, 1000]],
+    ],
+    83: [  # S
+        [[900, 800], [300, 800], [300, 600], [800, 600], [900, 500], [900, 100], [800, 0], [200, 0], [100, 100], [100, 200], [700, 200], [700, 400], [200, 400], [100, 500], [100, 900], [200, 1000], [800, 1000], [900, 900], [900, 800]],
+    ],
+    84: [  # T
+        [[900, 1000], [900, 800], [600, 800], [600, 0], [400, 0], [400, 800], [100, 800], [100, 1000], [900, 1000]],
+    ],
+    85: [  # U
+        [[300, 1000], [300, 300], [400, 200], [500, 200], [600, 300], [600, 1000], [800, 1000], [800, 200], [600, 0], [300, 0], [100, 200], [100, 1000], [300, 1000]],
+    ],
+    86: [  # V
+        [[300, 1000], [500, 400], [700, 1000], [900, 1000], [600, 0], [400, 0], [100, 1000], [300, 1000]],
+    ],
+    87: [  # W
+        [[100, 1000], [300, 1000], [300, 400], [500, 700], [700, 400], [700, 1000], [900, 1000], [900, 0], [700, 0], [500, 300], [300, 0], [100, 0], [100, 1000]],
+    ],
+    88: [  # X
+        [[367, 500], [100, 900], [100, 1000], [300, 1000], [500, 700], [700, 1000], [900, 1000], [900, 900], [633, 500], [900, 100], [900, 0], [700, 0], [500, 300], [300, 0], [100, 0], [100, 100], [367, 500]],
+    ],
+    89: [  # Y
+        [[600, 450], [600, 0], [400, 0], [400, 450], [100, 900], [100, 1000], [300, 1000], [500, 700], [700, 1000], [900, 1000], [900, 900], [600, 450]],
+    ],
+    90: [  # Z
+        [[100, 1000], [900, 1000], [900, 700], [300, 200], [900, 200], [900, 0], [100, 0], [100, 300], [700, 800], [100, 800], [100, 1000]],
+    ],
+    91: [  # [
+        [[400, 1200], [400, 1000], [300, 1000], [300, 0], [400, 0], [400, -200], [100, -200], [100, 1200], [400, 1200]],
+    ],
+    92: [  # \
+        [[300, 1200], [500, -200], [300, -200], [100, 1200], [300, 1200]],
+    ],
+    93: [  # ]
+        [[400, 1200], [400, -200], [100, -200], [100, 0], [200, 0], [200, 1000], [100, 1000], [100, 1200], [400, 1200]],
+    ],
+    94: [  # ^
+        [[0, 500], [400, 900], [800, 500], [600, 500], [400, 700], [200, 500], [0, 500]],
+    ],
+    95: [  # _
+        [[100, 200], [900, 200], [900, 0], [100, 0], [100, 200]],
+    ],
+    96: [  # `
+        [[300, 1000], [300, 1200], [500, 1200], [500, 800], [300, 1000]],
+    ],
+    97: [  # a
+        [[800, 0], [300, 0], [100, 200], [100, 500], [334, 700], [600, 700], [600, 775], [800, 775], [800, 400], [600, 400], [600, 500], [400, 500], [300, 400], [300, 300], [400, 200], [600, 200], [600, 300], [800, 300], [800, 0]],
+    ],
+    98: [  # b
+        [[100, 300], [300, 300], [300, 200], [500, 200], [600, 300], [600, 400], [500, 500], [300, 500], [300, 400], [100, 400], [100, 1000], [300, 1000], [300, 700], [600, 700], [800, 500], [800, 200], [600, 0], [100, 0], [100, 300]],
+    ],
+    99: [  # c
+        [[800, 200], [600, 0], [300, 0], [100, 200], [100, 500], [300, 700], [600, 700], [800, 500], [800, 400], [600, 400], [500, 500], [400, 500], [300, 400], [300, 300], [400, 200], [500, 200], [600, 300], [800, 300], [800, 200]],
+    ],
+    100: [  # d
+        [[800, 0], [300, 0], [100, 200], [100, 500], [300, 700], [600, 700], [600, 1000], [800, 1000], [800, 400], [600, 400], [600, 500], [400, 500], [300, 400], [300, 300], [400, 200], [600, 200], [600, 300], [800, 300], [800, 0]],
+    ],
+    101: [  # e
+        [[200, 0], [100, 100], [100, 700], [200, 800], [700, 800], [800, 700], [800, 400], [700, 300], [440, 300], [440, 500], [600, 500], [600, 600], [300, 600], [300, 200], [800, 200], [800, 100], [700, 0], [200, 0]],
+    ],
+    102: [  # f
+        [[600, 800], [300, 800], [300, 600], [500, 600], [500, 400], [300, 400], [300, 0], [100, 0], [100, 900], [200, 1000], [600, 1000], [600, 800]],
+    ],
+    103: [  # g
+        [[800, 400], [600, 400], [600, 500], [400, 500], [300, 400], [300, 300], [400, 200], [600, 200], [600, 300], [800, 300], [800, -200], [700, -300], [300, -300], [200, -200], [100, -100], [600, -100], [600, 0], [334, 0], [100, 200], [100, 500], [300, 700], [800, 700], [800, 400]],
+    ],
+    104: [  # h
+        [[600, 0], [600, 400], [500, 500], [400, 500], [300, 400], [300, 0], [100, 0], [100, 1100], [300, 1100], [300, 600], [400, 700], [600, 700], [800, 500], [800, 0], [600, 0]],
+    ],
+    105: [  # i
+        [[100, 0], [100, 600], [300, 600], [300, 0], [100, 0]],
+        [[300, 1000], [300, 800], [100, 800], [100, 1000], [300, 1000]],
+    ],
+    106: [  # j
+        [[100, -100], [100, 0], [300, 0], [300, 600], [500, 600], [500, -100], [400, -200], [200, -200], [100, -100]],
+        [[500, 1000], [500, 800], [300, 800], [300, 1000], [500, 1000]],
+    ],
+    107: [  # k
+        [[300, 500], [600, 700], [800, 700], [800, 600], [500, 400], [800, 100], [800, 0], [600, 0], [300, 300], [300, 0], [100, 0], [100, 1100], [300, 1100], [300, 500]],
+    ],
+    108: [  # l
+        [[500, 0], [200, 0], [100, 100], [100, 1000], [300, 1000], [300, 200], [500, 200], [500, 0]],
+    ],
+    109: [  # m
+        [[500, 400], [400, 500], [300, 400], [300, 0], [100, 0], [100, 700], [300, 700], [300, 600], [400, 700], [500, 700], [600, 600], [700, 700], [900, 700], [1100, 500], [1100, 0], [900, 0], [900, 400], [800, 500], [700, 400], [700, 0], [500, 0], [500, 400]],
+    ],
+    110: [  # n
+        [[600, 0], [600, 400], [500, 500], [400, 500], [300, 400], [300, 0], [100, 0], [100, 700], [300, 700], [300, 600], [400, 700], [600, 700], [800, 500], [800, 0], [600, 0]],
+    ],
+    111: [  # o
+        [[600, 700], [800, 500], [800, 200], [600, 0], [300, 0], [100, 200], [100, 500], [300, 700], [400, 700], [400, 500], [300, 400], [300, 300], [400, 200], [500, 200], [600, 300], [600, 400], [500, 500], [500, 700], [600, 700]],
+    ],
+    112: [  # p
+        [[100, 700], [600, 700], [800, 500], [800, 200], [600, 0], [300, 0], [300, -300], [100, -300], [100, 300], [300, 300], [300, 200], [500, 200], [600, 300], [600, 400], [500, 500], [300, 500], [300, 400], [100, 400], [100, 700]],
+    ],
+    113: [  # q
+        [[800, 400], [600, 400], [600, 500], [400, 500], [300, 400], [300, 300], [400, 200], [600, 200], [600, 300], [800, 300], [800, -300], [600, -300], [600, 0], [300, 0], [100, 200], [100, 500], [300, 700], [800, 700], [800, 400]],
+    ],
+    114: [  # r
+        [[600, 400], [600, 500], [400, 500], [300, 400], [300, 0], [100, 0], [100, 700], [300, 700], [300, 600], [400, 700], [700, 700], [800, 600], [800, 400], [600, 400]],
+    ],
+    115: [  # s
+        [[200, 0], [100, 100], [100, 200], [600, 200], [600, 300], [200, 300], [100, 400], [100, 700], [200, 800], [700, 800], [800, 700], [800, 600], [300, 600], [300, 500], [700, 500], [800, 400], [800, 100], [700, 0], [200, 0]],
+    ],
+    116: [  # t
+        [[600, 0], [400, 0], [300, 100], [300, 600], [100, 600], [100, 800], [300, 800], [300, 1000], [500, 1000], [500, 800], [700, 800], [700, 600], [500, 600], [500, 200], [600, 200], [600, 0]],
+    ],
+    117: [  # u
+        [[300, 700], [300, 300], [400, 200], [500, 200], [600, 300], [600, 700], [800, 700], [800, 0], [600, 0], [600, 100], [500, 0], [300, 0], [100, 200], [100, 700], [300, 700]],
+    ],
+    118: [  # v
+        [[300, 0], [100, 700], [300, 700], [400, 350], [500, 700], [700, 700], [500, 0], [300, 0]],
+    ],
+    119: [  # w
+        [[600, 350], [500, 0], [300, 0], [100, 700], [300, 700], [400, 350], [500, 700], [700, 700], [800, 350], [900, 700], [1100, 700], [900, 0], [700, 0], [600, 350]],
+    ],
+    120: [  # x
+        [[308, 350], [100, 600], [100, 700], [300, 700], [450, 520], [600, 700], [800, 700], [800, 600], [592, 350], [800, 100], [800, 0], [600, 0], [450, 180], [300, 0], [100, 0], [100, 100], [308, 350]],
+    ],
+    121: [  # y
+        [[214, -300], [300, 0], [100, 700], [300, 700], [400, 350], [500, 700], [700, 700], [500, 0], [414, -300], [214, -300]],
+    ],
+    122: [  # z
+        [[100, 500], [100, 700], [700, 700], [700, 500], [400, 200], [700, 200], [700, 0], [100, 0], [100, 200], [400, 500], [100, 500]],
+    ],
+    123: [  # {
+        [[100, 500], [200, 600], [200, 1000], [400, 1200], [500, 1200], [500, 1000], [400, 1000], [400, 600], [300, 500], [400, 400], [400, 0], [500, 0], [500, -200], [400, -200], [200, 0], [200, 400], [100, 500]],
+    ],
+    124: [  # |
+        [[100, -100], [100, 1100], [300, 1100], [300, -100], [100, -100]],
+    ],
+    125: [  # }
+        [[500, 500], [400, 600], [400, 1000], [200, 1200], [100, 1200], [100, 1000], [200, 1000], [200, 600], [300, 500], [200, 400], [200, 0], [100, 0], [100, -200], [200, -200], [400, 0], [400, 400], [500, 500]],
+    ],
+    126: [  # ~
+        [[100, 700], [250, 800], [350, 800], [650, 600], [750, 600], [900, 700], [900, 500], [750, 400], [650, 400], [350, 600], [250, 600], [100, 500], [100, 700]],
+    ],
+    181: [  # µ
+        [[300, 700], [300, 300], [400, 200], [500, 200], [600, 300], [600, 700], [800, 700], [800, 0], [600, 0], [600, 100], [500, 0], [400, 0], [300, 100], [300, -300], [100, -300], [100, 700], [300, 700]],
+    ],
+}
+
+# ASCII code -> advance width and left indent of the character
+WIDTHS = {
+    33: 400, 34: 500, 35: 800, 36: 800, 37: 800, 38: 900, 39: 200, 40: 450, 41: 450, 42: 600,
+    43: 800, 44: 200, 45: 800, 46: 200, 47: 400, 48: 800, 49: 400, 50: 700, 51: 700, 52: 700,
+    53: 700, 54: 700, 55: 700, 56: 700, 57: 700, 58: 200, 59: 200, 60: 600, 61: 800, 62: 600,
+    63: 800, 64: 800, 65: 700, 66: 700, 67: 700, 68: 700, 69: 600, 70: 600, 71: 700, 72: 700,
+    73: 600, 74: 600, 75: 700, 76: 700, 77: 800, 78: 800, 79: 800, 80: 800, 81: 800, 82: 800,
+    83: 800, 84: 800, 85: 700, 86: 800, 87: 800, 88: 800, 89: 800, 90: 800, 91: 300, 92: 400,
+    93: 300, 94: 800, 95: 800, 96: 200, 97: 700, 98: 700, 99: 700, 100: 700, 101: 700, 102: 500,
+    103: 700, 104: 700, 105: 200, 106: 400, 107: 700, 108: 400, 109: 1000, 110: 700, 111: 700, 112: 700,
+    113: 700, 114: 700, 115: 700, 116: 600, 117: 700, 118: 600, 119: 1000, 120: 700, 121: 600, 122: 600,
+    123: 500, 124: 400, 125: 500, 126: 800, 181: 700,
+}
+INDENTS = {
+    33: 100, 34: 200, 35: 100, 36: 100, 37: 100, 38: 0, 39: 300, 40: 100, 41: 100, 42: 200,
+    43: 100, 44: 100, 45: 100, 46: 100, 47: 100, 48: 100, 49: 100, 50: 100, 51: 100, 52: 100,
+    53: 100, 54: 100, 55: 100, 56: 100, 57: 100, 58: 100, 59: 100, 60: 100, 61: 100, 62: 100,
+    63: 100, 64: 100, 65: 100, 66: 100, 67: 100, 68: 100, 69: 100, 70: 100, 71: 100, 72: 100,
+    73: 100, 74: 100, 75: 100, 76: 100, 77: 100, 78: 100, 79: 100, 80: 100, 81: 100, 82: 100,
+    83: 100, 84: 100, 85: 100, 86: 100, 87: 100, 88: 100, 89: 100, 90: 100, 91: 100, 92: 100,
+    93: 100, 94: 0, 95: 100, 96: 300, 97: 100, 98: 100, 99: 100, 100: 100, 101: 100, 102: 100,
+    103: 100, 104: 100, 105: 100, 106: 100, 107: 100, 108: 100, 109: 100, 110: 100, 111: 100, 112: 100,
+    113: 100, 114: 100, 115: 100, 116: 100, 117: 100, 118: 100, 119: 100, 120: 100, 121: 100, 122: 100,
+    123: 100, 124: 100, 125: 100, 126: 100, 181: 100,
+}
@@ -0,0 +1,88 @@
+import gdsfactory as gf
+from pathlib import Path
+import kfactory.conf as kf_conf
+
+# Route gdsfactory build artifacts to Setup/build.
+for _parent in Path(__file__).resolve().parents:
+    _setup_dir = _parent / "Setup"
+    if _setup_dir.exists():
+        kf_conf.config.__dict__["project_dir"] = _setup_dir
+        break
+import hashlib
+
+# gdsfactory 9.x requires an active PDK before geometry/layer creation.
+try:
+    gf.get_active_pdk()
+except Exception:
+    try:
+        gf.gpdk.PDK.activate()
+    except Exception:
+        from gdsfactory.generic_tech import get_generic_pdk
+        get_generic_pdk().activate()
+
+# Frame key -> frame component. Dies of the same size share one frame cell.
+_frame_cache = {}
+_quad_cache = {}
+
+
+def die_size_for(width, height, grid_size):
+    """Round a content extent up to whole grid cells plus one spare cell, as the die boxes do."""
+    die_width = ((int((width // grid_size) + 1) if width % grid_size != 0 else int(width // grid_size)) + 1) * grid_size
+    die_height = ((int((height // grid_size) + 1) if height % grid_size != 0 else int(height // grid_size)) + 1) * grid_size
+    return die_width, die_height
+
+
+def _marker_quad(marker_size, marker_offset, marker_layer):
+    """Four e-beam markers around a grid node at (0, 0)."""
+    key = (round(marker_size, 6), round(marker_offset, 6), marker_layer)
+    if key in _quad_cache:
+        return _quad_cache[key]
+    marker = gf.components.rectangle(size=(marker_size, marker_size), layer=marker_layer)
+    quad = gf.Component(name=f"E_beam_marker_quad_{marker_layer[0]}_{marker_layer[1]}_{int(marker_size*1000)}_{int(marker_offset*1000)}")
+    quad.add_ref(marker).move((-marker_offset - marker_size, marker_offset))
+    quad.add_ref(marker).move((marker_offset, marker_offset))
+    quad.add_ref(marker).move((-marker_offset - marker_size, -marker_offset - marker_size))
+    quad.add_ref(marker).move((marker_offset, -marker_offset - marker_size))
+    _quad_cache[key] = quad
+    return quad
+
+
+def die_frame(die_width, die_height, grid_size, grid_line_width, grid_layer, marker_layer, marker_size, marker_offset):
+    """Return a cached die frame (grid lines plus e-beam markers) with its lower-left corner at (0, 0).
+
+    Grid lines and marker quads are placed as arrayed references, so the frame
+    holds three array instances instead of one reference per line and marker.
+    """
+    grid_layer = tuple(grid_layer)
+    marker_layer = tuple(marker_layer)
+    key = (
+        round(die_width, 6), round(die_height, 6), round(grid_size, 6), round(grid_line_width, 6),
+        grid_layer, marker_layer, round(marker_size, 6), round(marker_offset, 6),
+    )
+    if key in _frame_cache:
+        return _frame_cache[key]
+
+    n_x = int(round(die_width / grid_size))
+    n_y = int(round(die_height / grid_size))
+    suffix = hashlib.md5(repr(key).encode()).hexdigest()[:8]
+
+    die_grid = gf.Component(name=f"Die_Grid_{suffix}")
+    vertical = gf.components.rectangle(size=(grid_line_width, die_height), layer=grid_layer)
+    horizontal = gf.components.rectangle(size=(die_width, grid_line_width), layer=grid_layer)
+    die_grid.add_ref(vertical, columns=n_x + 1, column_pitch=grid_size).move((-grid_line_width / 2, 0))
+    die_grid.add_ref(horizontal, rows=n_y + 1, row_pitch=grid_size).move((0, -grid_line_width / 2))
+
+    e_beam_markers = gf.Component(name=f"E_beam_markers_{suffix}")
+    e_beam_markers.add_ref(
+        _marker_quad(marker_size, marker_offset, marker_layer),
+        columns=n_x + 1,
+        rows=n_y + 1,
+        column_pitch=grid_size,
+        row_pitch=grid_size,
+    )
+
+    frame = gf.Component(name=f"Die_Frame_{suffix}")
+    frame.add_ref(die_grid)
+    frame.add_ref(e_beam_markers)
+    _frame_cache[key] = frame
+    return frame
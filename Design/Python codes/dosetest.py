@@ -1,10 +1,19 @@
 import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 import math
 
 import gdsfactory as gf
+import klayout.db as kdb
 import kfactory.conf as kf_conf
 
+from euler_table import euler_bend_metrics
+from output_format import output_path, show_component, write_component
+
 
 def _find_setup_dir(start: Path) -> Path | None:
     for parent in start.resolve().parents:
@@ -25,8 +34,29 @@ def _configure_project_dir() -> Path:
     return fallback
 
 
+def _activate_pdk() -> None:
+    try:
+        gf.get_active_pdk()
+    except Exception:
+        try:
+            gf.gpdk.PDK.activate()
+        except Exception:
+            from gdsfactory.generic_tech import get_generic_pdk
+
+            get_generic_pdk().activate()
+
+
+# (layer, gc_model) -> bend assembly; every dose array reuses the same cells.
+_bend_cache: dict = {}
+_remap_cache: dict = {}
+
+# Placeholder layer the shared device body is drawn on before it is remapped per dose.
+_BODY_LAYER = (999, 0)
+
+
+@lru_cache(maxsize=None)
 def _load_bend_params() -> dict:
-    json_path = Path(__file__).resolve().parents[2] / "Json" / "bend.json"
+    json_path = Path(__file__).resolve().parents[1] / "Json" / "bend.json"
     if json_path.exists():
         with json_path.open("r", encoding="utf-8") as f:
             return json.load(f)
@@ -48,12 +78,15 @@ def create_L200_bend(layer: tuple[int, int], gc_model: str | None = None) -> gf.
         layer: The GDS layer tuple (datatype, layer_num).
         gc_model: Grating coupler model name (None for default).
     """
+    key = (tuple(layer), gc_model)
+    if key in _bend_cache:
+        return _bend_cache[key]
+
     params = _load_bend_params()
     wg_width = params.get("wg_width", 0.5)
     bend_radius = params.get("bend_radius", 7.0)
 
-    bend_path = gf.path.euler(radius=bend_radius, angle=180)
-    bend_length = bend_path.length()
+    bend_length = euler_bend_metrics(bend_radius, 180)[0]
     target_length = 400.0
     if target_length < bend_length:
         straight_length = 0.0
@@ -64,7 +97,7 @@ def create_L200_bend(layer: tuple[int, int], gc_model: str | None = None) -> gf.
 
     top = gf.Component()
     s = gf.components.straight(length=straight_length, cross_section=xs)
-    bend = bend_path.extrude(xs)
+    bend = gf.path.euler(radius=bend_radius, angle=180).extrude(xs)
 
     gc = None
     try:
@@ -98,10 +131,47 @@ def create_L200_bend(layer: tuple[int, int], gc_model: str | None = None) -> gf.
         top.add_port("opt_in", port=s1.ports["o1"])
         top.add_port("opt_out", port=s2.ports["o2"])
 
+    _bend_cache[key] = top
     return top
 
 
-def make_array(values: list[float], out_path: Path, y_spacing: float = 35.0, start_layer: int = 50, gc_model: str | None = None) -> None:
+def remapped_L200_bend(layer: tuple[int, int], gc_model: str | None = None) -> gf.Component:
+    """Return the L200 bend on ``layer`` as a flat copy of one shared device body.
+
+    The body is built once on _BODY_LAYER; each dose layer gets a cached copy
+    with that layer's shapes moved to ``layer`` and any other layers (e.g.
+    coupler trenches) kept as they are.
+    """
+    key = (tuple(layer), gc_model)
+    if key in _remap_cache:
+        return _remap_cache[key]
+
+    body = create_L200_bend(layer=_BODY_LAYER, gc_model=gc_model)
+    layout = body.kcl.layout
+    c = gf.Component()
+    for layer_index in layout.layer_indexes():
+        region = kdb.Region(body.begin_shapes_rec(layer_index))
+        if region.is_empty():
+            continue
+        info = layout.get_info(layer_index)
+        source = (info.layer, info.datatype)
+        c.add_polygon(region, layer=tuple(layer) if source == _BODY_LAYER else source)
+    for port in body.ports:
+        c.add_port(name=port.name, center=port.center, width=port.width, orientation=port.orientation, layer=tuple(layer))
+
+    _remap_cache[key] = c
+    return c
+
+
+def make_array(
+    values: list[float],
+    out_path: Path,
+    y_spacing: float = 35.0,
+    start_layer: int = 50,
+    gc_model: str | None = None,
+    bend_factory=create_L200_bend,
+    show: bool = True,
+) -> gf.Component:
     """Create an array of 10 bend elements (vertical), write to out_path.
     
     Origin is set to the top-left of the 500 µm enclosing box.
@@ -113,45 +183,39 @@ def make_array(values: list[float], out_path: Path, y_spacing: float = 35.0, sta
         y_spacing: Vertical spacing between bends (default 35.0 µm).
         start_layer: Starting layer number (default 50).
         gc_model: Grating coupler model name (None for default).
+        bend_factory: Builds the bend for a (layer, gc_model); remapped_L200_bend shares one body.
+        show: Open the written array in the viewer.
     """
     # Use the output filename (without extension) as the unique component name
     unique_name = out_path.stem
-    
-    # First pass: build array to determine bbox and box position
-    temp = gf.Component(f"{unique_name}_temp")
-    refs_data = []  # Store (bend_ref, txt_ref, i, val) for later repositioning
-    
-    for i, val in enumerate(values):
-        layer_num = start_layer + i
-        bend_comp = create_L200_bend(layer=(layer_num, 0), gc_model=gc_model)
-        ref = temp.add_ref(bend_comp)
-        ref.move((0, -i * y_spacing))
-        
-        # Get bend bbox to position text to its left
+
+    # Bends and labels are cached cells, so the array extent follows from their
+    # bboxes without building the array twice. Labels sit 15 µm left of each bend
+    # while sizing the box, as the array was originally measured.
+    bends = [bend_factory(layer=(start_layer + i, 0), gc_model=gc_model) for i in range(len(values))]
+    texts = [gf.components.text(text=f"{val:.2f}", size=5.0, layer=(95, 0)) for val in values]
+    bend_x_mins = []
+    array_bbox = kdb.DBox()
+    for i, (bend_comp, txt) in enumerate(zip(bends, texts)):
         bend_bbox = bend_comp.bbox()
         if bend_bbox is not None:
             bend_x_min = bend_bbox.left
+            array_bbox += bend_bbox.moved(0, -i * y_spacing)
         else:
             bend_x_min = -100.0
-        
-        txt = gf.components.text(text=f"{val:.2f}", size=5.0, layer=(95, 0))
-        txt_ref = temp.add_ref(txt)
-        txt_ref.move((bend_x_min - 15.0, -i * y_spacing))  # Position to left of bend
-        
-        refs_data.append((ref, txt_ref, i, val))
-    
-    # Get current bbox to calculate box dimensions
-    temp_bbox = temp.bbox()
-    if temp_bbox is None:
+        bend_x_mins.append(bend_x_min)
+        array_bbox += txt.bbox().moved(bend_x_min - 15.0, -i * y_spacing)
+
+    if array_bbox.empty():
         temp_bbox_left = -250
         temp_bbox_bottom = -250
         temp_bbox_right = 250
         temp_bbox_top = 250
     else:
-        temp_bbox_left = temp_bbox.left
-        temp_bbox_bottom = temp_bbox.bottom
-        temp_bbox_right = temp_bbox.right
-        temp_bbox_top = temp_bbox.top
+        temp_bbox_left = array_bbox.left
+        temp_bbox_bottom = array_bbox.bottom
+        temp_bbox_right = array_bbox.right
+        temp_bbox_top = array_bbox.top
     
     # Calculate 500 µm box with padding
     box_x_min = temp_bbox_left - 20
@@ -178,20 +242,10 @@ def make_array(values: list[float], out_path: Path, y_spacing: float = 35.0, sta
     # Now create final component with offset
     top = gf.Component(unique_name)
     
-    for ref, txt_ref, i, val in refs_data:
-        # Get the position and apply offset
-        bend_comp = create_L200_bend(layer=(start_layer + i, 0), gc_model=gc_model)
+    for i, (bend_comp, txt, bend_x_min) in enumerate(zip(bends, texts, bend_x_mins)):
         bend_ref = top.add_ref(bend_comp)
         bend_ref.move((offset_x, offset_y - i * y_spacing))
         
-        # Get bend bbox for text positioning
-        bend_bbox = bend_comp.bbox()
-        if bend_bbox is not None:
-            bend_x_min = bend_bbox.left
-        else:
-            bend_x_min = -100.0
-        
-        txt = gf.components.text(text=f"{val:.2f}", size=5.0, layer=(95, 0))
         txt_ref = top.add_ref(txt)
         txt_ref.move((offset_x + bend_x_min - 20.0, (offset_y - i * y_spacing)+ 5.0))  # Position to left of bend, slightly above center of text
     
@@ -203,10 +257,11 @@ def make_array(values: list[float], out_path: Path, y_spacing: float = 35.0, sta
     box_ref = top.add_ref(box)
     box_ref.move((offset_x + box_x_min, offset_y + box_y_min))
     
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    top.write_gds(out_path)
+    out_path = write_component(top, out_path)
     print(f"Wrote: {out_path}")
-    top.show()
+    if show:
+        show_component(top)
+    return top
 
 
 def _frange(start: float) -> list[float]:
@@ -214,6 +269,64 @@ def _frange(start: float) -> list[float]:
     return [round(start + 0.1 * i, 3) for i in range(10)]
 
 
+def load_dose_matrix_spec(json_path: Path | None = None) -> dict:
+    """Load the dose-matrix spec (Json/dosetest.json by default)."""
+    json_path = json_path or Path(__file__).resolve().parents[1] / "Json" / "dosetest.json"
+    if not Path(json_path).exists():
+        raise FileNotFoundError(f"Dose matrix spec not found: {json_path}")
+    with Path(json_path).open("r", encoding="utf-8") as f:
+        spec = json.load(f)
+    if not spec.get("arrays"):
+        raise ValueError("Dose matrix spec must contain a non-empty 'arrays' list.")
+    return spec
+
+
+def _dose_values(entry: dict) -> list[float]:
+    if "values" in entry:
+        return [float(v) for v in entry["values"]]
+    return [round(entry["start"] + entry.get("step", 0.1) * i, 3) for i in range(entry.get("count", 10))]
+
+
+def _write_dose_array(job: tuple) -> str:
+    """Worker: build and write one dose array from remapped copies of the shared body."""
+    values, out_path, y_spacing, start_layer, gc_model = job
+    _configure_project_dir()
+    _activate_pdk()
+    make_array(values, out_path, y_spacing=y_spacing, start_layer=start_layer, gc_model=gc_model,
+               bend_factory=remapped_L200_bend, show=False)
+    return str(output_path(out_path))
+
+
+def make_dose_matrix(spec: dict) -> list[Path]:
+    """Build every array in a dose-matrix spec, in worker processes when more than one CPU is available.
+
+    Each array entry gives a name, a start_layer and either explicit "values"
+    or start/step/count. Returns the written layout paths (.gds or .oas, see output_format).
+    """
+    project_dir = _configure_project_dir()
+    out_dir = project_dir / "build" / "gds"
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    gc_model = spec.get("gc_model")
+    y_spacing = float(spec.get("y_spacing", 35.0))
+    jobs = []
+    for index, entry in enumerate(spec["arrays"]):
+        name = entry.get("name", f"dosetest_array{index + 1}")
+        jobs.append((_dose_values(entry), out_dir / f"{name}.gds", y_spacing, int(entry["start_layer"]), gc_model))
+
+    workers = min(len(jobs), spec.get("max_workers") or os.cpu_count() or 1)
+    if workers == 1:
+        written = [_write_dose_array(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            written = list(pool.map(_write_dose_array, jobs))
+
+    if spec.get("show", False):
+        for path in written:
+            gf.show(path)
+    return [Path(p) for p in written]
+
+
 def main(gc_model: str | None = None) -> None:
     """Generate dose test arrays.
     
@@ -230,19 +343,18 @@ def main(gc_model: str | None = None) -> None:
     ]
 
     # make sure PDK active
-    try:
-        gf.get_active_pdk()
-    except Exception:
-        try:
-            gf.gpdk.PDK.activate()
-        except Exception:
-            from gdsfactory.generic_tech import get_generic_pdk
-
-            get_generic_pdk().activate()
+    _activate_pdk()
 
     for vals, path, start_layer in arrays:
         make_array(vals, path, y_spacing=35.0, start_layer=start_layer, gc_model=gc_model)
 
 
 if __name__ == "__main__":
-    main()
+    from profiling import run_profiled
+
+    if "--matrix" in sys.argv[1:]:
+        # Optional spec path after the flag, otherwise Json/dosetest.json
+        args = sys.argv[sys.argv.index("--matrix") + 1:]
+        run_profiled(make_dose_matrix, load_dose_matrix_spec(Path(args[0]) if args else None), name="dosetest_matrix")
+    else:
+        run_profiled(main, name="dosetest")
@@ -0,0 +1,345 @@
+"""Minimum width/space checks on the e-beam layers of a built layout.
+
+Rules come from Json/drc_rules.json (min_width / min_space per layer). Each
+layer is checked with KLayout's TilingProcessor on all CPUs: every tile
+merges the shapes in the tile plus a border of twice the rule, so checks
+never see artificial edges from the clip, and keeps only the violations
+whose centre lies in the tile, so nothing is reported twice. Space is
+measured on the merged edges, which avoids Region.space_check's polygon
+pairing; the nested spiral waveguides made that quadratic.
+
+Violations are counted per die and device (instance directly inside the
+die). Dies are the placed instances that carry checked layers, below any
+shape-less wrapper such as placement.py's "Dies"; the chip grid is skipped. Both are looked up by bounding box with NumPy, and
+only centres in overlapping boxes are traced through the hierarchy, so a
+misconfigured rule with millions of hits still reports in reasonable time.
+
+    python drc_lite.py chip.oas [--rules rules.json] [--tile-size 500] [--threads N]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from array import array
+from pathlib import Path
+
+import klayout.db as kdb
+import numpy as np
+
+from region_ops import DEFAULT_TILE_SIZE
+
+RULES_PATH = Path(__file__).resolve().parents[1] / "Json" / "drc_rules.json"
+
+CHECKS = ("min_width", "min_space")
+
+# Violation locations printed per run, and kept (worst first) in the JSON report;
+# the per-rule and per-die counts always cover every violation.
+DEFAULT_MAX_LOCATIONS = 20
+REPORT_LOCATIONS = 1000
+
+# Dies, and devices per die, listed in the printed summary.
+PRINTED_DIES = 10
+PRINTED_DEVICES = 3
+
+
+def load_rules(path=None):
+    """Rules config from ``path`` (default Json/drc_rules.json)."""
+    path = Path(path) if path else RULES_PATH
+    if not path.exists():
+        raise FileNotFoundError(f"DRC rules not found: {path}")
+    with open(path, "r") as f:
+        config = json.load(f)
+    for rule in config.get("rules", []):
+        if "layer" not in rule or not any(check in rule for check in CHECKS):
+            raise ValueError(f"DRC rule {rule} needs a layer and min_width and/or min_space")
+    return config
+
+
+class _TileViolations(kdb.TileOutputReceiver):
+    """Collects the edge pairs whose bounding-box centre lies inside the tile that produced them."""
+
+    def __init__(self):
+        self.edge_pairs = kdb.EdgePairs()
+        self.centers = array("q")
+        self.distances = array("q")
+
+    def put(self, ix, iy, tile, obj, dbu, clip):
+        for edge_pair in obj.each():
+            center = edge_pair.bbox().center()
+            if tile.left <= center.x < tile.right and tile.bottom <= center.y < tile.top:
+                self.edge_pairs.insert(edge_pair)
+                self.centers.extend((center.x, center.y))
+                self.distances.append(edge_pair.distance())
+
+
+def check_layer(top, layer_index, min_width=None, min_space=None, tile_size=DEFAULT_TILE_SIZE, threads=None):
+    """Width and space violations of one layer under ``top`` (a kdb.Cell).
+
+    Returns {"min_width": (edge_pairs, centers, distances), "min_space": ...}
+    for the requested checks: a kdb.EdgePairs plus (n, 2) centre and (n,)
+    distance arrays, all in dbu.
+    """
+    dbu = top.layout().dbu
+    limits = {check: value for check, value in (("min_width", min_width), ("min_space", min_space)) if value}
+    if not limits:
+        return {}
+    receivers = {check: _TileViolations() for check in limits}
+
+    tp = kdb.TilingProcessor()
+    tp.dbu = dbu
+    tp.tile_size(tile_size, tile_size)
+    border = 2 * max(limits.values())
+    tp.tile_border(border, border)
+    tp.threads = threads or os.cpu_count() or 1
+    tp.input("a", top.begin_shapes_rec(layer_index))
+    tp.var("border", int(round(border / dbu)))
+    script = ["var r = a & _tile.sized(border);"]
+    if "min_width" in limits:
+        tp.output("w", receivers["min_width"])
+        tp.var("width", int(round(limits["min_width"] / dbu)))
+        script.append("_output(w, r.width_check(width), false);")
+    if "min_space" in limits:
+        tp.output("s", receivers["min_space"])
+        tp.var("space", int(round(limits["min_space"] / dbu)))
+        script.append("_output(s, r.edges.space_check(space), false);")
+    tp.queue(" ".join(script))
+    tp.execute("DRC-lite")
+    return {
+        check: (r.edge_pairs, np.frombuffer(r.centers, dtype=np.int64).reshape(-1, 2), np.frombuffer(r.distances, dtype=np.int64))
+        for check, r in receivers.items()
+    }
+
+
+def _instance_name(inst):
+    """Instance name as gdsfactory stores it (property 0), else cell name and position."""
+    name = inst.property(0)
+    if name is not None:
+        return str(name)
+    return f"{inst.cell.name}_{inst.trans.disp.x}_{inst.trans.disp.y}"
+
+
+def _placements(top, layer_indexes):
+    """(depth, [(die name, die instance, die box, [(device name, device box), ...]), ...]), boxes in dbu.
+
+    Instances with nothing on the checked layers (the chip grid, markers) are
+    skipped, and a lone container without shapes of its own (placement.py's
+    "Dies") is unwrapped, so the dies are the instances on the level holding
+    the DieN cells; depth is the number of unwrapped levels. Devices are the
+    instances directly inside each die.
+    """
+    layout = top.layout()
+    carries = {}
+
+    def has_checked_shapes(cell):
+        if cell.cell_index() not in carries:
+            carries[cell.cell_index()] = any(not cell.begin_shapes_rec(li).at_end() for li in layer_indexes)
+        return carries[cell.cell_index()]
+
+    cell, trans, depth = top, kdb.ICplxTrans(), 0
+    while True:
+        insts = [inst for inst in cell.each_inst() if has_checked_shapes(inst.cell)]
+        if len(insts) != 1 or any(not insts[0].cell.shapes(li).is_empty() for li in layout.layer_indexes()):
+            break
+        cell, trans, depth = insts[0].cell, trans * insts[0].cplx_trans, depth + 1
+
+    dies = []
+    for inst in insts:
+        die_trans = trans * inst.cplx_trans
+        devices = [(child.cell.name, child.bbox().transformed(die_trans)) for child in inst.cell.each_inst() if has_checked_shapes(child.cell)]
+        dies.append((_instance_name(inst), inst, inst.bbox().transformed(trans), devices))
+    return depth, dies
+
+
+def _inside(points, box):
+    return (points[:, 0] >= box.left) & (points[:, 0] <= box.right) & (points[:, 1] >= box.bottom) & (points[:, 1] <= box.top)
+
+
+def _instance_path(top, layer_index, edge_pair):
+    """Instances on the path from ``top`` down to the shape the edge pair's first edge lies on."""
+    it = kdb.RecursiveShapeIterator(top.layout(), top, layer_index, edge_pair.first.bbox().enlarged(1, 1), True)
+    return [] if it.at_end() else [element.inst() for element in it.path()]
+
+
+def _lookup(centers, boxes):
+    """Index into ``boxes`` of the box containing each centre (-1 for none), plus a mask of centres in several boxes."""
+    found = np.full(len(centers), -1, dtype=np.int64)
+    hits = np.zeros(len(centers), dtype=np.int64)
+    for k, box in enumerate(boxes):
+        inside = _inside(centers, box)
+        found[inside] = k
+        hits += inside
+    return found, hits > 1
+
+
+def _attribute(top, layer_indexes, centers, locate):
+    """Die and device of every violation centre.
+
+    Returns (names, die ids, device ids). Dies are keyed by instance name and
+    devices by cell name. Both are looked up by instance bounding box; where
+    boxes overlap (spirals nested inside spirals) the centre is resolved
+    through the hierarchy with locate(index), which returns its instance
+    path. Centres outside every die count against the top cell.
+    """
+    index = {top.name: 0}
+    depth, placements = _placements(top, layer_indexes)
+    die_at, die_ambiguous = _lookup(centers, [die_box for _, _, die_box, _ in placements])
+    paths = {int(i): locate(i) for i in np.flatnonzero(die_ambiguous)}
+    for i, path in paths.items():
+        die_at[i] = -1
+        if len(path) > depth:
+            for k, (_, inst, _, _) in enumerate(placements):
+                if path[depth] == inst:
+                    die_at[i] = k
+                    break
+
+    die = np.zeros(len(centers), dtype=np.int64)
+    device = np.zeros(len(centers), dtype=np.int64)
+    for k, (die_name, _, _, devices) in enumerate(placements):
+        in_die = np.flatnonzero(die_at == k)
+        if not in_die.size:
+            continue
+        die[in_die] = device[in_die] = index.setdefault(die_name, len(index))
+        device_at, device_ambiguous = _lookup(centers[in_die], [box for _, box in devices])
+        ids = np.array([index.setdefault(name, len(index)) for name, _ in devices], dtype=np.int64)
+        placed = device_at >= 0
+        device[in_die[placed]] = ids[device_at[placed]]
+        for i in in_die[device_ambiguous]:
+            path = paths.get(int(i)) or locate(i)
+            if len(path) > depth + 1:
+                device[i] = index.setdefault(path[depth + 1].cell.name, len(index))
+    return list(index), die, device
+
+
+def run_drc(source, rules=None, tile_size=None, threads=None):
+    """Check a gf.Component, kdb.Cell or layout file against the rules; returns a JSON-ready report.
+
+    Counts per rule, die and device cover every violation; "locations" keeps
+    the REPORT_LOCATIONS worst ones relative to their rule.
+    """
+    rules = rules or load_rules()
+    if hasattr(source, "kdb_cell"):
+        source = source.kdb_cell
+    if isinstance(source, kdb.Cell):
+        layout, top = source.layout(), source
+    else:
+        layout = kdb.Layout()
+        layout.read(str(source))
+        tops = layout.top_cells()
+        if len(tops) != 1:
+            raise ValueError(f"{source} has {len(tops)} top cells; pass the cell to check.")
+        top = tops[0]
+    tile_size = tile_size or rules.get("tile_size", DEFAULT_TILE_SIZE)
+    dbu = layout.dbu
+
+    start = time.perf_counter()
+    by_rule = {}
+    results = []
+    for rule in rules["rules"]:
+        layer_index = layout.find_layer(*rule["layer"])
+        if layer_index is None:
+            continue
+        for check, result in check_layer(top, layer_index, rule.get("min_width"), rule.get("min_space"), tile_size, threads).items():
+            label = f"{rule.get('name', '')} {rule['layer'][0]}/{rule['layer'][1]} {check} {rule[check]:g}".strip()
+            by_rule[label] = len(result[2])
+            results.append((label, rule[check], layer_index, *result))
+
+    centers = np.concatenate([r[4] for r in results]) if results else np.zeros((0, 2), dtype=np.int64)
+    offsets = np.cumsum([0] + [len(r[5]) for r in results])
+
+    def locate(i):
+        k = int(np.searchsorted(offsets, i, side="right")) - 1
+        _, _, layer_index, edge_pairs, _, _ = results[k]
+        return _instance_path(top, layer_index, edge_pairs[int(i - offsets[k])])
+
+    names, dies, devices = _attribute(top, [r[2] for r in results], centers, locate)
+    by_die = {}
+    pairs, counts = np.unique(np.stack([dies, devices], axis=1), axis=0, return_counts=True)
+    for (die, device), count in zip(pairs, counts):
+        entry = by_die.setdefault(names[die], {"violations": 0, "devices": {}})
+        entry["violations"] += int(count)
+        entry["devices"][names[device]] = int(count)
+
+    locations = []
+    for offset, (label, limit, _, _, rule_centers, distances) in zip(offsets, results):
+        for i in np.argsort(distances)[:REPORT_LOCATIONS]:
+            locations.append({
+                "rule": label,
+                "x": round(int(rule_centers[i, 0]) * dbu, 3),
+                "y": round(int(rule_centers[i, 1]) * dbu, 3),
+                "distance": round(int(distances[i]) * dbu, 4),
+                "ratio": round(int(distances[i]) * dbu / limit, 3),
+                "die": names[dies[offset + i]],
+                "device": names[devices[offset + i]],
+            })
+    locations.sort(key=lambda v: v["ratio"])
+    return {
+        "top": top.name,
+        "violations": len(dies),
+        "check_s": round(time.perf_counter() - start, 3),
+        "by_rule": by_rule,
+        "by_die": dict(sorted(by_die.items(), key=lambda item: -item[1]["violations"])),
+        "locations": locations[:REPORT_LOCATIONS],
+    }
+
+
+def print_drc_report(report, max_locations=DEFAULT_MAX_LOCATIONS):
+    """Print violation counts per rule and per die/device, and the worst locations."""
+    status = "clean" if not report["violations"] else f"{report['violations']} violations"
+    print(f"DRC-lite {report['top']}: {status} ({report['check_s']:.2f} s)")
+    for label, count in report["by_rule"].items():
+        print(f"  {label}: {count}")
+    for die, entry in list(report["by_die"].items())[:PRINTED_DIES]:
+        devices = sorted(entry["devices"].items(), key=lambda item: -item[1])
+        print(f"  {die}: {entry['violations']} in {len(devices)} device(s)")
+        for device, count in devices[:PRINTED_DEVICES]:
+            print(f"    {device}: {count}")
+    if len(report["by_die"]) > PRINTED_DIES:
+        print(f"  ... {len(report['by_die']) - PRINTED_DIES} more dies")
+    for violation in report["locations"][:max_locations]:
+        print(
+            f"    {violation['rule']} at ({violation['x']:.3f}, {violation['y']:.3f}) "
+            f"{violation['distance']:.4f} um in {violation['die']} / {violation['device']}"
+        )
+    if report["violations"] > max_locations:
+        print(f"    ... {report['violations'] - max_locations} more")
+
+
+def _drc_dir():
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "Setup").exists():
+            return parent / "Setup" / "build" / "drc"
+    return Path(__file__).resolve().parents[1] / "build" / "drc"
+
+
+def write_drc_report(source, path=None, rules=None, tile_size=None, threads=None, max_locations=DEFAULT_MAX_LOCATIONS):
+    """Run run_drc(), write the report as JSON and print the summary.
+
+    Defaults to build/drc/<top cell name>.json. Returns the report.
+    """
+    report = run_drc(source, rules, tile_size, threads)
+    path = Path(path) if path else _drc_dir() / f"{report['top'].replace(' ', '_')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print_drc_report(report, max_locations)
+    print(f"DRC report written to {path}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Minimum width/space check of a layout file.")
+    parser.add_argument("layout", help="GDS or OASIS file")
+    parser.add_argument("--rules", help="rules file (default: Json/drc_rules.json)")
+    parser.add_argument("--tile-size", type=float, help="tile edge in um (default: from the rules file)")
+    parser.add_argument("--threads", type=int, help="threads (default: all CPUs)")
+    parser.add_argument("--json", help="report file (default: build/drc/<top>.json)")
+    parser.add_argument("--max-locations", type=int, default=DEFAULT_MAX_LOCATIONS, help="violation locations printed")
+    args = parser.parse_args(argv)
+
+    report = write_drc_report(args.layout, args.json, load_rules(args.rules), args.tile_size, args.threads, args.max_locations)
+    return 1 if report["violations"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""Memoized Euler-bend metrics for the ROC, bend and dosetest constraint solvers.
+
+The solvers only need a bend's arc length and endpoint displacement, not the
+path itself. Each (radius, angle, p, npoints) bend is discretized once with
+gf.path.euler and its metrics are cached, so the numbers match what the final
+extruded path produces. S-bend trains are composed from one 90-degree bend's
+displacement instead of concatenating paths.
+"""
+from functools import lru_cache
+
+import gdsfactory as gf
+import numpy as np
+
+# gdsfactory 9.x requires an active PDK before geometry/layer creation.
+try:
+    gf.get_active_pdk()
+except Exception:
+    try:
+        gf.gpdk.PDK.activate()
+    except Exception:
+        from gdsfactory.generic_tech import get_generic_pdk
+        get_generic_pdk().activate()
+
+
+@lru_cache(maxsize=None)
+def _euler_bend_raw(radius, angle, p, npoints):
+    """Unrounded (length, dx, dy) of one discretized Euler bend."""
+    points = gf.path.euler(radius=radius, angle=angle, p=p, npoints=npoints).points
+    steps = np.diff(points, axis=0)
+    return (
+        float(np.sum(np.hypot(steps[:, 0], steps[:, 1]))),
+        float(points[-1][0] - points[0][0]),
+        float(points[-1][1] - points[0][1]),
+    )
+
+
+def euler_bend_metrics(radius, angle, p=0.5, npoints=None):
+    """Return (length, dx, dy) of gf.path.euler(radius, angle, p, npoints=npoints).
+
+    length is rounded to 1 nm like Path.length(); dx/dy are the endpoint
+    displacement for a bend starting at the origin heading along +x.
+    """
+    length, dx, dy = _euler_bend_raw(radius, angle, p, npoints)
+    return round(length, 3), dx, dy
+
+
+def s_bend_train_metrics(radius, n_units=12, p=0.5, npoints=None):
+    """Return (J, K): length and x advance of n_units (-90, +90, +90, -90) S-bend units.
+
+    Each unit returns to the starting heading and y, so J = 4 * n_units * L90
+    and K = 2 * n_units * (dx90 + dy90).
+    """
+    length, dx, dy = _euler_bend_raw(radius, 90, p, npoints)
+    return round(4 * n_units * length, 3), 2 * n_units * (dx + dy)
+
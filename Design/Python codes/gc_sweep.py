@@ -0,0 +1,238 @@
+"""Phase-matching sweep over grating coupler design parameters.
+
+First-order coupling into a fibre at angle theta needs
+
+    neff - ncladding * sin(theta) = wavelength / period
+
+sweep_design_space evaluates this over a (wavelength, fiber_angle, period or
+neff) grid in one NumPy pass, sweeping whichever of period and neff the
+coupler type is drawn from, and shortlists the best-matched designs as
+grating_couplers.json-style model dicts. build_candidates then builds only the
+shortlist, in worker processes, into one GDS library.
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import gdsfactory as gf
+from pathlib import Path
+import kfactory.conf as kf_conf
+
+# Route gdsfactory build artifacts to Setup/build.
+for _parent in Path(__file__).resolve().parents:
+    _setup_dir = _parent / "Setup"
+    if _setup_dir.exists():
+        kf_conf.config.__dict__["project_dir"] = _setup_dir
+        break
+import klayout.db as kdb
+import numpy as np
+
+from grating_couplers import _load_gc_library, create_grating_coupler_from_params, get_gc_params
+from output_format import write_layout
+
+# gdsfactory 9.x requires an active PDK before geometry/layer creation.
+try:
+    gf.get_active_pdk()
+except Exception:
+    try:
+        gf.gpdk.PDK.activate()
+    except Exception:
+        from gdsfactory.generic_tech import get_generic_pdk
+        get_generic_pdk().activate()
+
+# Cladding index gdsfactory's uniform coupler assumes when a model gives none.
+DEFAULT_NCLADDING = 1.443
+
+
+def coupling_angle(wavelength, period, neff, ncladding=DEFAULT_NCLADDING, order=1):
+    """Fibre angle in degrees that a grating phase-matches; NaN where no real angle exists.
+
+    All arguments broadcast.
+    """
+    sin_theta = (np.asarray(neff, dtype=float) - order * np.asarray(wavelength, dtype=float) / np.asarray(period, dtype=float)) / ncladding
+    sin_theta = np.where(np.abs(sin_theta) <= 1, sin_theta, np.nan)
+    return np.degrees(np.arcsin(sin_theta))
+
+
+def matched_period(wavelength, fiber_angle, neff, ncladding=DEFAULT_NCLADDING, order=1):
+    """Grating period that phase-matches the given fibre angle. All arguments broadcast."""
+    return order * np.asarray(wavelength, dtype=float) / (
+        np.asarray(neff, dtype=float) - ncladding * np.sin(np.radians(fiber_angle))
+    )
+
+
+def sweep_design_space(
+    model=None,
+    wavelengths=None,
+    fiber_angles=None,
+    periods=None,
+    neffs=None,
+    ncladding=None,
+    angle_tolerance=0.5,
+    top_k=10,
+    process_neff=None,
+    neff_spread=0.02,
+):
+    """Evaluate phase matching over the full parameter grid and return the best candidates.
+
+    Only the parameter the coupler builder actually uses is swept as a design
+    axis. Uniform couplers are drawn from the period: neffs is the range of
+    effective indices the process may give, and each (wavelength,
+    fiber_angle, period) design is reported once, at its best-matching neff.
+    Trench couplers are drawn from neff: gdsfactory derives the period from
+    it, so periods must be None and the reported period is matched_period().
+    Each such design is then scored at the effective index the process
+    actually gives, process_neff (default: the model's neff) +/- neff_spread,
+    and periods no wider than the trench line are dropped.
+
+    Axes left as None fall back to the model's own value. A design is a
+    candidate when its phase-matched fibre angle (worst case over the neff
+    spread for trenches) lies within angle_tolerance degrees of the swept
+    fiber_angle. Returns up to top_k model dicts, best match first, each with
+    an added "angle_error".
+    """
+    base = get_gc_params(model)
+    ncladding = float(base.get("ncladding", DEFAULT_NCLADDING)) if ncladding is None else float(ncladding)
+    trenches = base.get("component_type") == "grating_coupler_elliptical_trenches"
+
+    def axis(values, key):
+        if values is None:
+            if key not in base:
+                raise ValueError(f"Model has no '{key}'; pass {key} values to sweep.")
+            values = base[key]
+        return np.atleast_1d(np.asarray(values, dtype=float))
+
+    wavelength_axis, angle_axis = axis(wavelengths, "wavelength"), axis(fiber_angles, "fiber_angle")
+    # Sparse grids: only the error array is materialized at full size.
+    if trenches:
+        if periods is not None:
+            raise ValueError("Trench couplers derive their period from neff; sweep neffs instead of periods.")
+        free_key, other_key = "neff", "period"
+        free_axis = axis(neffs, "neff")
+        W, A, N = np.meshgrid(wavelength_axis, angle_axis, free_axis, indexing="ij", sparse=True)
+        # N is the design index written into the model; it only sets the drawn period
+        other = matched_period(W, A, N, ncladding)
+        other = np.where(other > float(base.get("grating_line_width", 0.0)), other, np.nan)
+        nominal = float(axis(process_neff, "neff")[0])
+        error = np.max(
+            [np.abs(coupling_angle(W, other, n, ncladding) - A) for n in (nominal - neff_spread, nominal, nominal + neff_spread)],
+            axis=0,
+        )
+    else:
+        free_key, other_key = "period", "neff"
+        free_axis = axis(periods, "period")
+        neff_axis = axis(neffs, "neff")
+        W, A, P, N = np.meshgrid(wavelength_axis, angle_axis, free_axis, neff_axis, indexing="ij", sparse=True)
+        full = np.abs(coupling_angle(W, P, N, ncladding) - A)
+        full = np.where(np.isnan(full), np.inf, full)
+        # neff does not change the drawn geometry: keep each design's best neff only
+        best = np.argmin(full, axis=3)
+        error = np.take_along_axis(full, best[..., None], axis=3)[..., 0]
+        other = neff_axis[best]
+    shape = error.shape
+    error = np.where(np.isnan(error), np.inf, error).ravel()
+    other = np.broadcast_to(other, shape).ravel()
+
+    within = np.flatnonzero(error <= angle_tolerance)
+    # Round before ranking so physically equal errors keep grid order instead of float noise order
+    shortlist = within[np.argsort(np.round(error[within], 9), kind="stable")][:top_k]
+    print(f"{within.size} of {error.size} designs within {angle_tolerance} deg; shortlisted {shortlist.size}")
+
+    candidates = []
+    for index in shortlist:
+        i_w, i_a, i_f = np.unravel_index(index, shape)
+        candidate = dict(
+            base,
+            wavelength=round(float(wavelength_axis[i_w]), 6),
+            fiber_angle=round(float(angle_axis[i_a]), 6),
+            ncladding=ncladding,
+        )
+        candidate[free_key] = round(float(free_axis[i_f]), 6)
+        candidate[other_key] = round(float(other[index]), 6)
+        candidate["angle_error"] = float(error[index])
+        candidates.append(candidate)
+    return candidates
+
+
+def print_candidates(candidates):
+    """Print one line per shortlisted parameter set."""
+    print(f"{'#':>3} {'wavelength':>10} {'angle':>7} {'period':>8} {'neff':>7} {'error':>8}")
+    for i, c in enumerate(candidates):
+        print(f"{i:3d} {c['wavelength']:10.4f} {c['fiber_angle']:7.2f} {c['period']:8.4f} {c['neff']:7.3f} {c['angle_error']:8.4f}")
+
+
+def candidate_name(index, candidate, prefix="GC_sweep"):
+    return f"{prefix}_{index:02d}_p{round(candidate['period'] * 1000)}_a{candidate['fiber_angle']:g}_n{candidate['neff']:.3f}"
+
+
+def _build_dir():
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "Setup").exists():
+            return parent / "Setup" / "build" / "gds"
+    return Path(__file__).resolve().parents[1] / "build" / "gds"
+
+
+def _write_candidate_gds(job):
+    """Worker: build one candidate coupler inside a named cell and write it to its own GDS."""
+    params, name, layer, gds_path = job
+    c = gf.Component(name)
+    c << create_grating_coupler_from_params(params, layer=layer)
+    c.write_gds(gds_path)
+    return name
+
+
+def build_candidates(candidates, output=None, max_workers=None, layer=None, prefix="GC_sweep"):
+    """Build the shortlisted couplers in worker processes and write them to one GDS library.
+
+    Each candidate is wrapped in a cell named by candidate_name(). Returns the
+    path of the written library.
+    """
+    if not candidates:
+        raise ValueError("No candidates to build.")
+    output = Path(output) if output else _build_dir() / f"{prefix}.gds"
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = [
+            (candidate, candidate_name(i, candidate, prefix), layer, Path(tmp) / f"{i}.gds")
+            for i, candidate in enumerate(candidates)
+        ]
+        workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+        if workers == 1:
+            names = [_write_candidate_gds(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                names = list(pool.map(_write_candidate_gds, jobs))
+
+        library = kdb.Layout()
+        options = kdb.LoadLayoutOptions()
+        options.cell_conflict_resolution = kdb.LoadLayoutOptions.CellConflictResolution.SkipNewCell
+        for job in jobs:
+            library.read(str(job[3]), options)
+        output = write_layout(library, output)
+
+    print(f"Wrote {len(names)} grating couplers to {output}")
+    return output
+
+
+if __name__ == "__main__":
+    # python gc_sweep.py [model]: sweep around the model's wavelength and build the shortlist
+    model = sys.argv[1] if len(sys.argv) > 1 else _load_gc_library().get("default_model")
+    base = get_gc_params(model)
+    wavelength = float(base["wavelength"])
+    trenches = base.get("component_type") == "grating_coupler_elliptical_trenches"
+    candidates = sweep_design_space(
+        model,
+        wavelengths=np.linspace(wavelength - 0.01, wavelength + 0.01, 11),
+        fiber_angles=np.arange(5.0, 20.5, 0.5),
+        periods=None if trenches else np.arange(0.25, 0.80, 0.001),
+        neffs=np.arange(1.50, 2.20, 0.01),
+        # Trench scores are worst cases over the process neff spread, so they never reach 0.05 deg
+        angle_tolerance=1.5 if trenches else 0.05,
+        top_k=8,
+    )
+    print_candidates(candidates)
+    if candidates:
+        build_candidates(candidates, prefix=f"GC_sweep_{model}")
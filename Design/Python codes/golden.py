@@ -0,0 +1,160 @@
+"""Golden-layout regression: rebuild a target and XOR it against a stored golden layout.
+
+Targets are the benchmark cases (Die, postdepot cell, temporary placement
+chip, the arrays, ...), built from the same fixtures in a fresh interpreter.
+Each layer of the rebuilt layout is XORed against golden/<target>.oas:
+polygons present identically in both are matched off first, and the rest goes
+through a tiled, multi-threaded region XOR (region_ops.xor_regions), so a
+full placement chip compares in a couple of seconds. Differences are reported
+per layer with their area and locations.
+
+The stored goldens were built from the repository's baseline commit, before
+the performance refactors, so a passing check shows those refactors left
+the geometry unchanged. --update replaces them with the current build.
+
+    python golden.py                       compare every target
+    python golden.py die postdepot         compare selected targets
+    python golden.py --update [targets]    store the current build as golden
+    python golden.py --compare a.gds b.oas XOR two existing files
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import klayout.db as kdb
+
+from benchmark import CASES, build_case
+from output_format import save_options
+from region_ops import DEFAULT_TILE_SIZE, xor_regions
+
+GOLDEN_DIR = Path(__file__).resolve().parents[1] / "golden"
+
+# Difference locations listed per layer before the report is cut short.
+DEFAULT_MAX_LOCATIONS = 10
+
+
+def golden_path(target):
+    return GOLDEN_DIR / f"{target}.oas"
+
+
+def _read_layers(path):
+    """Flattened polygon region per (layer, datatype) of every top cell in a layout file."""
+    layout = kdb.Layout()
+    layout.read(str(path))
+    regions = {}
+    for layer_index in layout.layer_indexes():
+        info = layout.get_info(layer_index)
+        region = kdb.Region()
+        for top in layout.top_cells():
+            region.insert(top.begin_shapes_rec(layer_index))
+        if not region.is_empty():
+            regions[(info.layer, info.datatype)] = region
+    return regions, layout.dbu
+
+
+def xor_layouts(reference_path, candidate_path, tile_size=DEFAULT_TILE_SIZE, threads=None):
+    """XOR two layout files layer by layer.
+
+    Returns {(layer, datatype): difference region} for the layers that differ,
+    and the database unit the regions are in.
+    """
+    reference, dbu = _read_layers(reference_path)
+    candidate, candidate_dbu = _read_layers(candidate_path)
+    if abs(candidate_dbu - dbu) > 1e-12:
+        scale = kdb.ICplxTrans(candidate_dbu / dbu)
+        candidate = {layer: region.transformed(scale) for layer, region in candidate.items()}
+
+    differences = {}
+    for layer in sorted(set(reference) | set(candidate)):
+        diff = xor_regions(reference.get(layer, kdb.Region()), candidate.get(layer, kdb.Region()), dbu, tile_size, threads)
+        if not diff.is_empty():
+            differences[layer] = diff
+    return differences, dbu
+
+
+def print_differences(differences, dbu, max_locations=DEFAULT_MAX_LOCATIONS):
+    """Print area and location of the differences on each layer."""
+    for (layer, datatype), diff in differences.items():
+        area = diff.area() * dbu * dbu
+        print(f"  layer {layer}/{datatype}: {diff.count()} difference polygons, {area:.6f} um^2")
+        for polygon in list(diff.each())[:max_locations]:
+            box = polygon.bbox()
+            print(
+                f"    at ({box.center().x * dbu:.3f}, {box.center().y * dbu:.3f}) "
+                f"size {box.width() * dbu:.3f} x {box.height() * dbu:.3f} um"
+            )
+        if diff.count() > max_locations:
+            print(f"    ... {diff.count() - max_locations} more")
+
+
+def update_golden(target, verbose=False):
+    """Build ``target`` and store it as golden/<target>.oas."""
+    with tempfile.TemporaryDirectory() as tmp:
+        gds_path = Path(tmp) / f"{target}.gds"
+        build_case(target, gds_path, verbose)
+        layout = kdb.Layout()
+        layout.read(str(gds_path))
+        GOLDEN_DIR.mkdir(parents=True, exist_ok=True)
+        layout.write(str(golden_path(target)), save_options("oas"))
+    print(f"Stored golden {golden_path(target)}")
+
+
+def check_target(target, tile_size=DEFAULT_TILE_SIZE, threads=None, max_locations=DEFAULT_MAX_LOCATIONS, verbose=False):
+    """Rebuild ``target`` and XOR it against its golden layout; True when identical."""
+    golden = golden_path(target)
+    if not golden.exists():
+        raise FileNotFoundError(f"No golden layout for '{target}': {golden} (create it with --update)")
+    with tempfile.TemporaryDirectory() as tmp:
+        gds_path = Path(tmp) / f"{target}.gds"
+        start = time.perf_counter()
+        build_case(target, gds_path, verbose)
+        build_s = time.perf_counter() - start
+        start = time.perf_counter()
+        differences, dbu = xor_layouts(golden, gds_path, tile_size, threads)
+        xor_s = time.perf_counter() - start
+    status = "OK" if not differences else f"DIFFERS on {len(differences)} layer(s)"
+    print(f"{target}: {status} (build {build_s:.2f} s, XOR {xor_s:.2f} s)")
+    print_differences(differences, dbu, max_locations)
+    return not differences
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild generator targets and XOR them against golden layouts.")
+    parser.add_argument("targets", nargs="*", help=f"targets (default: all of {', '.join(CASES)})")
+    parser.add_argument("--update", action="store_true", help="store the current builds as golden layouts")
+    parser.add_argument("--compare", nargs=2, metavar=("REFERENCE", "CANDIDATE"), help="XOR two layout files")
+    parser.add_argument("--tile-size", type=float, default=DEFAULT_TILE_SIZE, help="XOR tile edge in um")
+    parser.add_argument("--threads", type=int, help="XOR threads (default: all CPUs)")
+    parser.add_argument("--max-locations", type=int, default=DEFAULT_MAX_LOCATIONS, help="difference locations listed per layer")
+    parser.add_argument("--verbose", action="store_true", help="show generator output")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        start = time.perf_counter()
+        differences, dbu = xor_layouts(*args.compare, tile_size=args.tile_size, threads=args.threads)
+        print(f"{'Identical' if not differences else f'Differs on {len(differences)} layer(s)'} ({time.perf_counter() - start:.2f} s)")
+        print_differences(differences, dbu, args.max_locations)
+        return 1 if differences else 0
+
+    targets = args.targets or list(CASES)
+    unknown = [target for target in targets if target not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown golden target(s): {', '.join(unknown)}")
+
+    if args.update:
+        for target in targets:
+            update_golden(target, args.verbose)
+        return 0
+
+    failed = [
+        target for target in targets
+        if not check_target(target, args.tile_size, args.threads, args.max_locations, args.verbose)
+    ]
+    print("Golden check OK" if not failed else f"Geometry changed: {', '.join(failed)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
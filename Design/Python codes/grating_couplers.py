@@ -22,6 +22,9 @@ except Exception:
 
         get_generic_pdk().activate()
 
+# (path, mtime_ns) -> parsed grating_couplers.json, so repeated coupler lookups skip the file read.
+_gc_library_cache = {}
+
 _UNIFORM_FIELDS = (
     "n_periods",
     "period",
@@ -58,12 +61,19 @@ def _json_path() -> str:
 
 
 def _load_gc_library() -> dict:
-    with open(_json_path(), "r") as f:
+    path = _json_path()
+    key = (os.path.abspath(path), os.stat(path).st_mtime_ns)
+    if key in _gc_library_cache:
+        return _gc_library_cache[key]
+
+    with open(path, "r") as f:
         data = json.load(f)
 
     if "models" not in data or not isinstance(data["models"], dict):
         raise ValueError("grating_couplers.json must contain a 'models' dictionary.")
 
+    _gc_library_cache.clear()
+    _gc_library_cache[key] = data
     return data
 
 
@@ -111,8 +121,15 @@ def create_grating_coupler(
     layer: tuple[int, int] | None = None,
     port_width: float | None = None,
 ) -> gf.Component:
-    params = get_gc_params(name)
+    return create_grating_coupler_from_params(get_gc_params(name), layer=layer, port_width=port_width)
+
 
+def create_grating_coupler_from_params(
+    params: dict,
+    layer: tuple[int, int] | None = None,
+    port_width: float | None = None,
+) -> gf.Component:
+    """Build a coupler from a model dict (as returned by get_gc_params) rather than a model name."""
     component_type = params["component_type"]
     if component_type not in (
         "grating_coupler_elliptical_uniform",
@@ -149,6 +166,8 @@ def create_grating_coupler(
 
     width_value = float(params["width"]) if port_width is None else float(port_width)
     gc_xs = gf.cross_section.strip(width=width_value, layer=gc_layer)
+    # Uniform models without ncladding keep gdsfactory's default cladding index.
+    cladding = {"nclad": float(params["ncladding"])} if "ncladding" in params else {}
 
     return gf.components.grating_coupler_elliptical_uniform(
         n_periods=int(params["n_periods"]),
@@ -160,5 +179,6 @@ def create_grating_coupler(
         fiber_angle=float(params["fiber_angle"]),
         polarization=str(params["polarization"]),
         cross_section=gc_xs,
+        **cladding,
     )
 
@@ -8,18 +8,14 @@ __all__ = [
 
 from functools import partial
 
+import klayout.db as kdb
 import numpy as np
 
 import gdsfactory as gf
 from gdsfactory.component import Component
-from gdsfactory.functions import DEG2RAD
+from gdsfactory.functions import DEG2RAD, RAD2DEG
 from gdsfactory.typings import LayerSpec
 
-try:
-    from ..grating_couplers.functions import grating_tooth_points
-except ImportError:
-    from gdsfactory.components.grating_couplers.functions import grating_tooth_points
-
 try:
     gf.get_active_pdk()
 except Exception:
@@ -37,6 +33,54 @@ def _as_layer(layer: LayerSpec) -> tuple[int, int]:
     return tuple(gf.get_layer(layer))
 
 
+def grating_teeth_points(
+    ap: np.ndarray,
+    bp: np.ndarray,
+    width: float,
+    taper_angle: float,
+    angle_step: float = 1.0,
+) -> np.ndarray:
+    """Spiked tooth outlines for many ellipses at once, shape (n_teeth, 2 * n_arc + 2, 2).
+
+    Row i equals gdsfactory's grating_tooth_points(ap[i], bp[i], 0.0, width, taper_angle):
+    the same snapped elliptical backbone and angle-bisector offsets, computed for
+    every tooth in one broadcast.
+    """
+    grid = gf.kcl.dbu
+    ap = np.asarray(ap, dtype=float)[:, None]
+    bp = np.asarray(bp, dtype=float)[:, None]
+    theta = np.arange(-taper_angle / 2, taper_angle / 2 + angle_step, angle_step) * DEG2RAD
+
+    backbone = np.empty((ap.shape[0], theta.size, 2), dtype=float)
+    backbone[..., 0] = ap * np.cos(theta)
+    backbone[..., 1] = bp * np.sin(theta)
+    backbone = grid * np.floor(backbone / grid + 0.5)
+
+    step = np.roll(backbone, -1, axis=1) - backbone
+    angles = np.arctan2(step[..., 1], step[..., 0])
+    start_angle = angles[:, 0] * RAD2DEG + 180
+    end_angle = angles[:, -2] * RAD2DEG
+
+    a2 = angles * 0.5
+    a1 = np.roll(a2, 1, axis=1)
+    a2[:, -1] = end_angle * DEG2RAD - a2[:, -2]
+    a1[:, 0] = start_angle * DEG2RAD - a1[:, 1]
+    a_plus = a2 + a1
+    cos_a_min = np.cos(a2 - a1)
+    offsets = np.stack((-np.sin(a_plus) / cos_a_min, np.cos(a_plus) / cos_a_min), axis=-1) * (0.5 * width)
+
+    spike = width / 3
+    start_rad = (start_angle * DEG2RAD)[:, None]
+    end_rad = (end_angle * DEG2RAD)[:, None]
+    p_start_spike = backbone[:, :1] + spike * np.stack((np.cos(start_rad), np.sin(start_rad)), axis=-1)
+    p_end_spike = backbone[:, -1:] + spike * np.stack((np.cos(end_rad), np.sin(end_rad)), axis=-1)
+
+    pts = np.concatenate(
+        (p_start_spike, backbone + offsets, p_end_spike, (backbone - offsets)[:, ::-1]), axis=1
+    )
+    return np.round(pts / grid) * grid
+
+
 @gf.cell
 def grating_coupler_elliptical_trenches(
     wg_width: float = 0.5,
@@ -94,16 +138,22 @@ def grating_coupler_elliptical_trenches(
     # Keep the grating start aligned to the taper start so the two layers overlap.
     # `period` sets the actual pitch.
     p_start = 30
-    for p in range(p_start, p_start + n_periods):
-        pts = grating_tooth_points(
-            (p + 1) * a1,
-            (p + 1) * b1,
-            0.0,
-            width=trench_width,
-            taper_angle=taper_angle + trenches_extra_angle,
-        )
-        pts[:, 0] += p * period
-        c.add_polygon(pts, layer_trench)
+    p = np.arange(p_start, p_start + n_periods)
+    teeth = grating_teeth_points(
+        (p + 1) * a1,
+        (p + 1) * b1,
+        width=trench_width,
+        taper_angle=taper_angle + trenches_extra_angle,
+    )
+    teeth[..., 0] += (p * period)[:, None]
+
+    # All teeth go into the cell in one shape insertion.
+    dbu = c.kcl.dbu
+    teeth_dbu = np.rint(teeth / dbu).astype(np.int64).tolist()
+    trenches = kdb.Region()
+    for tooth in teeth_dbu:
+        trenches.insert(kdb.Polygon([kdb.Point(x, y) for x, y in tooth]))
+    c.add_polygon(trenches, layer_trench)
 
     c.add_port(
         name="o1",
@@ -0,0 +1,184 @@
+"""Hierarchy and geometry statistics for a built component.
+
+layout_stats(component) walks the cell tree once and reports, as a JSON-ready
+dict: cell count, hierarchy depth, instances as stored vs. the number of
+placements after flattening, polygons and vertices per layer (stored and
+flattened), an estimate of the GDSII file size (geometry and hierarchy
+records only; kfactory's metadata context adds to the written file), and the
+cells contributing the most flattened vertices. Any generator can call it on its top component:
+
+    from layout_stats import write_layout_stats
+    write_layout_stats(top_chip)
+"""
+import json
+from pathlib import Path
+
+import klayout.db as kdb
+
+# GDSII record sizes in bytes (4-byte header + payload)
+_GDS_LIBRARY_BYTES = 6 + 28 + 20 + 4       # HEADER, BGNLIB, UNITS, ENDLIB
+_GDS_CELL_BYTES = 28 + 4                   # BGNSTR, ENDSTR
+_GDS_ELEMENT_BYTES = 4 + 6 + 6 + 4 + 4     # BOUNDARY/PATH, LAYER, DATATYPE, XY header, ENDEL
+_GDS_TEXT_BYTES = 4 + 6 + 6 + 12 + 4 + 4   # TEXT, LAYER, TEXTTYPE, XY, STRING header, ENDEL
+_GDS_SREF_BYTES = 4 + 4 + 12 + 4           # SREF, SNAME header, XY, ENDEL
+_GDS_AREF_BYTES = 4 + 4 + 8 + 28 + 4       # AREF, SNAME header, COLROW, XY, ENDEL
+_GDS_POINT_BYTES = 8
+
+_GEOMETRY = kdb.Shapes.SPolygons | kdb.Shapes.SBoxes | kdb.Shapes.SPaths
+
+
+def _gds_string_bytes(text):
+    return len(text) + len(text) % 2
+
+
+def _kdb_cell(component):
+    # gf.Component wraps a KLayout cell; plain kdb.Cell objects are accepted too
+    return component.kdb_cell if hasattr(component, "kdb_cell") else component
+
+
+def _instance_bytes(inst, child_name):
+    trans = inst.dcplx_trans
+    extra = 0
+    if trans.is_mirror() or trans.angle != 0 or trans.mag != 1:
+        extra += 6 + (12 if trans.mag != 1 else 0) + (12 if trans.angle != 0 else 0)
+    base = _GDS_AREF_BYTES if inst.is_regular_array() else _GDS_SREF_BYTES
+    return base + _gds_string_bytes(child_name) + extra
+
+
+def _shape_vertices(shape):
+    if shape.is_path():
+        return shape.path.num_points()
+    if shape.is_box():
+        return 4
+    return shape.polygon.num_points()
+
+
+def layout_stats(component, top_cells=10):
+    """Return hierarchy, per-layer geometry and estimated GDS size statistics for ``component``."""
+    top = _kdb_cell(component)
+    layout = top.layout()
+    members = {top.cell_index(), *top.called_cells()}
+
+    # Placements of each cell once the hierarchy is flattened: parents come
+    # before children in top-down order, so each multiplicity is final when read.
+    multiplicity = dict.fromkeys(members, 0)
+    multiplicity[top.cell_index()] = 1
+    instances = placements = 0
+    gds_bytes = _GDS_LIBRARY_BYTES + _gds_string_bytes(top.name)
+    for cell_index in layout.each_cell_top_down():
+        if cell_index not in members:
+            continue
+        cell = layout.cell(cell_index)
+        gds_bytes += _GDS_CELL_BYTES + _gds_string_bytes(cell.name)
+        for inst in cell.each_inst():
+            count = inst.size()
+            instances += 1
+            placements += count
+            multiplicity[inst.cell_index] += multiplicity[cell_index] * count
+            gds_bytes += _instance_bytes(inst, layout.cell(inst.cell_index).name)
+
+    depth = {}
+    for cell_index in layout.each_cell_bottom_up():
+        if cell_index in members:
+            children = list(layout.cell(cell_index).each_child_cell())
+            depth[cell_index] = 1 + max((depth[c] for c in children), default=-1)
+
+    layers = {}
+    cell_vertices = dict.fromkeys(members, 0)
+    for layer_index in layout.layer_indexes():
+        info = layout.get_info(layer_index)
+        polygons = vertices = flat_polygons = flat_vertices = texts = 0
+        for cell_index in members:
+            shapes = layout.cell(cell_index).shapes(layer_index)
+            if shapes.is_empty():
+                continue
+            cell_polygons = cell_points = 0
+            for shape in shapes.each(_GEOMETRY):
+                points = _shape_vertices(shape)
+                cell_polygons += 1
+                cell_points += points
+                # Closing point repeated in BOUNDARY XY; paths add a WIDTH record
+                gds_bytes += _GDS_ELEMENT_BYTES + _GDS_POINT_BYTES * (points + (0 if shape.is_path() else 1))
+                gds_bytes += 8 if shape.is_path() else 0
+            for shape in shapes.each(kdb.Shapes.STexts):
+                texts += 1
+                gds_bytes += _GDS_TEXT_BYTES + _gds_string_bytes(shape.text_string)
+            polygons += cell_polygons
+            vertices += cell_points
+            flat_polygons += cell_polygons * multiplicity[cell_index]
+            flat_vertices += cell_points * multiplicity[cell_index]
+            cell_vertices[cell_index] += cell_points
+        if polygons or texts:
+            layers[f"{info.layer}/{info.datatype}"] = {
+                "polygons": polygons,
+                "vertices": vertices,
+                "flat_polygons": flat_polygons,
+                "flat_vertices": flat_vertices,
+                "texts": texts,
+            }
+
+    total_vertices = sum(layer["vertices"] for layer in layers.values())
+    total_flat_vertices = sum(layer["flat_vertices"] for layer in layers.values())
+    heaviest = sorted(members, key=lambda c: cell_vertices[c] * multiplicity[c], reverse=True)[:top_cells]
+    return {
+        "top": top.name,
+        "cells": len(members),
+        "hierarchy_depth": depth[top.cell_index()],
+        "instances": instances,
+        "instance_placements": placements,
+        "flat_instances": sum(multiplicity.values()) - 1,
+        "polygons": sum(layer["polygons"] for layer in layers.values()),
+        "vertices": total_vertices,
+        "flat_polygons": sum(layer["flat_polygons"] for layer in layers.values()),
+        "flat_vertices": total_flat_vertices,
+        # Flattened / stored vertices: how much geometry the hierarchy saves
+        "hierarchy_reuse": round(total_flat_vertices / total_vertices, 3) if total_vertices else 1.0,
+        "estimated_gds_bytes": gds_bytes,
+        "layers": dict(sorted(layers.items(), key=lambda item: tuple(int(v) for v in item[0].split("/")))),
+        "heaviest_cells": [
+            {
+                "name": layout.cell(c).name,
+                "vertices": cell_vertices[c],
+                "placements": multiplicity[c],
+                "flat_vertices": cell_vertices[c] * multiplicity[c],
+            }
+            for c in heaviest
+            if cell_vertices[c]
+        ],
+    }
+
+
+def print_layout_stats(stats):
+    """Print a short summary of layout_stats() output."""
+    print(
+        f"{stats['top']}: {stats['cells']} cells, depth {stats['hierarchy_depth']}, "
+        f"{stats['instances']} instances -> {stats['flat_instances']} flattened, "
+        f"{stats['vertices']} vertices stored / {stats['flat_vertices']} flattened "
+        f"(x{stats['hierarchy_reuse']}), ~{stats['estimated_gds_bytes'] / 1024:.1f} kB GDS"
+    )
+    for layer, counts in stats["layers"].items():
+        print(f"  {layer:>8}: {counts['polygons']:7d} polygons {counts['vertices']:9d} vertices ({counts['flat_vertices']} flat)")
+    for cell in stats["heaviest_cells"]:
+        print(f"  {cell['name']}: {cell['vertices']} vertices x {cell['placements']} = {cell['flat_vertices']}")
+
+
+def _stats_dir():
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "Setup").exists():
+            return parent / "Setup" / "build" / "stats"
+    return Path(__file__).resolve().parents[1] / "build" / "stats"
+
+
+def write_layout_stats(component, path=None, top_cells=10):
+    """Collect layout_stats() for ``component``, write it as JSON and print the summary.
+
+    Defaults to build/stats/<top cell name>.json. Returns the stats dict.
+    """
+    stats = layout_stats(component, top_cells=top_cells)
+    path = Path(path) if path else _stats_dir() / f"{stats['top'].replace(' ', '_')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(stats, f, indent=2)
+    print_layout_stats(stats)
+    print(f"Layout statistics written to {path}")
+    return stats
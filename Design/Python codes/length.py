@@ -56,6 +56,44 @@ except ValueError:
 cross_section = gf.cross_section.strip(width=width, layer=layer)
 
 
+# build_length_path's centre straight is z - 160 long.
+CENTER_STRAIGHT_OFFSET = 160
+
+
+def _dimension_equations(total_length, coupler_distance, bend_radius, taper_length_value):
+    """Path constraint equations; works on scalars and broadcastable NumPy arrays."""
+    z_value = total_length / 5
+    x_value = (coupler_distance - z_value - 4 * bend_radius + 70 - 2 * taper_length_value) / 10
+    y_value = (total_length - 10 * x_value - z_value + 70 - 2 * taper_length_value) / 4
+    return x_value, y_value, z_value
+
+
+def solve_dimensions_grid(total_length, coupler_distance, bend_radius, taper_length_value) -> dict:
+    """Solve x, y, z for every L x D x R x taper combination in one pass.
+
+    Each argument may be a scalar or a sequence; result arrays have shape
+    (len(L), len(D), len(R), len(taper)). Returns a dict with the broadcast
+    inputs ("L", "D", "R", "taper"), the solved "x", "y", "z" and a boolean
+    "feasible" mask: x > 0, y > 0 and a non-negative z - 160 centre straight.
+    """
+    L, D, R, T = np.meshgrid(
+        np.atleast_1d(np.asarray(total_length, dtype=float)),
+        np.atleast_1d(np.asarray(coupler_distance, dtype=float)),
+        np.atleast_1d(np.asarray(bend_radius, dtype=float)),
+        np.atleast_1d(np.asarray(taper_length_value, dtype=float)),
+        indexing="ij",
+    )
+    x_value, y_value, z_value = _dimension_equations(L, D, R, T)
+    feasible = (x_value > 0) & (y_value > 0) & (z_value - CENTER_STRAIGHT_OFFSET >= 0)
+    return {"L": L, "D": D, "R": R, "taper": T, "x": x_value, "y": y_value, "z": z_value, "feasible": feasible}
+
+
+def infeasible_combinations(solution: dict) -> list[tuple[float, float, float, float]]:
+    """List the (L, D, R, taper) rows a solve_dimensions_grid result marks infeasible."""
+    mask = ~solution["feasible"]
+    return list(zip(*(solution[key][mask].tolist() for key in ("L", "D", "R", "taper"))))
+
+
 def calculate_dimensions(
     total_length: float,
     coupler_distance: float,
@@ -63,9 +101,9 @@ def calculate_dimensions(
     taper_length_value: float,
 ) -> tuple[float, float, float]:
     """Solve x, y, z from the updated path constraints including tapers."""
-    z_value = total_length / 5
-    x_value = (coupler_distance - z_value - 4 * bend_radius + 70 - 2 * taper_length_value) / 10
-    y_value = (total_length - 10 * x_value - z_value + 70 - 2 * taper_length_value) / 4
+    x_value, y_value, z_value = _dimension_equations(
+        total_length, coupler_distance, bend_radius, taper_length_value
+    )
 
     if x_value <= 0:
         raise ValueError(
@@ -95,7 +133,7 @@ def build_length_path(
     path += gf.path.euler(radius=bend_radius, angle=-90)
     path += gf.path.straight(length=2 * y_value)
     path += gf.path.euler(radius=bend_radius, angle=90)
-    path += gf.path.straight(length = z_value -160)
+    path += gf.path.straight(length = z_value - CENTER_STRAIGHT_OFFSET)
     path += gf.path.euler(radius=bend_radius, angle=90)
     path += gf.path.straight(length=2 * y_value)
     path += gf.path.euler(radius=bend_radius, angle=-90)
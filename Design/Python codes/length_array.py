@@ -14,7 +14,8 @@ for _parent in Path(__file__).resolve().parents:
     if _setup_dir.exists():
         kf_conf.config.__dict__["project_dir"] = _setup_dir
         break
-from length import build_length_element
+from length import build_length_element, infeasible_combinations, solve_dimensions_grid
+from output_format import show_component
 
 
 # gdsfactory 9.x requires an active PDK before geometry/layer creation.
@@ -133,6 +134,17 @@ def create_length_array(array_params: dict) -> gf.Component:
     )
     
     d_distance = float(array_params.get("length_element", {}).get("D", 600))
+    bend_radius = float(array_params.get("length_element", {}).get("bend_radius", 10.0))
+    taper_length_value = float(array_params.get("length_element", {}).get("taper_length", 20.0))
+
+    # Validate the whole sweep before any geometry is built.
+    bad = infeasible_combinations(solve_dimensions_grid(lengths, d_distance, bend_radius, taper_length_value))
+    if bad:
+        raise ValueError(
+            f"Length sweep infeasible (x, y or z - 160 out of range) for L = {[row[0] for row in bad]} "
+            f"with D={d_distance}, R={bend_radius}, taper={taper_length_value}."
+        )
+
     waveguide_width = float(array_params.get("length_element", {}).get("width", 0.3))
     width_nm = int(round(waveguide_width * 1000))
     array_name = str(array_cfg.get("array_name", f"SW{width_nm}"))
@@ -175,8 +187,6 @@ def create_length_array(array_params: dict) -> gf.Component:
     start_y = float(placement_cfg.get("start_y", -220.0))
     local_y_spacing = float(array_cfg.get("y_spacing", 130.0))
     top_cell_prefix = str(array_cfg.get("top_cell_prefix", "L"))
-    bend_radius = float(array_params.get("length_element", {}).get("bend_radius", 10.0))
-    taper_length_value = float(array_params.get("length_element", {}).get("taper_length", 20.0))
     grating_coupler_model = array_params.get("length_element", {}).get("grating_coupler_model", None)
     current_y = start_y
 
@@ -211,5 +221,5 @@ if __name__ == "__main__":
 
     length_array = create_length_array(array_params)
 
-    length_array.show()
+    show_component(length_array)
 
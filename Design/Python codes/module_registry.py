@@ -0,0 +1,149 @@
+"""Registry for dynamically loaded generator modules.
+
+Modules are keyed by resolved file path and content hash instead of bare file
+stem, so two generators with the same file name never collide and an edited
+generator is re-executed on the next load while unchanged ones are reused.
+Sibling modules a generator imports by bare name (for example
+``grating_couplers``) are tracked too and reloaded when their source changes.
+"""
+import ast
+import hashlib
+import importlib
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+# resolved path -> {"module": module, "hash": str, "deps": {name: Path}}
+_REGISTRY = {}
+# resolved path -> hash of a bare-name dependency when it was last (re)loaded
+_DEPENDENCY_HASHES = {}
+
+
+def file_hash(path) -> str:
+    """Return a short content hash for a file, or "" if it no longer exists."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+    except FileNotFoundError:
+        return ""
+
+
+def _module_name(path: Path) -> str:
+    """Unique sys.modules key for a generator file (stem plus path digest)."""
+    digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:8]
+    return f"_pic_generator_{path.stem}_{digest}"
+
+
+def _local_dependencies(path: Path) -> dict:
+    """Map bare-name imports in ``path`` to sibling .py files in the same directory."""
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError):
+        return {}
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module.split(".")[0])
+
+    deps = {}
+    for name in sorted(names):
+        candidate = path.parent / f"{name}.py"
+        if candidate.exists() and candidate != path:
+            deps[name] = candidate.resolve()
+    return deps
+
+
+def _refresh_dependencies(deps: dict) -> bool:
+    """Reload bare-name sibling modules whose source changed. Returns True if any did."""
+    reloaded = False
+    for name, dep_path in deps.items():
+        digest = file_hash(dep_path)
+        previous = _DEPENDENCY_HASHES.get(dep_path)
+        _DEPENDENCY_HASHES[dep_path] = digest
+        if previous is None or previous == digest:
+            continue
+        module = sys.modules.get(name)
+        if module is not None and Path(getattr(module, "__file__", "")).resolve() == dep_path:
+            print(f"Reloading changed dependency {name} ({dep_path.name})")
+            importlib.reload(module)
+            reloaded = True
+    return reloaded
+
+
+def _combined_hash(path: Path, deps: dict) -> str:
+    parts = [file_hash(path)] + [file_hash(dep) for dep in deps.values()]
+    return hashlib.sha256("|".join(parts).encode("ascii")).hexdigest()[:16]
+
+
+def load_module(py_path):
+    """Load a generator module, re-executing it only if it or a sibling dependency changed."""
+    path = Path(py_path).resolve()
+    if not path.exists():
+        raise FileNotFoundError(f"Cannot find module file: {path}")
+
+    deps = _local_dependencies(path)
+    # Make sure a generator script directory is importable for its bare-name imports.
+    if str(path.parent) not in sys.path:
+        sys.path.insert(0, str(path.parent))
+    _refresh_dependencies(deps)
+
+    digest = _combined_hash(path, deps)
+    entry = _REGISTRY.get(path)
+    if entry is not None and entry["hash"] == digest:
+        return entry["module"]
+
+    name = _module_name(path)
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise FileNotFoundError(f"Cannot find module file: {path}")
+    module = importlib.util.module_from_spec(spec)
+
+    previous = sys.modules.get(name)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        # Keep the last good version registered if the edited file is broken.
+        if previous is not None:
+            sys.modules[name] = previous
+        else:
+            sys.modules.pop(name, None)
+        raise
+
+    if entry is not None:
+        print(f"Reloaded changed generator {path.name}")
+    _REGISTRY[path] = {"module": module, "hash": digest, "deps": deps}
+    return module
+
+
+def watch(paths, on_change, interval: float = 1.0, max_cycles: int | None = None) -> None:
+    """Poll ``paths`` and call ``on_change(changed_paths)`` when any of them is edited.
+
+    A path counts as changed when it, or a sibling module it imports, gets new
+    content. Stops after ``max_cycles`` polls if given, otherwise on Ctrl+C.
+    """
+    tracked = {}
+    for p in paths:
+        path = Path(p).resolve()
+        deps = _local_dependencies(path)
+        tracked[path] = (deps, _combined_hash(path, deps))
+
+    print(f"Watching {len(tracked)} generator file(s) for changes (Ctrl+C to stop)...")
+    cycles = 0
+    try:
+        while max_cycles is None or cycles < max_cycles:
+            time.sleep(interval)
+            cycles += 1
+            changed = []
+            for path, (deps, digest) in tracked.items():
+                new_digest = _combined_hash(path, deps)
+                if new_digest != digest:
+                    tracked[path] = (deps, new_digest)
+                    changed.append(path)
+            if changed:
+                on_change(changed)
+    except KeyboardInterrupt:
+        print("Stopped watching.")
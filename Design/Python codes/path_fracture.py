@@ -0,0 +1,95 @@
+"""Fracture long path extrusions into GDSII-friendly polygons.
+
+A single extruded spiral or ROC waveguide can exceed the GDSII limit of 8190
+vertices per polygon. extrude_fractured() is a drop-in for
+gf.path.extrude(path, cross_section=...) that, when the path is too long,
+emits one polygon per straight/bend run (further chunked to the vertex limit).
+The edge offsets are computed once for the whole path with gdsfactory's own
+averaged-angle offset curve, so neighbouring pieces share their boundary
+vertices and the merged shape is unchanged.
+"""
+import math
+
+import gdsfactory as gf
+import klayout.db as kdb
+import numpy as np
+
+# gdsfactory 9.x requires an active PDK before geometry/layer creation.
+try:
+    gf.get_active_pdk()
+except Exception:
+    try:
+        gf.gpdk.PDK.activate()
+    except Exception:
+        from gdsfactory.generic_tech import get_generic_pdk
+        get_generic_pdk().activate()
+
+# GDSII allows 8191 XY pairs per BOUNDARY including the closing point.
+MAX_VERTICES = 8190
+
+# Segments whose estimated curvature is below this (1/um) count as straight.
+STRAIGHT_CURVATURE = 1e-3
+
+
+def fracture_indices(points, max_vertices=MAX_VERTICES, straight_curvature=STRAIGHT_CURVATURE):
+    """Return sorted point indices at which a path's outline is split.
+
+    Splits happen where the path changes between straight and curved runs,
+    and runs longer than max_vertices // 2 points are cut into equal chunks.
+    A path that already fits in one polygon is returned unsplit.
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    if 2 * n <= max_vertices:
+        return np.array([0, n - 1])
+
+    steps = np.diff(points, axis=0)
+    seg_len = np.hypot(steps[:, 0], steps[:, 1])
+    heading = np.arctan2(steps[:, 1], steps[:, 0])
+    # Turning angle at each interior vertex, wrapped to [-pi, pi]
+    turn = np.abs((np.diff(heading) + np.pi) % (2 * np.pi) - np.pi)
+    turn_at_vertex = np.concatenate([[0.0], turn, [0.0]])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        curvature = (turn_at_vertex[:-1] + turn_at_vertex[1:]) / (2 * seg_len)
+    curved = np.nan_to_num(curvature) > straight_curvature
+    run_bounds = np.concatenate([[0], np.flatnonzero(np.diff(curved.astype(np.int8))) + 1, [n - 1]])
+
+    max_points = max_vertices // 2
+    cuts = [0]
+    for start, stop in zip(run_bounds[:-1], run_bounds[1:]):
+        n_chunks = max(1, math.ceil((stop - start) / (max_points - 1)))
+        cuts.extend(np.linspace(start, stop, n_chunks + 1).round().astype(int)[1:].tolist())
+    return np.unique(cuts)
+
+
+def extrude_fractured(path, cross_section, max_vertices=MAX_VERTICES):
+    """Extrude ``path`` like gf.path.extrude, splitting outlines above max_vertices.
+
+    Paths that fit in one polygon are passed to gf.path.extrude unchanged.
+    """
+    points = np.asarray(path.points, dtype=float)
+    cuts = fracture_indices(points, max_vertices)
+    if len(cuts) <= 2:
+        return gf.path.extrude(path, cross_section=cross_section)
+
+    xs = gf.get_cross_section(cross_section)
+    width = xs.width
+    layer = xs.layer
+    half = width / 2
+    left = path.centerpoint_offset_curve(points, half, path.start_angle, path.end_angle)
+    right = path.centerpoint_offset_curve(points, -half, path.start_angle, path.end_angle)
+
+    c = gf.Component()
+    dbu = c.kcl.dbu
+    left_dbu = np.rint(left / dbu).astype(np.int64)
+    right_dbu = np.rint(right / dbu).astype(np.int64)
+    region = kdb.Region()
+    for start, stop in zip(cuts[:-1], cuts[1:]):
+        outline = np.vstack([left_dbu[start:stop + 1], right_dbu[start:stop + 1][::-1]])
+        region.insert(kdb.Polygon([kdb.Point(x, y) for x, y in outline.tolist()]))
+    c.add_polygon(region, layer=layer)
+
+    c.add_port(name="o1", center=tuple(points[0]), width=width, orientation=(path.start_angle + 180) % 360, layer=layer)
+    c.add_port(name="o2", center=tuple(points[-1]), width=width, orientation=path.end_angle % 360, layer=layer)
+    c.info["fractured_polygons"] = len(cuts) - 1
+    return c
@@ -0,0 +1,71 @@
+"""Tolerance-driven point counts for arcs and Euler bends.
+
+gdsfactory picks bend point counts from the PDK bend spacing, independent of
+the fab's resolution, so long spirals and bend trains carry more vertices than
+the e-beam writer can resolve. These helpers pick the fewest points whose
+chord error (maximum distance between a polygon edge and the ideal curve)
+stays below a tolerance in nm.
+"""
+import math
+
+import gdsfactory as gf
+
+# gdsfactory 9.x requires an active PDK before geometry/layer creation.
+try:
+    gf.get_active_pdk()
+except Exception:
+    try:
+        gf.gpdk.PDK.activate()
+    except Exception:
+        from gdsfactory.generic_tech import get_generic_pdk
+        get_generic_pdk().activate()
+
+# Matches the 1 nm database unit / e-beam address grid.
+DEFAULT_TOLERANCE_NM = 1.0
+
+
+def chord_step(min_radius, tolerance_nm=DEFAULT_TOLERANCE_NM):
+    """Longest arc length per segment whose sagitta on min_radius stays within tolerance_nm."""
+    tolerance = tolerance_nm * 1e-3
+    if tolerance >= min_radius:
+        return math.pi * min_radius
+    return 2 * min_radius * math.acos(1 - tolerance / min_radius)
+
+
+def _npoints_for_length(length, min_radius, tolerance_nm):
+    return max(2, math.ceil(abs(length) / chord_step(min_radius, tolerance_nm)) + 1)
+
+
+def arc_npoints(radius, angle, tolerance_nm=DEFAULT_TOLERANCE_NM):
+    """Points for gf.path.arc(radius, angle) at the given chord tolerance."""
+    return _npoints_for_length(radius * math.radians(angle), radius, tolerance_nm)
+
+
+def euler_npoints(radius, angle, p=0.5, tolerance_nm=DEFAULT_TOLERANCE_NM):
+    """Points for gf.path.euler(radius, angle, p); radius is the minimum radius of curvature.
+
+    gf.path.euler samples half of the bend with npoints and mirrors it, giving
+    a fraction 2p/(p+1) of them to the clothoid section (length R*p*alpha) and
+    the rest to the circular section (length R*(1-p)*alpha/2). Both sections
+    are sized for the worst-case curvature 1/R.
+    """
+    alpha = math.radians(abs(angle))
+    step = chord_step(radius, tolerance_nm)
+    euler_fraction = 2 * p / (p + 1)
+    needed = 2
+    if euler_fraction > 0:
+        needed = max(needed, math.ceil((radius * p * alpha / step + 1) / euler_fraction))
+    if euler_fraction < 1:
+        needed = max(needed, math.ceil((radius * (1 - p) * alpha / 2 / step + 1) / (1 - euler_fraction)))
+    # One spare point absorbs gdsfactory's rounding of the section split
+    return needed + 1
+
+
+def arc(radius, angle, tolerance_nm=DEFAULT_TOLERANCE_NM):
+    """gf.path.arc sampled to the chord tolerance."""
+    return gf.path.arc(radius=radius, angle=angle, npoints=arc_npoints(radius, angle, tolerance_nm))
+
+
+def euler(radius, angle, p=0.5, tolerance_nm=DEFAULT_TOLERANCE_NM):
+    """gf.path.euler sampled to the chord tolerance."""
+    return gf.path.euler(radius=radius, angle=angle, p=p, npoints=euler_npoints(radius, angle, p, tolerance_nm))
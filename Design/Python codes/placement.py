@@ -8,8 +8,6 @@ for _parent in Path(__file__).resolve().parents:
     if _setup_dir.exists():
         kf_conf.config.__dict__["project_dir"] = _setup_dir
         break
-import importlib
-import importlib.util
 import sys
 from pathlib import Path
 
@@ -24,29 +22,19 @@ except Exception:
         get_generic_pdk().activate()
 
 # Import the grid creation function from Grid.py
-from Grid import load_config_from_json, create_grid_component
+from Grid import load_config_from_json, create_grid_component_cached
+from module_registry import load_module
+from output_format import show_component, write_component
 
 def load_component_from_py(py_path, func_name, **kwargs):
     """Dynamically load a component from a Python file given the function name and kwargs."""
-    module_name = Path(py_path).stem
-    if module_name in sys.modules:
-        mod = sys.modules[module_name]
-    else:
-        spec = importlib.util.spec_from_file_location(module_name, py_path)
-        mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(mod)
+    mod = load_module(py_path)
     func = getattr(mod, func_name)
     return func(**kwargs)
 
 def load_width_pitch_component(py_path):
     """Load the main width_pitch component using p_cascades and add_die_box_with_grid."""
-    module_name = Path(py_path).stem
-    if module_name in sys.modules:
-        mod = sys.modules[module_name]
-    else:
-        spec = importlib.util.spec_from_file_location(module_name, py_path)
-        mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(mod)
+    mod = load_module(py_path)
     c, _ = mod.p_cascades()
     c = mod.add_die_box_with_grid(c)
     return c
@@ -54,13 +42,7 @@ def load_width_pitch_component(py_path):
 def load_width_pitch_component_with_name(py_path, die_number=None):
     """Load the main width_pitch component and return (component, die_name). Optionally override die_name."""
     import uuid
-    module_name = Path(py_path).stem
-    if module_name in sys.modules:
-        mod = sys.modules[module_name]
-    else:
-        spec = importlib.util.spec_from_file_location(module_name, py_path)
-        mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(mod)
+    mod = load_module(py_path)
     # Generate a unique cell name for each instance to avoid cell name collision
     unique_id = uuid.uuid4().hex[:8]
     orig_gf_Component = gf.Component
@@ -80,12 +62,8 @@ def load_width_pitch_component_with_name(py_path, die_number=None):
     # die_name will be 'Die (x)' if die_number is int, or as passed
     return c, f"Die {die_number}" if die_number is not None else die_name
 
-def load_component_with_die(py_path, die_number=None, width=None):
-    """Load a component from a Python file, add a die box with the correct die label, and return (component, die_name)."""
-    import uuid
-    import importlib.util
-    import os
-    
+def resolve_generator_path(py_path):
+    """Resolve a placement.json py_path (relative to Design/ or Python codes/) to a file path."""
     # Handle both relative and absolute paths, and ensure proper path construction
     if not py_path.endswith('.py'):
         py_path = py_path + '.py'
@@ -95,22 +73,31 @@ def load_component_with_die(py_path, die_number=None, width=None):
     
     # If it's already an absolute path, use it as is
     if path_obj.is_absolute():
-        resolved_path = path_obj
-    else:
-        # For relative paths, we need to resolve them properly
-        # Get the directory where this script is located (should be "Python codes")
-        script_dir = Path(__file__).parent
-        
-        # If the path starts with "Python codes/", we need to go up one level
-        if py_path.startswith('Python codes/') or py_path.startswith('Python codes\\'):
-            # Remove the "Python codes/" prefix and resolve from parent directory
-            relative_part = py_path[len('Python codes/'):].replace('\\', '/')
-            resolved_path = script_dir.parent / 'Python codes' / relative_part
-        else:
-            # Path is relative to current script directory
-            resolved_path = script_dir / py_path
+        return path_obj
+
+    # For relative paths, we need to resolve them properly
+    # Get the directory where this script is located (should be "Python codes")
+    script_dir = Path(__file__).parent
     
-    # Convert back to string for the rest of the function
+    # If the path starts with "Python codes/", we need to go up one level
+    if py_path.startswith('Python codes/') or py_path.startswith('Python codes\\'):
+        # Remove the "Python codes/" prefix and resolve from parent directory
+        relative_part = py_path[len('Python codes/'):].replace('\\', '/')
+        return script_dir.parent / 'Python codes' / relative_part
+    # Path is relative to current script directory
+    return script_dir / py_path
+
+def _generation_suffix(generation):
+    return f"_g{generation}" if generation else ""
+
+def load_component_with_die(py_path, die_number=None, width=None, generation=0):
+    """Load a component from a Python file, add a die box with the correct die label, and return (component, die_name).
+
+    A non-zero ``generation`` (watch-mode rebuilds) adds _g<generation> to the
+    subcell names, and to the @gf.cell names of any generator module reloaded for
+    it, so a rebuilt die never clashes with or reuses the cells of earlier builds.
+    """
+    resolved_path = resolve_generator_path(py_path)
     py_path_str = str(resolved_path)
     
     print(f"Debug: Original py_path: {py_path}")
@@ -118,22 +105,30 @@ def load_component_with_die(py_path, die_number=None, width=None):
     print(f"Debug: File exists: {resolved_path.exists()}")
     
     module_name = resolved_path.stem
-    if module_name in sys.modules:
-        mod = sys.modules[module_name]
-    else:
-        spec = importlib.util.spec_from_file_location(module_name, py_path_str)
-        if spec is None:
-            raise FileNotFoundError(f"Cannot find module file: {py_path_str}")
-        mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(mod)
-    # Instead of a random uuid, use the die_number for subcell uniqueness
+    # Modules are keyed by resolved path and content hash, so edited generators reload.
+    orig_gf_cell = gf.cell
+    if generation:
+        # kfactory serves @gf.cell results from the layout by cell name, so cell
+        # functions of a reloaded module get generation-specific names
+        def GenerationCell(func=None, /, **kwargs):
+            if func is None:
+                return lambda f: GenerationCell(f, **kwargs)
+            kwargs["basename"] = (kwargs.get("basename") or func.__name__) + _generation_suffix(generation)
+            return orig_gf_cell(func, **kwargs)
+        gf.cell = GenerationCell
+    try:
+        mod = load_module(resolved_path)
+    finally:
+        gf.cell = orig_gf_cell
+    # Instead of a random uuid, use the die_number (and rebuild generation) for subcell uniqueness
+    suffix = f"_{die_number}{_generation_suffix(generation)}"
     orig_gf_Component = gf.Component
     def UniqueNameComponent(*args, **kwargs):
         # Always append _{die_number} to the cell name for all subcells
         if args:
-            args = (f"{args[0]}_{die_number}",) + args[1:]
+            args = (f"{args[0]}{suffix}",) + args[1:]
         elif 'name' in kwargs:
-            kwargs['name'] = f"{kwargs['name']}_{die_number}"
+            kwargs['name'] = f"{kwargs['name']}{suffix}"
         return orig_gf_Component(*args, **kwargs)
     gf.Component = UniqueNameComponent
     try:        
@@ -201,8 +196,79 @@ def calculate_dynamic_chip_size(placements, margin=2000):
     print(f"Calculated dynamic chip size: {chip_width} x {chip_height} microns")
     return [chip_width, chip_height]
 
-def main():
+def build_die(placement, generation=0):
+    """Build one die from a placement.json entry and return (component, die_name)."""
+    # Extract width parameter if it exists, otherwise use None
+    width = placement.get("width", None)
+    component, die_name = load_component_with_die(
+        placement["py_path"], 
+        die_number=placement["die_number"],
+        width=width,
+        generation=generation
+    )
+    # Rename the die cell to Die1, Die2, ... (Die1_g2 for the second watch-mode rebuild)
+    component.name = die_name.replace(" ", "") + _generation_suffix(generation)  # e.g., Die1, Die2
+    return component, die_name
+
+def assemble_chip(grid, placements, built_dies, generation=0):
+    """Place the grid and the built dies into the top-level chip component."""
+    # Create Dies component to hold all dies
+    dies_component = gf.Component("Dies" + _generation_suffix(generation))
+    for placement, (component, die_name) in zip(placements, built_dies):
+        die_ref = dies_component.add_ref(component)
+        die_ref.move(tuple(placement["position"]))
+        die_ref.name = die_name
+
+    # Create the top-level chip component
+    top_chip = gf.Component("Placed Chip" + _generation_suffix(generation))
+    # Add grid and dies as children
+    grid_ref = top_chip.add_ref(grid)
+    grid_ref.name = "Grid"
+    dies_ref = top_chip.add_ref(dies_component)
+    dies_ref.name = "Dies"
+    return top_chip
+
+def watch_and_rebuild(grid, placements, built_dies, interval=1.0):
+    """Rebuild only the dies whose generator file (or its imports) changed, then re-show the chip.
+
+    Each rebuild is a new generation: the rebuilt dies, Dies and Placed Chip
+    get a _g<generation> suffix, so their cells never clash with earlier builds.
+    Cells of earlier generations stay in the layout but are no longer shown.
+    """
+    from module_registry import watch
+
+    generator_paths = [resolve_generator_path(p["py_path"]).resolve() for p in placements]
+    current = {"generation": 0}
+
+    def on_change(changed_paths):
+        changed = set(changed_paths)
+        current["generation"] += 1
+        generation = current["generation"]
+        for index, placement in enumerate(placements):
+            if generator_paths[index] not in changed:
+                continue
+            print(f"Rebuilding Die {placement['die_number']} ({generator_paths[index].name})...")
+            try:
+                built_dies[index] = build_die(placement, generation)
+            except Exception as e:
+                print(f"Rebuild of Die {placement['die_number']} failed, keeping previous version: {e}")
+        show_component(assemble_chip(grid, placements, built_dies, generation))
+
+    watch(sorted(set(generator_paths)), on_change, interval=interval)
+
+def _build_dir():
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "Setup").exists():
+            return parent / "Setup" / "build" / "gds"
+    return Path(__file__).resolve().parents[1] / "build" / "gds"
+
+def main(check_only=False, watch_mode=False, stats=False, drc=False):
     import json
+    if check_only:
+        # Validate die footprints before any geometry is built.
+        from placement_check import run_check
+        return run_check("Json/placement.json", "Json/Grid.json")
+
     # Load grid config and create grid using chip size from Grid.json
     config_path = "Json/Grid.json"
     config = load_config_from_json(config_path)
@@ -217,39 +283,28 @@ def main():
         placement_data = json.load(f)
     placements = placement_data["placements"]
     
-    # Create the grid as a separate component named 'Grid'
-    grid = create_grid_component(config)
-    grid.name = "Grid"
+    # Create the grid as a separate component named 'Grid' (reused from build/cache when Grid.json is unchanged)
+    grid = create_grid_component_cached(config)
     
-    # Create Dies component to hold all dies
-    dies_component = gf.Component("Dies")
-    die_refs = []
-    for placement in placements:
-        # Extract width parameter if it exists, otherwise use None
-        width = placement.get("width", None)
-        component, die_name = load_component_with_die(
-            placement["py_path"], 
-            die_number=placement["die_number"],
-            width=width
-        )
-        # Rename the die cell to Die1, Die2, ...
-        component.name = die_name.replace(" ", "")  # e.g., Die1, Die2
-        die_ref = dies_component.add_ref(component)
-        die_ref.move(tuple(placement["position"]))
-        die_ref.name = die_name
-        die_refs.append(die_ref)
+    built_dies = [build_die(placement) for placement in placements]
+    top_chip = assemble_chip(grid, placements, built_dies)
 
-    # Create the top-level chip component
-    top_chip = gf.Component("Placed Chip")
-    # Add grid and dies as children
-    grid_ref = top_chip.add_ref(grid)
-    grid_ref.name = "Grid"
-    dies_ref = top_chip.add_ref(dies_component)
-    dies_ref.name = "Dies"
+    if stats:
+        from layout_stats import write_layout_stats
+        write_layout_stats(top_chip)
 
-    # Show the layout in the viewer
-    top_chip.show()
+    if drc:
+        from drc_lite import write_drc_report
+        write_drc_report(top_chip)
 
-if __name__ == "__main__":
-    main()
+    # Write the placed chip to build/gds and show it in the viewer
+    gds_path = write_component(top_chip, _build_dir() / "placed_chip.gds")
+    print(f"Wrote: {gds_path}")
+    show_component(top_chip)
 
+    if watch_mode:
+        watch_and_rebuild(grid, placements, built_dies)
+
+if __name__ == "__main__":
+    from profiling import run_profiled
+    sys.exit(run_profiled(main, name="placement", check_only="--check" in sys.argv[1:], watch_mode="--watch" in sys.argv[1:], stats="--stats" in sys.argv[1:], drc="--drc" in sys.argv[1:]))
@@ -0,0 +1,268 @@
+"""Overlap and keep-out checks for placement.json and temporary_placement.json.
+
+Die footprints are derived from the generator JSON files instead of built
+geometry, so a placement file can be validated in milliseconds before any
+gdsfactory cell is created.
+"""
+import json
+import math
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+JSON_DIR = SCRIPT_DIR.parent / "Json"
+
+# Same rough die size placement.calculate_dynamic_chip_size assumes.
+DEFAULT_DIE_SIZE = 3000.0
+
+
+def _load_json(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _fixed_grid_size(array_json_name):
+    """Side length of the fixed n_boxes x n_boxes grid used by bend_array/length_array."""
+    array_params = _load_json(JSON_DIR / array_json_name)
+    grid_cfg = array_params.get("array", {}).get("grid", {})
+    return float(grid_cfg.get("box_size", 500.0)) * int(grid_cfg.get("boxes", 5))
+
+
+def _gc_length(model_name):
+    """Approximate grating coupler length from grating_couplers.json, or None if unknown."""
+    try:
+        library = _load_json(JSON_DIR / "grating_couplers.json")
+    except (OSError, ValueError):
+        return None
+    model = library.get("models", {}).get(model_name or library.get("default_model"))
+    if model is None:
+        return None
+    if "period" in model:
+        return float(model["taper_length"]) + int(model["n_periods"]) * float(model["period"])
+    return float(model.get("taper_length", 0.0))
+
+
+def _count_range(start, stop, step):
+    return int(round((stop - start) / step)) + 1
+
+
+def _die_extent(size, grid_size):
+    """Round a content extent up the same way add_die_box_with_grid does."""
+    return (math.ceil(size / grid_size) + 1) * grid_size
+
+
+def _width_pitch_footprint():
+    """Estimate the width_pitch die box as (xmin, ymin, xmax, ymax) around the die origin."""
+    params = _load_json(JSON_DIR / "width_pitch.json")
+    wg = params["waveguide_with_grating_couplers"]
+    cascades = params["p_cascades"]
+    grid_size = float(params["die_box"]["grid_size"])
+
+    gc_length = _gc_length(wg.get("grating_coupler_model"))
+    if gc_length is None:
+        return None
+
+    n_widths = _count_range(cascades["wg_width_start"], cascades["wg_width_stop"], cascades["wg_width_step"])
+    n_periods = _count_range(cascades["period_start"], cascades["period_stop"], cascades["period_step"])
+    device_length = wg["wg_length"] + 2 * wg["taper_length"] + 2 * gc_length
+    content_width = device_length + (n_widths - 1) * cascades["x_offset"]
+    content_height = (n_widths - 1) * cascades["y_spacing"] + (n_periods - 1) * cascades["cascade_spacing"]
+
+    die_width = _die_extent(content_width, grid_size)
+    die_height = _die_extent(content_height, grid_size)
+    # add_die_box_with_grid snaps the die to the grid and shifts it 50 um right.
+    xmin = -round(die_width / 2 / grid_size) * grid_size + 50.0
+    ymin = -round(die_height / 2 / grid_size) * grid_size
+    return (xmin, ymin, xmin + die_width, ymin + die_height)
+
+
+def _centered_footprint(size):
+    return (-size[0] / 2, -size[1] / 2, size[0] / 2, size[1] / 2)
+
+
+def _placement_die(entry, index):
+    """Footprint for a placement.json entry (dies are centered on their position)."""
+    py_path = entry["py_path"].replace("\\", "/")
+    if py_path.startswith("Python codes/"):
+        py_path = py_path[len("Python codes/"):]
+    resolved = SCRIPT_DIR / (py_path if py_path.endswith(".py") else py_path + ".py")
+    name = f"Die {entry.get('die_number', index + 1)}"
+    x, y = entry["position"]
+
+    estimated = True
+    if "size" in entry:
+        local = _centered_footprint(entry["size"])
+        estimated = False
+    elif resolved.stem == "width_pitch":
+        local = _width_pitch_footprint() or _centered_footprint((DEFAULT_DIE_SIZE, DEFAULT_DIE_SIZE))
+    else:
+        local = _centered_footprint((DEFAULT_DIE_SIZE, DEFAULT_DIE_SIZE))
+
+    return {
+        "name": name,
+        "source": resolved.name,
+        "exists": resolved.exists(),
+        "bbox": (x + local[0], y + local[1], x + local[2], y + local[3]),
+        "estimated": estimated,
+    }
+
+
+def _temporary_placement_die(entry, index):
+    """Footprint for a temporary_placement.json entry (top-left corner at x, y)."""
+    component_file = entry["component_file"]
+    if "size" in entry:
+        size = float(entry["size"][0]), float(entry["size"][1])
+    elif component_file.startswith("bend"):
+        side = _fixed_grid_size("bend_array.json")
+        size = (side, side)
+    elif component_file.startswith("length"):
+        side = _fixed_grid_size("length_array.json")
+        size = (side, side)
+    else:
+        raise ValueError(f"Unknown component file: {component_file}")
+
+    x, y = float(entry["x"]), float(entry["y"])
+    width_nm = int(round(float(entry["width"]) * 1000))
+    model = entry.get("grating_coupler_model") or "default"
+    return {
+        "name": f"#{index} {Path(component_file).stem}_w{width_nm}_{model}",
+        "source": component_file,
+        "exists": (SCRIPT_DIR / component_file).exists(),
+        "bbox": (x, y - size[1], x + size[0], y),
+        "estimated": False,
+    }
+
+
+def collect_dies(placement_config):
+    """Return one footprint dict per placement entry."""
+    dies = []
+    for index, entry in enumerate(placement_config.get("placements", [])):
+        if "component_file" in entry:
+            dies.append(_temporary_placement_die(entry, index))
+        else:
+            dies.append(_placement_die(entry, index))
+    return dies
+
+
+def find_overlaps(boxes):
+    """Return index pairs of boxes whose interiors intersect.
+
+    Sort-and-sweep over x: boxes are visited in xmin order and only compared
+    against the active set whose x-interval is still open, so the cost is
+    O(n log n + k) instead of checking every pair.
+    """
+    order = sorted(range(len(boxes)), key=lambda i: boxes[i][0])
+    active = []
+    pairs = []
+    for i in order:
+        xmin, ymin, xmax, ymax = boxes[i]
+        active = [j for j in active if boxes[j][2] > xmin]
+        for j in active:
+            if boxes[j][1] < ymax and ymin < boxes[j][3]:
+                pairs.append((min(i, j), max(i, j)))
+        active.append(i)
+    return sorted(pairs)
+
+
+def _intersection(a, b):
+    return (max(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), min(a[3], b[3]))
+
+
+def check_placement(placement_config, grid_config=None):
+    """Check die overlaps, chip-boundary crossings and keep-out zones.
+
+    Keep-out zones are optional and read from ``placement_config["keep_out_zones"]``
+    as a list of ``{"name": ..., "bbox": [xmin, ymin, xmax, ymax]}`` entries.
+    """
+    start = time.perf_counter()
+    dies = collect_dies(placement_config)
+    boxes = [die["bbox"] for die in dies]
+
+    overlaps = [
+        {"a": dies[i]["name"], "b": dies[j]["name"], "region": _intersection(boxes[i], boxes[j])}
+        for i, j in find_overlaps(boxes)
+    ]
+
+    out_of_bounds = []
+    if grid_config is not None:
+        chip_w, chip_h = grid_config.get("chip_size", (10000, 10000))
+        chip = (-chip_w / 2, -chip_h / 2, chip_w / 2, chip_h / 2)
+        for die in dies:
+            xmin, ymin, xmax, ymax = die["bbox"]
+            if xmin < chip[0] or ymin < chip[1] or xmax > chip[2] or ymax > chip[3]:
+                out_of_bounds.append({"die": die["name"], "bbox": die["bbox"], "chip": chip})
+
+    keep_out = []
+    zones = placement_config.get("keep_out_zones", [])
+    if zones:
+        zone_boxes = [tuple(zone["bbox"]) for zone in zones]
+        combined = boxes + zone_boxes
+        for i, j in find_overlaps(combined):
+            if i < len(boxes) <= j:
+                keep_out.append({
+                    "die": dies[i]["name"],
+                    "zone": zones[j - len(boxes)].get("name", f"zone {j - len(boxes)}"),
+                    "region": _intersection(combined[i], combined[j]),
+                })
+
+    missing = [die["name"] + f" ({die['source']})" for die in dies if not die["exists"]]
+
+    return {
+        "dies": dies,
+        "overlaps": overlaps,
+        "out_of_bounds": out_of_bounds,
+        "keep_out": keep_out,
+        "missing": missing,
+        "elapsed_ms": (time.perf_counter() - start) * 1000.0,
+    }
+
+
+def has_conflicts(report):
+    return bool(report["overlaps"] or report["out_of_bounds"] or report["keep_out"] or report["missing"])
+
+
+def print_report(report):
+    """Print a human-readable summary of a check_placement report."""
+    n_estimated = sum(1 for die in report["dies"] if die["estimated"])
+    print(f"\nChecked {len(report['dies'])} dies in {report['elapsed_ms']:.2f} ms", end="")
+    print(f" ({n_estimated} footprints estimated)" if n_estimated else "")
+
+    for item in report["missing"]:
+        print(f"  MISSING   {item}: generator file not found")
+    for item in report["overlaps"]:
+        r = item["region"]
+        print(f"  OVERLAP   {item['a']} <-> {item['b']} in [{r[0]:.1f}, {r[1]:.1f}, {r[2]:.1f}, {r[3]:.1f}]")
+    for item in report["out_of_bounds"]:
+        b = item["bbox"]
+        print(f"  BOUNDARY  {item['die']} [{b[0]:.1f}, {b[1]:.1f}, {b[2]:.1f}, {b[3]:.1f}] crosses the chip boundary")
+    for item in report["keep_out"]:
+        r = item["region"]
+        print(f"  KEEP-OUT  {item['die']} enters '{item['zone']}' in [{r[0]:.1f}, {r[1]:.1f}, {r[2]:.1f}, {r[3]:.1f}]")
+
+    if not has_conflicts(report):
+        print("  No conflicts found")
+
+
+def check_placement_file(placement_path, grid_path=None):
+    """Load a placement JSON (and Grid.json) and return the check report."""
+    placement_config = _load_json(placement_path)
+    grid_path = Path(grid_path) if grid_path is not None else JSON_DIR / "Grid.json"
+    grid_config = _load_json(grid_path) if grid_path.exists() else None
+    return check_placement(placement_config, grid_config)
+
+
+def run_check(placement_path, grid_path=None):
+    """Check a placement file, print the report and return a process exit code."""
+    report = check_placement_file(placement_path, grid_path)
+    print_report(report)
+    return 1 if has_conflicts(report) else 0
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:] or [str(JSON_DIR / "placement.json"), str(JSON_DIR / "temporary_placement.json")]
+    exit_code = 0
+    for path in paths:
+        print(f"Placement file: {path}")
+        exit_code |= run_check(path)
+    sys.exit(exit_code)
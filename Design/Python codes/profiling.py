@@ -0,0 +1,185 @@
+"""Opt-in cProfile + tracemalloc profiling for any generator script.
+
+Wrap a script without editing it (arguments after the script are passed on):
+
+    python "Python codes/profiling.py" [--top N] [--output DIR] [--no-memory] Depot/python/Die.py
+    python "Python codes/profiling.py" "Python codes/placement.py" --stats
+
+or set PIC_PROFILE=1 for scripts whose entry point goes through run_profiled()
+(placement.py, dosetest.py, temporary_placement.py). Each run writes to
+build/profile/:
+
+    <name>.pstats     cProfile statistics (snakeviz, pstats, gprof2dot)
+    <name>.collapsed  "frame;frame;frame microseconds" stacks, the format read by
+                      flamegraph.pl, speedscope and inferno (same as py-spy --format raw)
+    <name>.alloc.txt  peak traced memory and the top-N allocation sites
+"""
+import cProfile
+import os
+import pstats
+import runpy
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROFILE_ENV = "PIC_PROFILE"
+DEFAULT_TOP_N = 25
+# Collapsed-stack resolution: deeper or shorter paths are folded into their parent.
+MAX_STACK_DEPTH = 80
+MIN_STACK_US = 500
+
+
+def profiling_enabled():
+    """True when PIC_PROFILE is set to anything but an empty string or 0."""
+    return os.environ.get(PROFILE_ENV, "") not in ("", "0")
+
+
+def _profile_dir():
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "Setup").exists():
+            return parent / "Setup" / "build" / "profile"
+    return Path(__file__).resolve().parents[1] / "build" / "profile"
+
+
+def _frame_label(func):
+    filename, line, name = func
+    if filename == "~":
+        return name.strip("<>").replace(" ", "_")
+    return f"{name} ({Path(filename).name}:{line})"
+
+
+def collapsed_stacks(stats):
+    """Convert pstats data to collapsed stacks with self time in microseconds.
+
+    cProfile keeps caller -> callee edges, not full stacks, so a callee's time
+    is split over its call paths in proportion to the cumulative time each
+    caller spent in it (the same approximation flameprof makes). Paths below
+    MIN_STACK_US, beyond MAX_STACK_DEPTH or re-entering a frame already on the
+    stack are folded into their parent, so the stacks still sum to the total.
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, (_, _, _, edge_cumulative) in callers.items():
+            callees.setdefault(caller, []).append((func, edge_cumulative))
+    roots = [func for func, entry in stats.stats.items() if not entry[4]]
+
+    lines = {}
+
+    def visit(func, fraction, stack, on_stack):
+        _, _, self_time, cumulative, _ = stats.stats[func]
+        stack = stack + [_frame_label(func)]
+        on_stack = on_stack | {func}
+        micros = self_time * fraction * 1e6
+        children = callees.get(func, ())
+        # Recursive edges repeat nested time, so children may claim more than
+        # the frame's own cumulative time; scale them back to that budget.
+        budget = max(cumulative - self_time, 0.0) * fraction * 1e6
+        claimed = sum(edge_cumulative for _, edge_cumulative in children) * fraction * 1e6
+        scale = budget / claimed if claimed > budget else 1.0
+        for callee, edge_cumulative in children:
+            callee_micros = edge_cumulative * fraction * 1e6 * scale
+            callee_cumulative = stats.stats[callee][3]
+            if (
+                callee in on_stack
+                or len(stack) >= MAX_STACK_DEPTH
+                or callee_micros < MIN_STACK_US
+                or callee_cumulative <= 0
+            ):
+                micros += callee_micros
+            else:
+                visit(callee, callee_micros / 1e6 / callee_cumulative, stack, on_stack)
+        key = ";".join(stack)
+        lines[key] = lines.get(key, 0) + micros
+
+    for root in roots:
+        visit(root, 1.0, [], frozenset())
+    return [f"{stack} {round(micros)}" for stack, micros in lines.items() if round(micros) > 0]
+
+
+def _write_outputs(name, profiler, snapshot, peak, top_n, output_dir):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    pstats_path = output_dir / f"{name}.pstats"
+    profiler.dump_stats(pstats_path)
+    stats = pstats.Stats(str(pstats_path))
+    with open(output_dir / f"{name}.collapsed", "w") as f:
+        f.write("\n".join(collapsed_stacks(stats)) + "\n")
+
+    print(f"\n--- Profile: {name} (top {top_n} by cumulative time) ---")
+    stats.sort_stats("cumulative").print_stats(top_n)
+
+    if snapshot is not None:
+        allocations = snapshot.statistics("lineno")
+        with open(output_dir / f"{name}.alloc.txt", "w") as f:
+            f.write(f"Peak traced memory: {peak / 2**20:.1f} MiB\n")
+            f.write(f"Top {top_n} allocation sites still held at exit:\n")
+            for stat in allocations[:top_n]:
+                f.write(f"{stat.size / 2**20:9.2f} MiB {stat.count:9d} blocks  {stat.traceback}\n")
+        print(f"Peak traced memory: {peak / 2**20:.1f} MiB")
+    print(f"Profile written to {output_dir / name}.*")
+
+
+def profile_call(func, *args, name=None, top_n=DEFAULT_TOP_N, memory=True, output_dir=None, **kwargs):
+    """Run func(*args, **kwargs) under cProfile (and tracemalloc) and write the reports.
+
+    Reports are written even when func exits through sys.exit or an exception.
+    Returns func's result.
+    """
+    name = name or getattr(func, "__name__", "profile")
+    output_dir = Path(output_dir) if output_dir else _profile_dir()
+    if memory:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        snapshot = peak = None
+        if memory:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        print(f"\n{name} ran for {elapsed:.2f} s")
+        _write_outputs(name, profiler, snapshot, peak, top_n, output_dir)
+
+
+def run_profiled(func, *args, name=None, **kwargs):
+    """Call an entry point, profiled when PIC_PROFILE is set; a plain call otherwise."""
+    if not profiling_enabled():
+        return func(*args, **kwargs)
+    return profile_call(func, *args, name=name, **kwargs)
+
+
+def profile_script(script, script_args=(), top_n=DEFAULT_TOP_N, memory=True, output_dir=None):
+    """Run a script as __main__ under the profiler, as `python script args` would."""
+    script = Path(script).resolve()
+    if not script.exists():
+        raise FileNotFoundError(f"Script not found: {script}")
+    sys.argv = [str(script), *script_args]
+    sys.path.insert(0, str(script.parent))
+    return profile_call(
+        runpy.run_path, str(script), run_name="__main__",
+        name=script.stem, top_n=top_n, memory=memory, output_dir=output_dir,
+    )
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Profile a generator script with cProfile and tracemalloc.")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_N, help="entries in the printed and allocation summaries")
+    parser.add_argument("--output", help="report directory (default build/profile)")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc, which slows allocation-heavy code")
+    parser.add_argument("script", help="script to run as __main__")
+    parser.add_argument("script_args", nargs=argparse.REMAINDER, help="arguments passed to the script")
+    args = parser.parse_args(argv)
+    try:
+        profile_script(args.script, args.script_args, top_n=args.top, memory=not args.no_memory, output_dir=args.output)
+    except SystemExit as e:
+        return e.code
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""Per-layer polygon merging for export.
+
+Grid lines crossing at every node, boundary bars meeting at the corners and
+abutting marker boxes are drawn as separate, overlapping shapes. Merging them
+per layer before writing gives e-beam fracturing and DRC fewer, cleaner
+polygons. Two modes:
+
+    "cell"  merge the shapes of each cell on its own; hierarchy is kept, so
+            overlaps between different cells or array instances remain.
+    "flat"  flatten the tree and merge each layer over the whole chip with
+            KLayout's TilingProcessor on several threads, so array instances
+            (the Grid lines) merge too.
+
+Merging happens on a copy (merged_layout), never on the live component, so
+cached cells shared with other builds are untouched.
+"""
+import os
+
+import klayout.db as kdb
+
+MERGE_MODES = ("cell", "flat")
+
+# Tile edge in um for flat merging; a 20 mm chip is split into 400 tiles.
+DEFAULT_TILE_SIZE = 1000.0
+
+_GEOMETRY = kdb.Shapes.SPolygons | kdb.Shapes.SBoxes | kdb.Shapes.SPaths
+
+
+def _seams(bbox, origin_x, origin_y, tile):
+    """Thin boxes along the internal tile boundaries inside ``bbox`` (all in dbu)."""
+    seams = kdb.Region()
+    x = origin_x + tile
+    while x < bbox.right:
+        seams.insert(kdb.Box(x - 1, bbox.bottom, x + 1, bbox.top))
+        x += tile
+    y = origin_y + tile
+    while y < bbox.top:
+        seams.insert(kdb.Box(bbox.left, y - 1, bbox.right, y + 1))
+        y += tile
+    return seams
+
+
+def tiled_merge(source, dbu, tile_size=DEFAULT_TILE_SIZE, threads=None):
+    """Merge ``source`` (a kdb.Region or RecursiveShapeIterator) tile by tile on ``threads`` threads.
+
+    Tiles are merged in parallel and clipped to the tile; only the pieces
+    touching a tile seam are merged again, so the result equals
+    region.merged(). Regions that fit in one tile are merged directly.
+    """
+    region = source if isinstance(source, kdb.Region) else kdb.Region(source)
+    bbox = region.bbox()
+    if region.is_empty() or max(bbox.width(), bbox.height()) * dbu <= tile_size:
+        return region.merged()
+
+    output = kdb.Region()
+    tp = kdb.TilingProcessor()
+    tp.dbu = dbu
+    tp.tile_size(tile_size, tile_size)
+    tp.tile_origin(bbox.left * dbu, bbox.bottom * dbu)
+    tp.threads = threads or os.cpu_count() or 1
+    tp.input("a", region)
+    tp.output("o", output)
+    tp.queue("_output(o, a.merged)")
+    tp.execute("Merge polygons")
+
+    seams = _seams(bbox, bbox.left, bbox.bottom, int(round(tile_size / dbu)))
+    return output.not_interacting(seams) + output.interacting(seams).merged()
+
+
+def tiled_xor(a, b, dbu, tile_size=DEFAULT_TILE_SIZE, threads=None):
+    """Symmetric difference of two regions, computed tile by tile on ``threads`` threads.
+
+    The result is clipped per tile and merged, so a difference spanning a
+    seam is reported as one polygon.
+    """
+    bbox = a.bbox() + b.bbox()
+    if max(bbox.width(), bbox.height()) * dbu <= tile_size:
+        return a ^ b
+
+    output = kdb.Region()
+    tp = kdb.TilingProcessor()
+    tp.dbu = dbu
+    tp.tile_size(tile_size, tile_size)
+    tp.threads = threads or os.cpu_count() or 1
+    tp.input("a", a)
+    tp.input("b", b)
+    tp.output("o", output)
+    tp.queue("_output(o, a ^ b)")
+    tp.execute("XOR")
+    return output.merged()
+
+
+def xor_regions(a, b, dbu, tile_size=DEFAULT_TILE_SIZE, threads=None):
+    """Exact symmetric difference of two layer regions that are expected to be nearly equal.
+
+    Merging millions of flattened vertices dominates a plain XOR, so polygons
+    present identically in both regions are dropped first. The XOR of what is
+    left covers every real difference (it may over-report where a dropped
+    polygon overlapped a remaining one), so both inputs are then clipped to it
+    and XORed again to get the exact result.
+    """
+    raw_a, raw_b = a.dup(), b.dup()
+    raw_a.merged_semantics = False
+    raw_b.merged_semantics = False
+    only_a = raw_a.not_in(raw_b)
+    only_b = raw_b.not_in(raw_a)
+    if only_a.is_empty() and only_b.is_empty():
+        return kdb.Region()
+    only_a.merged_semantics = True
+    only_b.merged_semantics = True
+    suspects = tiled_xor(only_a, only_b, dbu, tile_size, threads)
+    if suspects.is_empty():
+        return suspects
+    near_a = raw_a.interacting(suspects)
+    near_b = raw_b.interacting(suspects)
+    near_a.merged_semantics = True
+    near_b.merged_semantics = True
+    return tiled_xor(near_a & suspects, near_b & suspects, dbu, tile_size, threads)
+
+
+def _replace_geometry(shapes, merged):
+    shapes.clear(_GEOMETRY)
+    shapes.insert(merged)
+
+
+def merge_cell_layers(top, layers=None, mode="cell", tile_size=DEFAULT_TILE_SIZE, threads=None):
+    """Merge polygons per layer in the tree under ``top`` (a kdb.Cell), in place.
+
+    layers limits merging to the given (layer, datatype) pairs. Returns
+    {"layer/datatype": (polygons_before, polygons_after)} for the merged layers.
+    """
+    if mode not in MERGE_MODES:
+        raise ValueError(f"Unknown merge mode '{mode}'. Use one of: {', '.join(MERGE_MODES)}")
+    layout = top.layout()
+    wanted = None if layers is None else {tuple(layer) for layer in layers}
+    layer_indexes = [
+        li for li in layout.layer_indexes()
+        if wanted is None or (layout.get_info(li).layer, layout.get_info(li).datatype) in wanted
+    ]
+
+    counts = {}
+    if mode == "flat":
+        merged = {}
+        for li in layer_indexes:
+            source = top.begin_shapes_rec(li)
+            source.shape_flags = _GEOMETRY
+            before = kdb.Region(source).count()
+            if before:
+                merged[li] = (before, tiled_merge(top.begin_shapes_rec(li), layout.dbu, tile_size, threads))
+        # Flattening keeps texts; the merged geometry then replaces the flat polygons
+        top.flatten(True)
+        for li, (before, region) in merged.items():
+            _replace_geometry(top.shapes(li), region)
+            info = layout.get_info(li)
+            counts[f"{info.layer}/{info.datatype}"] = (before, region.count())
+        return counts
+
+    for cell_index in [top.cell_index(), *top.called_cells()]:
+        cell = layout.cell(cell_index)
+        for li in layer_indexes:
+            shapes = cell.shapes(li)
+            # Region(shapes) takes polygons, boxes and paths; texts are left alone
+            region = kdb.Region(shapes)
+            before = region.count()
+            if before < 2:
+                continue
+            region = tiled_merge(region, layout.dbu, tile_size, threads)
+            # Only rewrite cells the merge actually simplified
+            if region.count() < before:
+                _replace_geometry(shapes, region)
+            info = layout.get_info(li)
+            key = f"{info.layer}/{info.datatype}"
+            total_before, total_after = counts.get(key, (0, 0))
+            counts[key] = (total_before + before, total_after + min(region.count(), before))
+    return counts
+
+
+def merged_layout(component, layers=None, mode="cell", tile_size=DEFAULT_TILE_SIZE, threads=None):
+    """Copy ``component``'s cell tree into a new kdb.Layout and merge it per layer.
+
+    Returns (layout, top_cell, counts) with counts as from merge_cell_layers.
+    """
+    source = component.kdb_cell if hasattr(component, "kdb_cell") else component
+    layout = kdb.Layout()
+    layout.dbu = source.layout().dbu
+    top = layout.create_cell(source.name)
+    top.copy_tree(source)
+    counts = merge_cell_layers(top, layers, mode, tile_size, threads)
+    return layout, top, counts
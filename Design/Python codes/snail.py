@@ -2,6 +2,12 @@ import numpy as np
 import gdsfactory as gf
 from pathlib import Path
 import kfactory.conf as kf_conf
+import multiprocessing
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import klayout.db as kdb
 
 # Route gdsfactory build artifacts to Setup/build.
 for _parent in Path(__file__).resolve().parents:
@@ -10,6 +16,9 @@ for _parent in Path(__file__).resolve().parents:
         kf_conf.config.__dict__["project_dir"] = _setup_dir
         break
 from grating_couplers import create_grating_coupler
+import path_sampling
+from path_fracture import extrude_fractured, MAX_VERTICES
+from output_format import write_layout
 
 # gdsfactory 9.x requires an active PDK before geometry/layer creation.
 try:
@@ -36,6 +45,10 @@ ebm_field_size = 200
 waveguide_width = 0.556
 total_waveguide_length = 10000
 grating_coupler_model = "GC_1550_TE"
+point_tolerance_nm = None
+
+# Total lengths built by `python snail.py --family`
+family_lengths = [6000, 10000, 15000, 20000]
 
 # Create a spiral waveguide component with grating couplers
 def create_spiral_with_couplers(
@@ -46,7 +59,10 @@ def create_spiral_with_couplers(
     waveguide_width=0.556,
     total_waveguide_length=10000,
     grating_coupler_model="GC_1550_TE",
-    layer=(1, 0)
+    layer=(1, 0),
+    point_tolerance_nm=None,
+    max_polygon_vertices=MAX_VERTICES,
+    name=None
 ) -> gf.Component:
     """
     Create a spiral waveguide component with grating couplers.
@@ -59,6 +75,9 @@ def create_spiral_with_couplers(
         waveguide_width (float): Width of the waveguide (default: 0.556)
         total_waveguide_length (float): Total length of the waveguide (default: 10000)
         layer (tuple): Layer specification (default: (1, 0))
+        point_tolerance_nm (float): Max chord error of the bends in nm; None keeps gdsfactory's default point density
+        max_polygon_vertices (int): Waveguide outlines above this many vertices are split at straight/bend boundaries
+        name (str): Cell name; defaults to spiral_element_r{r}_w{w}
         
     Returns:
         Component: A gdsfactory component containing the spiral with grating couplers
@@ -72,17 +91,24 @@ def create_spiral_with_couplers(
     w = waveguide_width
     
     # Create the component first so we can add ports
-    c = gf.Component(f"spiral_element_r{r:.1f}_w{w:.3f}")
+    c = gf.Component(name or f"spiral_element_r{r:.1f}_w{w:.3f}")
     
     # Distance and displacement equations
     s = 0.1 * f
     m = 0.09 * f
     a = f - g
-    n = ((k - d - s - 10 * (np.pi) * r + (2 * g) - 40 * m) / (8 * s)) + 37 / 8
-    b = d - (a + s + ((n + 3) * s) + 2 * g)
+    solution = solve_spiral_lengths(k, d, g, r, f)
+    n = float(solution["n"][0])
+    b = float(solution["b"][0])
     
     # Define the cross-section for extrusion
     cs = gf.cross_section.strip(width=w, layer=layer)
+
+    # Bend factory: default gdsfactory sampling, or just enough points for the chord tolerance
+    if point_tolerance_nm is None:
+        arc = lambda angle: gf.path.arc(radius=r, angle=angle)
+    else:
+        arc = lambda angle: path_sampling.arc(r, angle, point_tolerance_nm)
     
     P = gf.Path()
     
@@ -96,44 +122,44 @@ def create_spiral_with_couplers(
     P += gf.path.straight(length=a)
     P += gf.path.straight(length=s)    
     P += gf.path.straight(length=n*s)  
-    P += gf.path.arc(radius=r, angle=-90) 
+    P += arc(-90) 
     P += gf.path.straight(length=7*m)  
-    P += gf.path.arc(radius=r, angle=-90) 
+    P += arc(-90) 
     P += gf.path.straight(length=(n-2)*s)  
-    P += gf.path.arc(radius=r, angle=-90)
+    P += arc(-90)
     P += gf.path.straight(length=5*m)  
-    P += gf.path.arc(radius=r, angle=-90) 
+    P += arc(-90) 
     P += gf.path.straight(length=(n-4)*s)  
-    P += gf.path.arc(radius=r, angle=-90) 
+    P += arc(-90) 
     P += gf.path.straight(length=3*m)  
-    P += gf.path.arc(radius=r, angle=-90) 
+    P += arc(-90) 
     P += gf.path.straight(length=(n-6)*s)  
-    P += gf.path.arc(radius=r, angle=-90)
+    P += arc(-90)
     P += gf.path.straight(length=m)  
-    P += gf.path.arc(radius=r, angle=-90) 
+    P += arc(-90) 
     P += gf.path.straight(length=2*s)  
-    P += gf.path.arc(radius=r, angle=-90)
-    P += gf.path.arc(radius=r, angle=90)
+    P += arc(-90)
+    P += arc(90)
     P += gf.path.straight(length=(n-11)*s) 
-    P += gf.path.arc(radius=r, angle=90)
+    P += arc(90)
     P += gf.path.straight(length=m)  
-    P += gf.path.arc(radius=r, angle=90)
+    P += arc(90)
     P += gf.path.straight(length=(n-6)*s)
-    P += gf.path.arc(radius=r, angle=90)
+    P += arc(90)
     P += gf.path.straight(length=3*m)  
-    P += gf.path.arc(radius=r, angle=90)
+    P += arc(90)
     P += gf.path.straight(length=(n-4)*s)
-    P += gf.path.arc(radius=r, angle=90)
+    P += arc(90)
     P += gf.path.straight(length=5*m)  
-    P += gf.path.arc(radius=r, angle=90) 
+    P += arc(90) 
     P += gf.path.straight(length=(n-2)*s)
-    P += gf.path.arc(radius=r, angle=90)
+    P += arc(90)
     P += gf.path.straight(length=7*m)  
-    P += gf.path.arc(radius=r, angle=90)  
+    P += arc(90)  
     P += gf.path.straight(length=(n)*s)
-    P += gf.path.arc(radius=r, angle=90)
+    P += arc(90)
     P += gf.path.straight(length=8*m)  
-    P += gf.path.arc(radius=r, angle=-90)
+    P += arc(-90)
     P += gf.path.straight(length=b)
     
     # Get the final position of the path
@@ -144,7 +170,8 @@ def create_spiral_with_couplers(
     c.add_port(name="o2", center=end_point, width=w, orientation=0, layer=layer)
     
     # Extrude the path with the defined cross-section
-    wg = gf.path.extrude(P, cross_section=cs)
+    # Long spirals are split into straight/bend polygons below the GDSII vertex limit
+    wg = extrude_fractured(P, cs, max_polygon_vertices)
     
     # Add the extruded waveguide to the component
     wg_ref = c << wg
@@ -181,148 +208,118 @@ def create_spiral_with_couplers(
     
     return c
 
-def create_spiral_with_couplers(
+def solve_spiral_lengths(
+    lengths,
     distance_bw_couplers=3300,
     length_of_the_coupler=165,
     bend_radius=20,
     ebm_field_size=200,
-    waveguide_width=0.556,
-    total_waveguide_length=10000,
-    grating_coupler_model="GC_1550_TE",
-    layer=(1, 0)
-) -> gf.Component:
-    """
-    Create a spiral waveguide component with grating couplers.
-    
-    Args:
-        distance_bw_couplers (float): Distance between couplers (default: 3300)
-        length_of_the_coupler (float): Length of the coupler (default: 165)
-        bend_radius (float): Bend radius (default: 20)
-        ebm_field_size (float): EBM field size (default: 200)
-        waveguide_width (float): Width of the waveguide (default: 0.556)
-        total_waveguide_length (float): Total length of the waveguide (default: 10000)
-        layer (tuple): Layer specification (default: (1, 0))
-        
-    Returns:
-        Component: A gdsfactory component containing the spiral with grating couplers
+):
+    """Solve the spiral's straight count n and exit straight b for each total length.
+
+    Returns a dict of arrays (length, n, b) plus a boolean "feasible" mask. A
+    length is infeasible when the innermost (n - 11) * s straight or the exit
+    straight b would come out negative.
     """
-    # Parameter calculations
-    r = bend_radius
-    d = distance_bw_couplers
-    g = length_of_the_coupler
-    f = ebm_field_size
-    k = total_waveguide_length
-    w = waveguide_width
-    
-    # Create the component first so we can add ports
-    c = gf.Component(f"spiral_element_r{r:.1f}_w{w:.3f}")
-    
-    # Distance and displacement equations
+    k = np.atleast_1d(np.asarray(lengths, dtype=float))
+    d, g, r, f = distance_bw_couplers, length_of_the_coupler, bend_radius, ebm_field_size
     s = 0.1 * f
     m = 0.09 * f
     a = f - g
     n = ((k - d - s - 10 * (np.pi) * r + (2 * g) - 40 * m) / (8 * s)) + 37 / 8
     b = d - (a + s + ((n + 3) * s) + 2 * g)
-    
-    # Define the cross-section for extrusion
-    cs = gf.cross_section.strip(width=w, layer=layer)
-    
-    P = gf.Path()
-    
-    # Define the starting position for the path
-    start_point = (-(a+10*s), 6*m)
-    
-    # Initialize the path at the start point
-    P = gf.path.straight(length=0.01)  # Create minimal path to start
-    P.move(origin=(0,0), destination=start_point)
-    
-    P += gf.path.straight(length=a)
-    P += gf.path.straight(length=s)    
-    P += gf.path.straight(length=n*s)  
-    P += gf.path.arc(radius=r, angle=-90) 
-    P += gf.path.straight(length=7*m)  
-    P += gf.path.arc(radius=r, angle=-90) 
-    P += gf.path.straight(length=(n-2)*s)  
-    P += gf.path.arc(radius=r, angle=-90)
-    P += gf.path.straight(length=5*m)  
-    P += gf.path.arc(radius=r, angle=-90) 
-    P += gf.path.straight(length=(n-4)*s)  
-    P += gf.path.arc(radius=r, angle=-90) 
-    P += gf.path.straight(length=3*m)  
-    P += gf.path.arc(radius=r, angle=-90) 
-    P += gf.path.straight(length=(n-6)*s)  
-    P += gf.path.arc(radius=r, angle=-90)
-    P += gf.path.straight(length=m)  
-    P += gf.path.arc(radius=r, angle=-90) 
-    P += gf.path.straight(length=2*s)  
-    P += gf.path.arc(radius=r, angle=-90)
-    P += gf.path.arc(radius=r, angle=90)
-    P += gf.path.straight(length=(n-11)*s) 
-    P += gf.path.arc(radius=r, angle=90)
-    P += gf.path.straight(length=m)  
-    P += gf.path.arc(radius=r, angle=90)
-    P += gf.path.straight(length=(n-6)*s)
-    P += gf.path.arc(radius=r, angle=90)
-    P += gf.path.straight(length=3*m)  
-    P += gf.path.arc(radius=r, angle=90)
-    P += gf.path.straight(length=(n-4)*s)
-    P += gf.path.arc(radius=r, angle=90)
-    P += gf.path.straight(length=5*m)  
-    P += gf.path.arc(radius=r, angle=90) 
-    P += gf.path.straight(length=(n-2)*s)
-    P += gf.path.arc(radius=r, angle=90)
-    P += gf.path.straight(length=7*m)  
-    P += gf.path.arc(radius=r, angle=90)  
-    P += gf.path.straight(length=(n)*s)
-    P += gf.path.arc(radius=r, angle=90)
-    P += gf.path.straight(length=8*m)  
-    P += gf.path.arc(radius=r, angle=-90)
-    P += gf.path.straight(length=b)
-    
-    # Get the final position of the path
-    end_point = P.points[-1]
-    
-    # Add ports to the component
-    c.add_port(name="o1", center=start_point, width=w, orientation=180, layer=layer)
-    c.add_port(name="o2", center=end_point, width=w, orientation=0, layer=layer)
-    
-    # Extrude the path with the defined cross-section
-    wg = gf.path.extrude(P, cross_section=cs)
-    
-    # Add the extruded waveguide to the component
-    wg_ref = c << wg
-    
-    # Add grating couplers to the component
+    return {"length": k, "n": n, "b": b, "feasible": (n >= 11) & (b >= 0)}
+
+
+def _build_dir():
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "Setup").exists():
+            return parent / "Setup" / "build" / "gds"
+    return Path(__file__).resolve().parents[1] / "build" / "gds"
+
+
+def _write_spiral_gds(job):
+    """Worker: build one spiral and write it to its own GDS file.
+
+    Every cell except the grating coupler's is prefixed with the spiral name, so
+    the per-worker files can be merged without name clashes while the coupler
+    cells, which are identical in every file, merge into one.
+    """
+    kwargs, gds_path = job
+    c = create_spiral_with_couplers(**kwargs)
+    c.write_gds(gds_path)
+
+    keep = set()
     try:
-        gc = create_grating_coupler(grating_coupler_model, layer=layer)
-        
-        # Input grating coupler (left/west)
-        gc_in = c << gc
-        gc_in.rotate(180)  # Rotate to face left (input side)
-        gc_in.move(origin=gc_in.ports["o1"].center, destination=start_point)
-        
-        # Output grating coupler (right/east)
-        gc_out = c << gc
-        gc_out.move(origin=gc_out.ports["o1"].center, destination=end_point)
-        
-        # Add references to the grating couplers in the component
-        c.add_ref(gc_in, name="gc_in")
-        c.add_ref(gc_out, name="gc_out")
-        
-        # Add new ports at the grating coupler fiber interfaces
-        if "o2" in gc_in.ports:
-            c.add_port("optical_in", port=gc_in.ports["o2"])
-        
-        if "o2" in gc_out.ports:
-            c.add_port("optical_out", port=gc_out.ports["o2"])
-            
-        c.info["has_grating_couplers"] = True
-        print("Added grating couplers successfully")
-    except Exception as e:
-        print(f"Warning: Could not add grating couplers: {e}")
-        c.info["has_grating_couplers"] = False
-    
-    return c
+        gc = create_grating_coupler(kwargs.get("grating_coupler_model"), layer=kwargs.get("layer", (1, 0)))
+        keep.add(gc.name)
+        keep.update(gc.kcl.layout.cell(ci).name for ci in gc.kdb_cell.called_cells())
+    except Exception:
+        pass
+
+    layout = kdb.Layout()
+    layout.read(str(gds_path))
+    for cell in layout.each_cell():
+        if cell.name not in keep and not cell.name.startswith(c.name):
+            cell.name = f"{c.name}_{cell.name}"
+    layout.write(str(gds_path))
+    return c.name
+
+
+def create_spiral_family(
+    lengths,
+    widths=None,
+    output=None,
+    max_workers=None,
+    **spiral_kwargs,
+):
+    """Build one spiral per (length, width) in worker processes and write them to one GDS library.
+
+    n and b are solved for all lengths first and a ValueError is raised before
+    any geometry is built if a length is infeasible. spiral_kwargs are passed to
+    create_spiral_with_couplers. Returns the path of the written library.
+    """
+    widths = [waveguide_width] if widths is None else list(widths)
+    solution = solve_spiral_lengths(
+        lengths,
+        spiral_kwargs.get("distance_bw_couplers", 3300),
+        spiral_kwargs.get("length_of_the_coupler", 165),
+        spiral_kwargs.get("bend_radius", 20),
+        spiral_kwargs.get("ebm_field_size", 200),
+    )
+    if not solution["feasible"].all():
+        bad = [float(k) for k in solution["length"][~solution["feasible"]]]
+        raise ValueError(f"Spiral lengths infeasible (n < 11 or negative exit straight) for {bad}")
+
+    output = Path(output) if output else _build_dir() / "spiral_family.gds"
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = []
+        for k in solution["length"]:
+            for w in widths:
+                name = f"spiral_L{int(round(k))}_w{int(round(w * 1000))}"
+                kwargs = dict(spiral_kwargs, total_waveguide_length=float(k), waveguide_width=w, name=name)
+                jobs.append((kwargs, Path(tmp) / f"{name}.gds"))
+
+        workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+        if workers == 1:
+            names = [_write_spiral_gds(job) for job in jobs]
+        else:
+            # spawn keeps workers independent of the parent's KLayout state
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                names = list(pool.map(_write_spiral_gds, jobs))
+
+        library = kdb.Layout()
+        options = kdb.LoadLayoutOptions()
+        options.cell_conflict_resolution = kdb.LoadLayoutOptions.CellConflictResolution.SkipNewCell
+        for _, gds_path in jobs:
+            library.read(str(gds_path), options)
+        output = write_layout(library, output)
+
+    print(f"Wrote {len(names)} spirals to {output}")
+    return output
+
 
 # Functions for placement system compatibility
 def get_component(width=None):
@@ -339,6 +336,7 @@ def get_component(width=None):
         waveguide_width=wg_width,
         total_waveguide_length=total_waveguide_length,
         grating_coupler_model=grating_coupler_model,
+        point_tolerance_nm=point_tolerance_nm,
     )
     
     # Create die name based on width
@@ -351,19 +349,23 @@ def p_cascades(width=None):
     """Alternative function name for placement system compatibility - returns (component, die_name)"""
     return get_component(width=width)
 
-# Create the spiral component with grating couplers for standalone use
-spiral = create_spiral_with_couplers(
-    distance_bw_couplers=distance_bw_couplers,
-    length_of_the_coupler=length_of_the_coupler,
-    bend_radius=bend_radius,
-    ebm_field_size=ebm_field_size,
-    waveguide_width=waveguide_width,
-    total_waveguide_length=total_waveguide_length,
-    grating_coupler_model=grating_coupler_model,
-)
-
 # Example usage
 if __name__ == "__main__":
+    if "--family" in sys.argv[1:]:
+        create_spiral_family(family_lengths, grating_coupler_model=grating_coupler_model)
+        sys.exit(0)
+
+    # Create the spiral component with grating couplers for standalone use
+    spiral = create_spiral_with_couplers(
+        distance_bw_couplers=distance_bw_couplers,
+        length_of_the_coupler=length_of_the_coupler,
+        bend_radius=bend_radius,
+        ebm_field_size=ebm_field_size,
+        waveguide_width=waveguide_width,
+        total_waveguide_length=total_waveguide_length,
+        grating_coupler_model=grating_coupler_model,
+    )
+
     # Display some information about the component
     print(f"Component name: {spiral.name}")
     
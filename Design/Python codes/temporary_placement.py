@@ -13,8 +13,6 @@ for _parent in Path(__file__).resolve().parents:
         kf_conf.config.__dict__["project_dir"] = _setup_dir
         break
 import json
-import importlib
-import importlib.util
 import re
 import sys
 from pathlib import Path
@@ -29,15 +27,11 @@ except Exception:
         from gdsfactory.generic_tech import get_generic_pdk
         get_generic_pdk().activate()
 
+from module_registry import load_module
+
 def load_component_from_py(py_path, func_name, **kwargs):
     """Dynamically load and call a component factory function from a Python file."""
-    module_name = Path(py_path).stem
-    if module_name in sys.modules:
-        mod = sys.modules[module_name]
-    else:
-        spec = importlib.util.spec_from_file_location(module_name, py_path)
-        mod = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(mod)
+    mod = load_module(py_path)
 
     if not hasattr(mod, func_name):
         raise ValueError(f"Function {func_name} not found in {py_path}")
@@ -150,9 +144,9 @@ def create_temporary_placement():
 
     # --- Load Grid ---
     sys.path.insert(0, str(script_dir))
-    from Grid import load_config_from_json, create_grid_component
+    from Grid import load_config_from_json, create_grid_component_cached
     grid_config = load_config_from_json(str(json_dir / "Grid.json"))
-    grid_comp = create_grid_component(grid_config)
+    grid_comp = create_grid_component_cached(grid_config)
     print("Created grid component\n")
 
     # --- Load placement configuration ---
@@ -208,8 +202,24 @@ def create_temporary_placement():
 
 
 if __name__ == "__main__":
-    comp = create_temporary_placement()
+    if "--check" in sys.argv[1:]:
+        # Validate die footprints before any geometry is built.
+        from placement_check import run_check
+        json_dir = Path(__file__).parent.parent / "Json"
+        sys.exit(run_check(json_dir / "temporary_placement.json", json_dir / "Grid.json"))
+
+    from profiling import run_profiled
+    comp = run_profiled(create_temporary_placement, name="temporary_placement")
+
+    if "--stats" in sys.argv[1:]:
+        from layout_stats import write_layout_stats
+        write_layout_stats(comp)
+
+    if "--drc" in sys.argv[1:]:
+        from drc_lite import write_drc_report
+        write_drc_report(comp)
 
-    comp.show()
+    from output_format import show_component
+    show_component(comp)
 
 
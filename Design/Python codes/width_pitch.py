@@ -11,6 +11,8 @@ for _parent in Path(__file__).resolve().parents:
 import json
 import os
 from grating_couplers import create_grating_coupler, get_gc_width
+from die_frame import die_frame, die_size_for
+from output_format import show_component
 
 # gdsfactory 9.x requires an active PDK before geometry/layer creation.
 try:
@@ -52,7 +54,8 @@ periods = generate_range(
     p_cascades_params["period_step"],
 )
 
-def waveguide_with_grating_couplers(name, wg_width, grating_period):
+def _add_device_body(c, wg_width):
+    """Add waveguide, tapers and grating couplers to c; return the (left, right) fiber ports."""
     wg_length = wg_params["wg_length"]
     taper_length = wg_params["taper_length"]
     gc_model = wg_params.get("grating_coupler_model", "GC_1550_TE")
@@ -66,7 +69,6 @@ def waveguide_with_grating_couplers(name, wg_width, grating_period):
         layer=tuple(layers["waveguide"]),
     )
     wg = gf.components.straight(length=wg_length, cross_section=wg_xs)
-    c = gf.Component(name=f"w{int(wg_width*1000)}p{int(grating_period*1000)}")
     wg_ref = c.add_ref(wg)
     taper1_ref = c.add_ref(taper)
     gc1_ref = c.add_ref(gc)
@@ -78,8 +80,35 @@ def waveguide_with_grating_couplers(name, wg_width, grating_period):
     # Connect right side
     taper2_ref.connect("o2", wg_ref.ports["o2"])
     gc2_ref.connect("o1", taper2_ref.ports["o1"])
-    c.add_port("opt1", port=gc1_ref.ports["o2"])
-    c.add_port("opt2", port=gc2_ref.ports["o2"])
+    return gc1_ref.ports["o2"], gc2_ref.ports["o2"]
+
+
+# One device body per width; only the labels depend on the grating period.
+_device_body_cache = {}
+
+
+def device_body(wg_width):
+    """Return the shared body cell (waveguide, tapers, couplers) for a waveguide width."""
+    key = round(float(wg_width), 6)
+    if key not in _device_body_cache:
+        body = gf.Component(name=f"w{int(wg_width*1000)}_body")
+        left_port, right_port = _add_device_body(body, wg_width)
+        body.add_port("opt1", port=left_port)
+        body.add_port("opt2", port=right_port)
+        _device_body_cache[key] = body
+    return _device_body_cache[key]
+
+
+def waveguide_with_grating_couplers(name, wg_width, grating_period, flyweight=False):
+    c = gf.Component(name=f"w{int(wg_width*1000)}p{int(grating_period*1000)}")
+    if flyweight:
+        # Instance the cached per-width body instead of rebuilding it for every period.
+        body_ref = c.add_ref(device_body(wg_width))
+        left_port, right_port = body_ref.ports["opt1"], body_ref.ports["opt2"]
+    else:
+        left_port, right_port = _add_device_body(c, wg_width)
+    c.add_port("opt1", port=left_port)
+    c.add_port("opt2", port=right_port)
     
     # Device marker and text parameters (left and right)
     marker_size = params["device_marker"]["size"]
@@ -92,8 +121,8 @@ def waveguide_with_grating_couplers(name, wg_width, grating_period):
     enable_text = params["device_text"].get("enable_text", True)
     
     # Create marker and text positions for reference (needed even if markers are disabled but text is enabled)
-    left_marker_pos = (gc1_ref.ports["o2"].center[0] - marker_offset - marker_size, gc1_ref.ports["o2"].center[1] - marker_size / 2)
-    right_marker_pos = (gc2_ref.ports["o2"].center[0] + marker_offset, gc2_ref.ports["o2"].center[1] - marker_size / 2)
+    left_marker_pos = (left_port.center[0] - marker_offset - marker_size, left_port.center[1] - marker_size / 2)
+    right_marker_pos = (right_port.center[0] + marker_offset, right_port.center[1] - marker_size / 2)
     
     # Add markers if enabled
     left_marker_ref = None
@@ -139,7 +168,15 @@ def waveguide_with_grating_couplers(name, wg_width, grating_period):
     
     return c
 
-def p_cascades():
+def p_cascades(flyweight=None):
+    """Build the width x period cascades.
+
+    With flyweight enabled (default from width_pitch.json "p_cascades.flyweight"),
+    each width's waveguide/taper/coupler body is built once and instanced by every
+    period; only the label geometry is created per device.
+    """
+    if flyweight is None:
+        flyweight = p_cascades_params.get("flyweight", False)
     y_spacing = p_cascades_params["y_spacing"]
     x_offset = p_cascades_params["x_offset"]
     cascade_spacing = p_cascades_params["cascade_spacing"]
@@ -157,7 +194,7 @@ def p_cascades():
         cascade = gf.Component(cascade_name)
         for i, width in enumerate(widths):
             dev_name = f"w{int(width*1000)}p{int(period*1000)}"
-            dev_cell = waveguide_with_grating_couplers(dev_name, width, period)
+            dev_cell = waveguide_with_grating_couplers(dev_name, width, period, flyweight=flyweight)
             dev_ref = cascade.add_ref(dev_cell)
             dev_ref.move((i * x_offset, -i * y_spacing))
             dev_ref.name = dev_name
@@ -192,10 +229,7 @@ def add_die_box_with_grid(component, die_name=None):
     xmin, ymin, xmax, ymax = bbox.left, bbox.bottom, bbox.right, bbox.top
     width = xmax - xmin
     height = ymax - ymin
-    die_width = ((int((width // grid_size) + 1) if width % grid_size != 0 else int(width // grid_size)) + 1) * grid_size
-    die_height = ((int((height // grid_size) + 1) if height % grid_size != 0 else int(height // grid_size)) + 1) * grid_size
-    n_x = int(die_width // grid_size)
-    n_y = int(die_height // grid_size)
+    die_width, die_height = die_size_for(width, height, grid_size)
     grid_line_width = die_box_params.get("grid_line_width", 0.5)    # Center the die at (0,0): shift the component so its bbox center is at (0,0)
     comp_cx = (xmax + xmin) / 2
     comp_cy = (ymax + ymin) / 2
@@ -212,42 +246,10 @@ def add_die_box_with_grid(component, die_name=None):
     grid_offset_y = 0.0
     die_xmin += grid_offset_x
     die_ymin += grid_offset_y
-    die_grid = gf.Component("Die_Grid")
-    for i in range(n_x + 1):
-        x = i * grid_size
-        die_grid.add_ref(
-            gf.components.rectangle(
-                size=(grid_line_width, die_height), layer=grid_layer
-            )
-        ).move((x - grid_line_width / 2, 0))
-    for j in range(n_y + 1):
-        y = j * grid_size
-        die_grid.add_ref(
-            gf.components.rectangle(
-                size=(die_width, grid_line_width), layer=grid_layer
-            )
-        ).move((0, y - grid_line_width / 2))
-    die_grid_ref = component.add_ref(die_grid)
-    die_grid_ref.move((die_xmin, die_ymin))
-    e_beam_markers = gf.Component("E beam markers")
-    for i in range(n_x + 1):
-        for j in range(n_y + 1):
-            x = i * grid_size
-            y = j * grid_size
-            marker1 = gf.components.rectangle(size=(marker_size, marker_size), layer=marker_layer)
-            marker1_ref = e_beam_markers.add_ref(marker1)
-            marker1_ref.move((x - marker_offset - marker_size, y + marker_offset))
-            marker2 = gf.components.rectangle(size=(marker_size, marker_size), layer=marker_layer)
-            marker2_ref = e_beam_markers.add_ref(marker2)
-            marker2_ref.move((x + marker_offset, y + marker_offset))
-            marker3 = gf.components.rectangle(size=(marker_size, marker_size), layer=marker_layer)
-            marker3_ref = e_beam_markers.add_ref(marker3)
-            marker3_ref.move((x - marker_offset - marker_size, y - marker_offset - marker_size))
-            marker4 = gf.components.rectangle(size=(marker_size, marker_size), layer=marker_layer)
-            marker4_ref = e_beam_markers.add_ref(marker4)
-            marker4_ref.move((x + marker_offset, y - marker_offset - marker_size))
-    e_beam_markers_ref = component.add_ref(e_beam_markers)
-    e_beam_markers_ref.move((die_xmin, die_ymin))
+    # Grid lines and markers come from a shared frame cell, reused by every die of this size.
+    frame = die_frame(die_width, die_height, grid_size, grid_line_width, grid_layer, marker_layer, marker_size, marker_offset)
+    frame_ref = component.add_ref(frame)
+    frame_ref.move((die_xmin, die_ymin))
     tag = gf.Component("Tag")
     text = gf.components.text(text=die_name, size=die_text_params["text_size"], layer=tag_layer)
     text_ref = tag.add_ref(text)
@@ -265,6 +267,6 @@ if __name__ == "__main__":
     print(f"Debug: Grid has been moved 50 microns to the right")
     
     if output_params["show"]:
-        c.show()
+        show_component(c)
 
 
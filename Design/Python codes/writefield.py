@@ -0,0 +1,275 @@
+"""E-beam writefield analysis: per-field shape statistics and stitch crossings.
+
+The writer exposes one field at a time and stitches neighbouring fields with a
+small placement error, so a waveguide crossing a field boundary picks up a
+stitching loss. analyze_writefields() lays the field lattice over a built
+layout (by default the lattice Grid.create_ebeam_field_markers_component
+draws), bins every flattened shape into fields by its bounding box with NumPy,
+and locates the waveguide crossings exactly. Only waveguide polygons whose
+bounding box spans a field boundary are cut against the boundary edges, so a
+full 20 mm chip takes seconds.
+
+    python writefield.py chip.oas [--field-size 500] [--chip-lattice] [--layers 1/0] [--split]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import klayout.db as kdb
+import numpy as np
+
+from output_format import write_layout
+
+# Waveguides and grating couplers are drawn on layer 1/0 by every generator.
+DEFAULT_WAVEGUIDE_LAYERS = ((1, 0),)
+
+# A crossing wider than this (um) is reported as running along a field boundary.
+ALONG_BOUNDARY_WIDTH = 5.0
+
+
+def grid_field_lattice(config):
+    """(field_size, (origin_x, origin_y), (fields_x, fields_y)) of the lattice drawn from a Grid.json config."""
+    chip_size = config["chip_size"]
+    field_size = config.get("ebeam_field", {}).get("field_size", 500)
+    fields_x = int(chip_size[0] // field_size)
+    fields_y = int(chip_size[1] // field_size)
+    return field_size, (-fields_x * field_size / 2, -fields_y * field_size / 2), (fields_x, fields_y)
+
+
+def _top_cell(source):
+    """(layout, top cell) for a gf.Component, kdb.Cell or layout file with a single top cell.
+
+    The layout is returned too: a cell read from a file is only valid while
+    its layout object is alive.
+    """
+    if hasattr(source, "kdb_cell"):
+        source = source.kdb_cell
+    if isinstance(source, kdb.Cell):
+        return source.layout(), source
+    layout = kdb.Layout()
+    layout.read(str(source))
+    tops = layout.top_cells()
+    if len(tops) != 1:
+        raise ValueError(f"{source} has {len(tops)} top cells; pass the cell to analyze.")
+    return layout, tops[0]
+
+
+def _shape_table(top, layer_index):
+    """Flattened polygons of one layer with their bounding boxes and vertex counts (dbu)."""
+    region = kdb.Region(top.begin_shapes_rec(layer_index))
+    region.merged_semantics = False
+    polygons = list(region.each())
+    boxes = np.array([(p.bbox().left, p.bbox().bottom, p.bbox().right, p.bbox().top) for p in polygons], dtype=np.int64).reshape(-1, 4)
+    vertices = np.array([p.num_points() for p in polygons], dtype=np.int64)
+    return polygons, boxes, vertices
+
+
+def _boundary_edges(origin, fields, field):
+    """Internal field boundaries as edges (dbu), returned separately for vertical and horizontal lines."""
+    (ox, oy), (nx, ny) = origin, fields
+    vertical, horizontal = kdb.Edges(), kdb.Edges()
+    for i in range(1, nx):
+        vertical.insert(kdb.Edge(ox + i * field, oy, ox + i * field, oy + ny * field))
+    for j in range(1, ny):
+        horizontal.insert(kdb.Edge(ox, oy + j * field, ox + nx * field, oy + j * field))
+    return vertical, horizontal
+
+
+def analyze_writefields(
+    source,
+    field_size=500.0,
+    origin=None,
+    fields=None,
+    waveguide_layers=DEFAULT_WAVEGUIDE_LAYERS,
+    max_locations=50,
+):
+    """Per-field shape statistics and waveguide/field-boundary crossings of a layout.
+
+    source is a gf.Component, kdb.Cell or layout file. The lattice starts at
+    origin (um) with fields = (fields_x, fields_y). Without origin it is
+    centred on the layout's bounding box; without fields it covers the
+    bounding box from the origin. Shapes spanning several fields
+    are counted in each of them and reported as split shapes. Returns a
+    JSON-ready dict.
+    """
+    layout, top = _top_cell(source)
+    dbu = layout.dbu
+    field = int(round(field_size / dbu))
+    bbox = top.bbox()
+    if origin is None:
+        if fields is None:
+            fields = (max(1, -(-bbox.width() // field)), max(1, -(-bbox.height() // field)))
+        center = bbox.center()
+        origin_dbu = (center.x - fields[0] * field // 2, center.y - fields[1] * field // 2)
+    else:
+        origin_dbu = (int(round(origin[0] / dbu)), int(round(origin[1] / dbu)))
+        if fields is None:
+            # Cover the bbox from the given origin; anything below/left of it is reported as outside
+            fields = (max(1, -(-(bbox.right - origin_dbu[0]) // field)), max(1, -(-(bbox.top - origin_dbu[1]) // field)))
+    nx, ny = int(fields[0]), int(fields[1])
+    ox, oy = origin_dbu
+
+    shapes = np.zeros((nx, ny), dtype=np.int64)
+    vertices = np.zeros((nx, ny), dtype=np.int64)
+    split = np.zeros((nx, ny), dtype=np.int64)
+    layers = {}
+    outside = 0
+    wanted = {tuple(layer) for layer in waveguide_layers}
+    spanning_waveguides = kdb.Region()
+
+    for layer_index in layout.layer_indexes():
+        info = layout.get_info(layer_index)
+        polygons, boxes, counts = _shape_table(top, layer_index)
+        if not len(polygons):
+            continue
+        # Field index range covered by each bounding box (right/top edges are exclusive)
+        ix0 = (boxes[:, 0] - ox) // field
+        iy0 = (boxes[:, 1] - oy) // field
+        ix1 = (boxes[:, 2] - 1 - ox) // field
+        iy1 = (boxes[:, 3] - 1 - oy) // field
+        inside = (ix0 >= 0) & (iy0 >= 0) & (ix1 < nx) & (iy1 < ny)
+        single = inside & (ix0 == ix1) & (iy0 == iy1)
+        np.add.at(shapes, (ix0[single], iy0[single]), 1)
+        np.add.at(vertices, (ix0[single], iy0[single]), counts[single])
+        spanning = np.flatnonzero(inside & ~single)
+        for k in spanning:
+            block = (slice(ix0[k], ix1[k] + 1), slice(iy0[k], iy1[k] + 1))
+            shapes[block] += 1
+            vertices[block] += counts[k]
+            split[block] += 1
+        outside += int(np.count_nonzero(~inside))
+        layers[f"{info.layer}/{info.datatype}"] = {
+            "shapes": len(polygons),
+            "split_shapes": int(spanning.size),
+            "outside_lattice": int(np.count_nonzero(~inside)),
+        }
+        if (info.layer, info.datatype) in wanted:
+            spanning_waveguides.insert([polygons[k] for k in spanning])
+
+    # Parts of the boundary lines covered by waveguide: one edge per crossing
+    vertical, horizontal = _boundary_edges(origin_dbu, (nx, ny), field)
+    crossings = []
+    for orientation, lines in (("vertical", vertical), ("horizontal", horizontal)):
+        for edge in (lines & spanning_waveguides).merged().each():
+            crossings.append({
+                "x": round((edge.p1.x + edge.p2.x) / 2 * dbu, 3),
+                "y": round((edge.p1.y + edge.p2.y) / 2 * dbu, 3),
+                "boundary": orientation,
+                "width": round(edge.length() * dbu, 3),
+            })
+    crossings.sort(key=lambda c: -c["width"])
+
+    per_field = []
+    for ix, iy in zip(*np.nonzero(shapes)):
+        per_field.append({
+            "field": [int(ix), int(iy)],
+            "origin": [round((ox + ix * field) * dbu, 3), round((oy + iy * field) * dbu, 3)],
+            "shapes": int(shapes[ix, iy]),
+            "vertices": int(vertices[ix, iy]),
+            "split_shapes": int(split[ix, iy]),
+        })
+    return {
+        "top": top.name,
+        "field_size": field * dbu,
+        "origin": [ox * dbu, oy * dbu],
+        "fields": [nx, ny],
+        "occupied_fields": len(per_field),
+        "max_field_vertices": int(vertices.max()) if vertices.size else 0,
+        "outside_lattice": outside,
+        "layers": layers,
+        "crossings": len(crossings),
+        "along_boundary": sum(1 for c in crossings if c["width"] > ALONG_BOUNDARY_WIDTH),
+        "crossing_locations": crossings[:max_locations],
+        "per_field": per_field,
+    }
+
+
+def print_writefield_report(report):
+    """Print a summary of analyze_writefields() output."""
+    print(
+        f"{report['top']}: {report['fields'][0]} x {report['fields'][1]} fields of {report['field_size']:g} um, "
+        f"{report['occupied_fields']} occupied, busiest field {report['max_field_vertices']} vertices"
+    )
+    for layer, stats in report["layers"].items():
+        print(f"  {layer:>8}: {stats['shapes']} shapes, {stats['split_shapes']} split by field boundaries, {stats['outside_lattice']} outside")
+    print(f"  {report['crossings']} waveguide crossings of field boundaries ({report['along_boundary']} running along a boundary)")
+    for crossing in report["crossing_locations"][:10]:
+        print(f"    {crossing['boundary']:>10} at ({crossing['x']:.3f}, {crossing['y']:.3f}) width {crossing['width']:.3f} um")
+
+
+def split_into_fields(source, field_size=500.0, origin=None, fields=None, report=None):
+    """Return a kdb.Layout whose top cell holds one sub-cell per occupied field.
+
+    Each sub-cell is a hierarchical clip of the layout to its field, placed at
+    its original position, so the writer can take the fields one by one.
+    Geometry outside the lattice (report["outside_lattice"]) is left out.
+    """
+    report = report or analyze_writefields(source, field_size, origin, fields)
+    source_layout, top = _top_cell(source)
+    layout = kdb.Layout()
+    layout.dbu = source_layout.dbu
+    copy = layout.create_cell(top.name)
+    copy.copy_tree(top)
+
+    dbu = layout.dbu
+    field = int(round(report["field_size"] / dbu))
+    ox, oy = (int(round(v / dbu)) for v in report["origin"])
+    boxes = [kdb.Box(ox + f["field"][0] * field, oy + f["field"][1] * field,
+                     ox + (f["field"][0] + 1) * field, oy + (f["field"][1] + 1) * field)
+             for f in report["per_field"]]
+    fields_top = layout.create_cell(f"{top.name}_writefields")
+    for f, cell_index in zip(report["per_field"], layout.multi_clip(copy.cell_index(), boxes)):
+        cell = layout.cell(cell_index)
+        cell.name = f"field_{f['field'][0]}_{f['field'][1]}"
+        fields_top.insert(kdb.CellInstArray(cell_index, kdb.Trans()))
+    # Cells only the unclipped copy used are dropped with it
+    layout.prune_cell(copy.cell_index(), -1)
+    return layout
+
+
+def _writefield_dir():
+    for parent in Path(__file__).resolve().parents:
+        if (parent / "Setup").exists():
+            return parent / "Setup" / "build" / "writefield"
+    return Path(__file__).resolve().parents[1] / "build" / "writefield"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Writefield statistics and stitch crossings of a layout file.")
+    parser.add_argument("layout", help="GDS or OASIS file")
+    parser.add_argument("--field-size", type=float, help="field edge in um (default: Grid.json ebeam_field)")
+    parser.add_argument("--origin", type=float, nargs=2, metavar=("X", "Y"), help="lattice origin in um")
+    parser.add_argument("--chip-lattice", action="store_true", help="use the Grid.json chip lattice instead of centring on the layout")
+    parser.add_argument("--layers", nargs="+", default=[f"{l}/{d}" for l, d in DEFAULT_WAVEGUIDE_LAYERS], help="waveguide layers as L/D")
+    parser.add_argument("--json", help="report file (default: build/writefield/<top>.json)")
+    parser.add_argument("--split", action="store_true", help="also write per-field sub-cells to build/writefield/<top>_fields")
+    args = parser.parse_args(argv)
+    if args.chip_lattice and (args.field_size or args.origin):
+        parser.error("--chip-lattice takes its field size and origin from Grid.json; drop --field-size/--origin")
+
+    grid_json = Path(__file__).resolve().parents[1] / "Json" / "Grid.json"
+    with open(grid_json, "r") as f:
+        grid_field_size, grid_origin, grid_fields = grid_field_lattice(json.load(f))
+    field_size = args.field_size or grid_field_size
+    origin, fields = args.origin, None
+    if args.chip_lattice:
+        origin, fields = grid_origin, grid_fields
+    waveguide_layers = [tuple(int(v) for v in layer.split("/")) for layer in args.layers]
+
+    report = analyze_writefields(args.layout, field_size, origin, fields, waveguide_layers)
+    print_writefield_report(report)
+    out_dir = _writefield_dir()
+    json_path = Path(args.json) if args.json else out_dir / f"{report['top']}.json"
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(json_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {json_path}")
+    if args.split:
+        split_path = write_layout(split_into_fields(args.layout, report=report), out_dir / f"{report['top']}_fields.gds")
+        print(f"Per-field cells written to {split_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())